@@ -0,0 +1,54 @@
+"""Small in-process read caches for hot, rarely-changing endpoints."""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+_MISSING = object()
+
+
+class TTLCache:
+    """LRU dict whose entries expire after `ttl` seconds.
+
+    Only touched from the event loop, so no locking. Every endpoint that
+    writes data a cached value is derived from clears it, but only in its
+    own process: with several API workers, the others keep serving their
+    copy until it expires, so `ttl` is the bound on cross-worker staleness.
+    Writes made outside the API (the CLI, psql) are bounded the same way.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        item = self._data.get(key, _MISSING)
+        if item is _MISSING:
+            return default
+        expires, value = item
+        if expires < time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+# Enriched subject rows: key ("list", project_id | None) or ("get", subject_id).
+# They carry package/asset counts and sizes, so package, asset and package
+# link writes clear it as well as subject/project writes.
+subject_cache = TTLCache(maxsize=1024, ttl=30.0)
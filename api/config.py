@@ -35,14 +35,25 @@ class Settings:
         ).split(",")
     ])
 
+    # Optional streaming replica for read-only endpoints; empty = use the primary
+    read_database_url: str = os.environ.get("READ_DATABASE_URL", "")
+
     db_pool_min: int = int(os.environ.get("DB_POOL_MIN", "2"))
     db_pool_max: int = int(os.environ.get("DB_POOL_MAX", "10"))
+    # Per-connection LRU of prepared statements kept by asyncpg (0 disables)
+    db_statement_cache_size: int = int(os.environ.get("DB_STATEMENT_CACHE_SIZE", "512"))
 
     gemini_api_key: str = os.environ.get("GOOGLE_API_KEY", "")
+    # Max Gemini batch requests in flight during ATMAN analysis
+    gemini_concurrency: int = int(os.environ.get("GEMINI_CONCURRENCY", "8"))
+    # On-disk cache of Gemini batch responses, keyed by prompt + batch input
+    llm_cache_dir: str = os.environ.get("LLM_CACHE_DIR", ".ingesthub_cache/gemini")
 
     proxy_dir: str = os.environ.get("PROXY_DIR", ".ingesthub_proxies")
 
     datasets_root: str = os.environ.get("DATASETS_ROOT", "")
 
+    dashboard_refresh_seconds: float = float(os.environ.get("DASHBOARD_REFRESH_SECONDS", "60"))
+
 
 settings = Settings()
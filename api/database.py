@@ -2,38 +2,57 @@
 
 from __future__ import annotations
 
-import json
 from contextlib import asynccontextmanager
-from typing import Optional
+from typing import Any, Optional
 
 import asyncpg
+import orjson
 
 from .config import settings
 
 pool: Optional[asyncpg.Pool] = None
+read_pool: Optional[asyncpg.Pool] = None
+
+
+def json_dumps(obj: Any) -> str:
+    """Serialize to a JSON string (orjson; non-str dict keys are stringified like stdlib json)."""
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+json_loads = orjson.loads
 
 
 async def _init_connection(conn):
     """Set up JSONB codec on each new connection."""
     await conn.set_type_codec(
-        'jsonb', encoder=json.dumps, decoder=json.loads, schema='pg_catalog'
+        'jsonb', encoder=json_dumps, decoder=json_loads, schema='pg_catalog'
     )
 
 
-async def init_pool():
-    """Initialize the connection pool. Called at app startup."""
-    global pool
-    pool = await asyncpg.create_pool(
-        dsn=settings.database_url,
+async def _create_pool(dsn: str) -> asyncpg.Pool:
+    return await asyncpg.create_pool(
+        dsn=dsn,
         min_size=settings.db_pool_min,
         max_size=settings.db_pool_max,
+        statement_cache_size=settings.db_statement_cache_size,
         init=_init_connection,
     )
 
 
+async def init_pool():
+    """Initialize the connection pool(s). Called at app startup."""
+    global pool, read_pool
+    pool = await _create_pool(settings.database_url)
+    if settings.read_database_url:
+        read_pool = await _create_pool(settings.read_database_url)
+
+
 async def close_pool():
     """Close all pooled connections. Called at app shutdown."""
-    global pool
+    global pool, read_pool
+    if read_pool:
+        await read_pool.close()
+        read_pool = None
     if pool:
         await pool.close()
         pool = None
@@ -46,6 +65,17 @@ async def get_conn():
         yield conn
 
 
+@asynccontextmanager
+async def get_read_conn():
+    """Yield a connection for read-only queries.
+
+    Uses the READ_DATABASE_URL replica pool when configured, else the primary.
+    Replica reads may lag recent writes.
+    """
+    async with (read_pool or pool).acquire() as conn:
+        yield conn
+
+
 def build_update(table: str, data: dict, id_val, id_col: str = "id"):
     """Build UPDATE SET clause with positional params for asyncpg.
 
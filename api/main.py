@@ -1,7 +1,8 @@
 """FastAPI application entry point."""
 
+import asyncio
 import logging
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -28,7 +29,13 @@ async def lifespan(app: FastAPI):
                 logger.warning("Recovered stuck packages: %s", result)
     except Exception as e:
         logger.error("Failed to recover stuck packages: %s", e)
+    refresher = asyncio.create_task(
+        stats.refresh_dashboard_views_forever(settings.dashboard_refresh_seconds)
+    )
     yield
+    refresher.cancel()
+    with suppress(asyncio.CancelledError):
+        await refresher
     await close_pool()
 
 
@@ -4,7 +4,7 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class ProjectCreate(BaseModel):
@@ -63,6 +63,7 @@ class SubjectResponse(BaseModel):
     name: str
     description: Optional[str] = None
     thumbnail_url: Optional[str] = None
+    dataset_dir: Optional[str] = None
     notes: Optional[str] = None
     tags: list[str] = []
     created_at: datetime
@@ -159,6 +160,20 @@ class BulkDeleteRequest(BaseModel):
     ids: list[UUID]
 
 
+class AssetQuerySpec(BaseModel):
+    package_id: Optional[UUID] = None
+    file_type: Optional[str] = None
+    asset_type: Optional[str] = None
+    picked_up: Optional[bool] = None
+    search: Optional[str] = None
+    offset: int = Field(0, ge=0)
+    limit: int = Field(200, ge=1, le=500)
+
+
+class AssetBatchRequest(BaseModel):
+    queries: list[AssetQuerySpec] = Field(..., min_length=1, max_length=20)
+
+
 class PaginatedPackageResponse(BaseModel):
     items: list["PackageResponse"]
     total: int
@@ -176,6 +191,7 @@ class PaginatedAssetResponse(BaseModel):
     total_size_bytes: int = 0
     total_duration_seconds: float = 0.0
     picked_up_count: int = 0
+    next_cursor: Optional[str] = None
 
 
 class AssetResponse(BaseModel):
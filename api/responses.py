@@ -0,0 +1,31 @@
+"""Response classes for read paths that skip response-model validation."""
+
+from typing import Any
+from uuid import UUID
+
+import orjson
+from fastapi.responses import Response
+
+
+def _default(obj: Any) -> Any:
+    # asyncpg returns its own UUID subclass, which orjson won't serialize natively
+    if isinstance(obj, UUID):
+        return str(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class RowsResponse(Response):
+    """JSON response for rows fetched straight from the DB.
+
+    Serializes with orjson and bypasses FastAPI's response_model validation,
+    so only use it where the query already yields the documented shape.
+    UTC datetimes are written with a ``Z`` suffix, as pydantic does, so rows
+    read here match the same rows returned through a response model.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z,
+        )
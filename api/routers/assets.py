@@ -1,11 +1,13 @@
 """Asset endpoints."""
 
+import base64
 from typing import Optional
 from uuid import UUID
 
 from fastapi import APIRouter, HTTPException, Query
 
-from ..database import get_conn, build_update
+from ..cache import subject_cache
+from ..database import build_update, get_conn, json_dumps, json_loads
 from ..models import AssetResponse, AssetUpdate, BulkAssetUpdate, PaginatedAssetResponse
 from .media import make_media_url
 
@@ -81,6 +83,20 @@ def _build_asset_filters(
     return where, params
 
 
+def _encode_cursor(row, position: int, total: int) -> str:
+    """Opaque keyset cursor: last (filename, id) seen plus page position and total."""
+    raw = json_dumps({"f": row["filename"], "i": str(row["id"]), "n": position, "t": total})
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> dict:
+    try:
+        data = json_loads(base64.urlsafe_b64decode(cursor.encode()))
+        return {"f": str(data["f"]), "i": UUID(data["i"]), "n": int(data["n"]), "t": int(data["t"])}
+    except (ValueError, TypeError, KeyError, AttributeError):  # UUID() on a non-str raises AttributeError
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 async def _paginated_asset_query(
     conn,
     *,
@@ -89,10 +105,39 @@ async def _paginated_asset_query(
     params: list,
     offset: int,
     limit: int,
+    cursor: Optional[str] = None,
+    keyset: bool = False,
 ) -> dict:
-    """Execute a paginated asset query with aggregates."""
+    """Execute a paginated asset query with aggregates.
+
+    With ``keyset=True`` the response carries a ``next_cursor``; passing it back
+    as ``cursor`` seeks past the last (filename, id) instead of using OFFSET.
+    Aggregates are only computed for the first page — cursor pages echo the
+    total from the cursor and leave the other aggregates at 0.
+    """
     param_idx = len(params) + 1
 
+    if cursor is not None:
+        cur = _decode_cursor(cursor)
+        seek = f"(a.filename, a.id) > (${param_idx}, ${param_idx + 1})"
+        seek_where = f"{where} AND {seek}" if where else f"WHERE {seek}"
+        rows = await conn.fetch(
+            f"SELECT a.* FROM {from_clause} {seek_where} "
+            f"ORDER BY a.filename, a.id LIMIT ${param_idx + 2}",
+            *params, cur["f"], cur["i"], limit + 1,
+        )
+        page = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = _encode_cursor(page[-1], cur["n"] + limit, cur["t"])
+        return {
+            "items": [_enrich_asset(dict(r)) for r in page],
+            "total": cur["t"],
+            "offset": cur["n"],
+            "limit": limit,
+            "next_cursor": next_cursor,
+        }
+
     sql = f"""
         SELECT a.*,
             COUNT(*) OVER() AS _total,
@@ -103,17 +148,20 @@ async def _paginated_asset_query(
             COUNT(*) FILTER (WHERE a.picked_up) OVER() AS _agg_picked_up
         FROM {from_clause}
         {where}
-        ORDER BY a.filename
+        ORDER BY a.filename, a.id
         LIMIT ${param_idx} OFFSET ${param_idx + 1}
     """
     params_with_pagination = params + [limit, offset]
     rows = await conn.fetch(sql, *params_with_pagination)
 
     if not rows:
-        # Still need aggregates for empty result — run a count query
-        count_sql = f"SELECT COUNT(*) AS cnt FROM {from_clause} {where}"
-        count_row = await conn.fetchrow(count_sql, *params)
-        total = count_row["cnt"] if count_row else 0
+        # The window counts ride on the page rows, so an empty page only needs
+        # a separate count when it is past the end (offset > 0); an empty
+        # first page means the filter matched nothing.
+        total = 0
+        if offset > 0:
+            count_row = await conn.fetchrow(f"SELECT COUNT(*) AS cnt FROM {from_clause} {where}", *params)
+            total = count_row["cnt"] if count_row else 0
         return {
             "items": [],
             "total": total,
@@ -134,6 +182,10 @@ async def _paginated_asset_query(
             d.pop(k, None)
         items.append(_enrich_asset(d))
 
+    next_cursor = None
+    if keyset and offset + len(rows) < first["_total"]:
+        next_cursor = _encode_cursor(rows[-1], offset + len(rows), first["_total"])
+
     return {
         "items": items,
         "total": first["_total"],
@@ -144,6 +196,7 @@ async def _paginated_asset_query(
         "total_size_bytes": int(first["_agg_size"] or 0),
         "total_duration_seconds": float(first["_agg_duration"] or 0),
         "picked_up_count": first["_agg_picked_up"],
+        "next_cursor": next_cursor,
     }
 
 
@@ -199,7 +252,7 @@ async def get_asset(asset_id: UUID):
 
 @router.put("/{asset_id}", response_model=AssetResponse)
 async def update_asset(asset_id: UUID, data: AssetUpdate):
-    updates = {k: v for k, v in data.model_dump().items() if v is not None}
+    updates = data.model_dump(exclude_none=True)
     if not updates:
         raise HTTPException(status_code=400, detail="No fields to update")
 
@@ -208,7 +261,8 @@ async def update_asset(asset_id: UUID, data: AssetUpdate):
         row = await conn.fetchrow(sql, *vals)
         if not row:
             raise HTTPException(status_code=404, detail="Asset not found")
-        return _enrich_asset(dict(row))
+    subject_cache.clear()  # subject asset counts/sizes
+    return _enrich_asset(dict(row))
 
 
 @router.delete("/{asset_id}", status_code=204)
@@ -217,12 +271,13 @@ async def delete_asset(asset_id: UUID):
         row = await conn.fetchrow("DELETE FROM assets WHERE id = $1 RETURNING id", asset_id)
         if not row:
             raise HTTPException(status_code=404, detail="Asset not found")
+    subject_cache.clear()
 
 
 @router.post("/bulk-update", response_model=list[AssetResponse])
 async def bulk_update_assets(data: BulkAssetUpdate):
     """Update multiple assets at once."""
-    updates = {k: v for k, v in data.updates.model_dump().items() if v is not None}
+    updates = data.updates.model_dump(exclude_none=True)
     if not updates:
         raise HTTPException(status_code=400, detail="No fields to update")
     if not data.asset_ids:
@@ -237,4 +292,5 @@ async def bulk_update_assets(data: BulkAssetUpdate):
     sql = f"UPDATE assets SET {sets} WHERE id = ANY({id_param}::uuid[]) RETURNING *"
     async with get_conn() as conn:
         rows = await conn.fetch(sql, *vals)
-        return [_enrich_asset(dict(r)) for r in rows]
+    subject_cache.clear()
+    return [_enrich_asset(dict(r)) for r in rows]
@@ -1,8 +1,8 @@
 """Ingest endpoints — analyze and execute package ingestion."""
 
 import asyncio
-import json as _json
 import logging
+import os
 import sys
 import time
 import uuid
@@ -13,8 +13,9 @@ from fastapi import APIRouter, HTTPException
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
+from ..cache import subject_cache
 from ..config import settings
-from ..database import get_conn
+from ..database import get_conn, json_dumps, json_loads
 from ..models import (
     AnalysisResult,
     IngestAnalyzeRequest,
@@ -27,7 +28,7 @@ from ..services.datasets import (
     fuzzy_match_dataset,
     list_dataset_dirs,
 )
-from ..services.metadata import read_face_metadata
+from ..services.metadata import read_face_metadata, read_face_metadata_batch
 from .media import make_media_url
 from .subjects import normalize_subject_name
 
@@ -36,11 +37,15 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 from cli.ingesthub_cli.media import (
     generate_image_thumbnail,
     generate_video_proxy,
+    generate_video_proxy_and_thumbnail,
     generate_video_thumbnail,
     get_mime_type,
     probe_audio,
     probe_image,
+    probe_many,
     probe_video,
+    proxy_strategy,
+    start_probes,
 )
 
 logger = logging.getLogger(__name__)
@@ -51,20 +56,24 @@ DEFAULT_PROXY_DIR = Path(settings.proxy_dir)
 
 INGEST_WORKERS = 4
 
+# Face metadata reads are mostly file I/O, so they take more threads than cores
+FACE_READ_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
 
 def _generate_video_media(filepath: Path, proxy_dir: Path, probe: dict, proxy_height: int):
     """Generate video proxy + thumbnail. Runs in thread pool."""
-    needs_proxy = probe.get("needs_proxy", True)
+    strategy = proxy_strategy(filepath, probe)
     w = probe.get("width") or 0
     h = probe.get("height") or 0
     is_high_res = w >= 1920 and h >= 1080
 
-    if needs_proxy or is_high_res:
-        proxy_path = generate_video_proxy(filepath, proxy_dir, max_height=proxy_height)
-    else:
-        proxy_path = filepath
-    thumb_path = generate_video_thumbnail(filepath, proxy_dir)
-    return proxy_path, thumb_path
+    if strategy == "encode" or is_high_res:
+        return generate_video_proxy_and_thumbnail(filepath, proxy_dir, max_height=proxy_height)
+    proxy_path = generate_video_proxy(
+        filepath, proxy_dir, strategy=strategy,
+        audio_codec=(probe.get("metadata") or {}).get("audio_codec"),
+    )
+    return proxy_path, generate_video_thumbnail(filepath, proxy_dir)
 
 
 def _generate_image_media(filepath: Path, proxy_dir: Path):
@@ -79,6 +88,66 @@ def _generate_video_thumbnail_only(filepath: Path, proxy_dir: Path):
     return None, thumb_path
 
 
+async def _prefetch_probes(source: Path, selected_files: list) -> dict[Path, dict]:
+    """ffprobe every video/audio file up front, many processes at a time.
+
+    Keeps the per-file loop from blocking the event loop on one ffprobe
+    after another; images are probed in-process and aren't included.
+    """
+    probes: dict[Path, dict] = {}
+    for kind, paths in _probe_paths(source, selected_files).items():
+        if paths:
+            probes.update(zip(paths, await probe_many(paths, kind)))
+    return probes
+
+
+def _probe_paths(source: Path, selected_files: list) -> dict[str, list[Path]]:
+    """Video and audio files among the selection, by kind (the ones ffprobe handles)."""
+    by_kind: dict[str, list[Path]] = {"video": [], "audio": []}
+    for _, file_input in selected_files:
+        filepath = source / file_input.original_path
+        kind = classify_file(filepath)
+        if kind in by_kind:
+            by_kind[kind].append(filepath)
+    return by_kind
+
+
+def _png_paths(source: Path, selected_files: list) -> list[Path]:
+    return [
+        source / file_input.original_path
+        for _, file_input in selected_files
+        if Path(file_input.original_path).suffix.lower() == ".png"
+    ]
+
+
+async def _prefetch_face_metadata(source: Path, selected_files: list) -> dict[Path, dict]:
+    """Read face metadata for every PNG up front, in parallel, off the event loop."""
+    pngs = _png_paths(source, selected_files)
+    metas = await asyncio.to_thread(read_face_metadata_batch, pngs)
+    return dict(zip(pngs, metas))
+
+
+def _start_prefetch(
+    source: Path, selected_files: list, face_executor: ThreadPoolExecutor | None,
+) -> tuple[dict[Path, asyncio.Future], dict[Path, asyncio.Future]]:
+    """Start probes and, given an executor, face metadata reads for every file.
+
+    Returns per-file futures (probes, face metadata) so the streaming loop can
+    await each file's results as it reaches it and keep reporting progress
+    while later files are still being read, rather than going quiet until the
+    whole batch is done.
+    """
+    probes: dict[Path, asyncio.Future] = {}
+    for kind, paths in _probe_paths(source, selected_files).items():
+        probes.update(zip(paths, start_probes(paths, kind)))
+    faces: dict[Path, asyncio.Future] = {}
+    if face_executor is not None:
+        loop = asyncio.get_running_loop()
+        for png in _png_paths(source, selected_files):
+            faces[png] = loop.run_in_executor(face_executor, read_face_metadata, png)
+    return probes, faces
+
+
 def _generate_image_thumbnail_only(filepath: Path, proxy_dir: Path):
     """Generate only thumbnail (no proxy). Runs in thread pool."""
     thumb_path = generate_image_thumbnail(filepath, proxy_dir)
@@ -254,6 +323,9 @@ async def execute_ingest(data: IngestExecuteRequest):
             first_thumb_by_subject = {}
             pending = []
 
+            face_metas = await _prefetch_face_metadata(source, selected_files) if is_vfx else {}
+            probes = await _prefetch_probes(source, selected_files)
+
             executor = ThreadPoolExecutor(max_workers=INGEST_WORKERS)
             try:
                 for subject_name, file_input in selected_files:
@@ -269,16 +341,16 @@ async def execute_ingest(data: IngestExecuteRequest):
 
                     file_size = filepath.stat().st_size
 
-                    if ftype == "video":
-                        probe = probe_video(filepath)
-                    elif ftype == "audio":
-                        probe = probe_audio(filepath)
-                    else:
-                        probe = probe_image(filepath)
+                    probe = probes.get(filepath)
+                    if probe is None:
+                        if ftype == "video":
+                            probe = probe_video(filepath)
+                        elif ftype == "audio":
+                            probe = probe_audio(filepath)
+                        else:
+                            probe = probe_image(filepath)
 
-                    face_meta = {}
-                    if is_vfx and filepath.suffix.lower() == ".png":
-                        face_meta = read_face_metadata(filepath)
+                    face_meta = face_metas.get(filepath, {})
 
                     asset_metadata = probe.get("metadata", {})
                     if face_meta:
@@ -382,7 +454,7 @@ async def execute_ingest(data: IngestExecuteRequest):
                         merge = {}
                         if face_agg["face_types"]:
                             ft = face_agg["face_types"]
-                            merge["face_types"] = _json.loads(ft) if isinstance(ft, str) else ft
+                            merge["face_types"] = json_loads(ft) if isinstance(ft, str) else ft
                         merge["aligned_count"] = face_agg["aligned_count"]
                         if face_agg["source_width"]:
                             merge["source_width"] = face_agg["source_width"]
@@ -390,7 +462,7 @@ async def execute_ingest(data: IngestExecuteRequest):
                             merge["source_height"] = face_agg["source_height"]
                         await conn.execute(
                             "UPDATE packages SET metadata = metadata || $1::text::jsonb WHERE id = $2",
-                            _json.dumps(merge), pkg_id,
+                            json_dumps(merge), pkg_id,
                         )
 
             if is_vfx:
@@ -418,7 +490,7 @@ async def execute_ingest(data: IngestExecuteRequest):
                     if vfx_meta:
                         await conn.execute(
                             "UPDATE packages SET metadata = metadata || $1::text::jsonb WHERE id = $2",
-                            _json.dumps(vfx_meta), pkg_id,
+                            json_dumps(vfx_meta), pkg_id,
                         )
 
             if is_vfx:
@@ -435,7 +507,7 @@ async def execute_ingest(data: IngestExecuteRequest):
                         pose_data = [{"y": r["y"], "p": r["p"], "count": r["count"]} for r in pose_rows]
                         await conn.execute(
                             "UPDATE packages SET metadata = metadata || $1::text::jsonb WHERE id = $2",
-                            _json.dumps({"pose_data": pose_data}), pkg_id,
+                            json_dumps({"pose_data": pose_data}), pkg_id,
                         )
 
             pkg_totals: dict = {}
@@ -495,6 +567,7 @@ async def execute_ingest(data: IngestExecuteRequest):
                             ds_dir, sid,
                         )
 
+        subject_cache.clear()
         first_package_id = next(iter(package_ids.values()))
         logger.info(
             "Ingest complete: packages=%d, assets=%d, subjects=%s",
@@ -531,7 +604,7 @@ async def execute_ingest_stream(data: IngestExecuteRequest):
 
         def send(payload: dict) -> str:
             payload["elapsed"] = round(time.time() - start_time, 1)
-            return f"data: {_json.dumps(payload)}\n\n"
+            return f"data: {json_dumps(payload)}\n\n"
 
         try:
             async with get_conn() as conn:
@@ -622,6 +695,11 @@ async def execute_ingest_stream(data: IngestExecuteRequest):
                     first_thumb_by_subject = {}
                     pending = []
 
+                    # Reads run ahead in the background; the loop awaits each
+                    # file's own results so progress streams as they land.
+                    face_executor = ThreadPoolExecutor(max_workers=FACE_READ_WORKERS) if is_vfx else None
+                    probe_futs, face_futs = _start_prefetch(source, selected_files, face_executor)
+
                     executor = ThreadPoolExecutor(max_workers=INGEST_WORKERS)
                     try:
                         for idx, (subject_name, file_input) in enumerate(selected_files):
@@ -641,16 +719,18 @@ async def execute_ingest_stream(data: IngestExecuteRequest):
 
                             file_size = filepath.stat().st_size
 
-                            if ftype == "video":
+                            probe_fut = probe_futs.get(filepath)
+                            if probe_fut is not None:
+                                probe = await probe_fut
+                            elif ftype == "video":
                                 probe = probe_video(filepath)
                             elif ftype == "audio":
                                 probe = probe_audio(filepath)
                             else:
                                 probe = probe_image(filepath)
 
-                            face_meta = {}
-                            if is_vfx and filepath.suffix.lower() == ".png":
-                                face_meta = read_face_metadata(filepath)
+                            face_fut = face_futs.get(filepath)
+                            face_meta = await face_fut if face_fut is not None else {}
 
                             asset_metadata = probe.get("metadata", {})
                             if face_meta:
@@ -733,6 +813,10 @@ async def execute_ingest_stream(data: IngestExecuteRequest):
                             package_stats[subject_name]["count"] += 1
                             package_stats[subject_name]["size"] += info["file_size"]
                     finally:
+                        for fut in (*probe_futs.values(), *face_futs.values()):
+                            fut.cancel()
+                        if face_executor is not None:
+                            face_executor.shutdown(wait=False, cancel_futures=True)
                         executor.shutdown(wait=True)
 
                     yield send({
@@ -758,7 +842,7 @@ async def execute_ingest_stream(data: IngestExecuteRequest):
                                 merge = {}
                                 if face_agg["face_types"]:
                                     ft = face_agg["face_types"]
-                                    merge["face_types"] = _json.loads(ft) if isinstance(ft, str) else ft
+                                    merge["face_types"] = json_loads(ft) if isinstance(ft, str) else ft
                                 merge["aligned_count"] = face_agg["aligned_count"]
                                 if face_agg["source_width"]:
                                     merge["source_width"] = face_agg["source_width"]
@@ -766,7 +850,7 @@ async def execute_ingest_stream(data: IngestExecuteRequest):
                                     merge["source_height"] = face_agg["source_height"]
                                 await conn.execute(
                                     "UPDATE packages SET metadata = metadata || $1::text::jsonb WHERE id = $2",
-                                    _json.dumps(merge), pkg_id,
+                                    json_dumps(merge), pkg_id,
                                 )
 
                     if is_vfx:
@@ -794,7 +878,7 @@ async def execute_ingest_stream(data: IngestExecuteRequest):
                             if vfx_meta:
                                 await conn.execute(
                                     "UPDATE packages SET metadata = metadata || $1::text::jsonb WHERE id = $2",
-                                    _json.dumps(vfx_meta), pkg_id,
+                                    json_dumps(vfx_meta), pkg_id,
                                 )
 
                     pkg_totals: dict = {}
@@ -872,6 +956,7 @@ async def execute_ingest_stream(data: IngestExecuteRequest):
                                     ds_dir, sid,
                                 )
 
+                subject_cache.clear()
                 first_pkg_id = next(iter(package_ids.values()))
                 yield send({
                     "type": "complete",
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import mimetypes
 import os
+from functools import lru_cache
 from pathlib import Path
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import FileResponse
@@ -13,10 +14,12 @@ from ..config import settings
 router = APIRouter()
 
 
+@lru_cache(maxsize=65536)
 def make_media_url(filesystem_path: str | None) -> str | None:
     """Convert an absolute filesystem path to a /media/ URL.
 
     Tries each MEDIA_ROOT_PATHS prefix. Returns None if no match.
+    Memoized: settings are frozen, so a path always maps to the same URL.
     """
     if not filesystem_path:
         return None
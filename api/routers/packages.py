@@ -1,6 +1,6 @@
 """Package endpoints."""
 
-import json as _json
+import asyncio
 import logging
 from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
@@ -9,7 +9,8 @@ from uuid import UUID
 from fastapi import APIRouter, HTTPException, Query
 from fastapi.responses import StreamingResponse
 
-from ..database import get_conn, build_update
+from ..cache import subject_cache
+from ..database import get_conn, build_update, json_dumps, json_loads
 from ..models import BulkDeleteRequest, PackageCreate, PackageResponse, PackageSummary, PackageUpdate, PaginatedAssetResponse, PaginatedPackageResponse
 from ..services.metadata import read_face_metadata
 from .assets import _build_asset_filters, _paginated_asset_query
@@ -18,6 +19,26 @@ log = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Per-file bound on backfill metadata reads; a hung read (e.g. a stalled
+# network mount) counts as an error instead of stalling the stream.
+BACKFILL_READ_TIMEOUT = 30
+
+
+async def load_linked_subjects(conn, pkg_ids: list[UUID]) -> dict[UUID, list[dict]]:
+    """Map package id -> [{id, name}] of linked subjects, in one round-trip."""
+    if not pkg_ids:
+        return {}
+    rows = await conn.fetch(
+        "SELECT ps.package_id, s.id, s.name "
+        "FROM packages_subjects ps JOIN subjects s ON s.id = ps.subject_id "
+        "WHERE ps.package_id = ANY($1::uuid[]) ORDER BY s.name",
+        pkg_ids,
+    )
+    links_by_pkg: dict[UUID, list[dict]] = {}
+    for r in rows:
+        links_by_pkg.setdefault(r["package_id"], []).append({"id": r["id"], "name": r["name"]})
+    return links_by_pkg
+
 
 @router.get("", response_model=PaginatedPackageResponse)
 async def list_packages(
@@ -31,11 +52,13 @@ async def list_packages(
         conditions: list[str] = []
         params: list = []
         idx = 1
-        joins = ""
 
         if subject_id:
-            joins = "JOIN packages_subjects ps ON p.id = ps.package_id"
-            conditions.append(f"ps.subject_id = ${idx}")
+            # Semi-join: filters on the link table without duplicating package rows
+            conditions.append(
+                f"EXISTS (SELECT 1 FROM packages_subjects ps "
+                f"WHERE ps.package_id = p.id AND ps.subject_id = ${idx})"
+            )
             params.append(subject_id)
             idx += 1
 
@@ -52,34 +75,21 @@ async def list_packages(
         where = "WHERE " + " AND ".join(conditions) if conditions else ""
 
         count_row = await conn.fetchrow(
-            f"SELECT COUNT(DISTINCT p.id) AS total FROM packages p {joins} {where}",
+            f"SELECT COUNT(*) AS total FROM packages p {where}",
             *params,
         )
         total = count_row["total"]
 
         rows = await conn.fetch(
-            f"SELECT DISTINCT p.* FROM packages p {joins} {where} "
+            f"SELECT p.* FROM packages p {where} "
             f"ORDER BY p.ingested_at DESC OFFSET ${idx} LIMIT ${idx + 1}",
             *params, offset, limit,
         )
         packages = [dict(r) for r in rows]
 
-        if packages:
-            pkg_ids = [p["id"] for p in packages]
-            link_rows = await conn.fetch(
-                "SELECT ps.package_id, s.id, s.name "
-                "FROM packages_subjects ps JOIN subjects s ON s.id = ps.subject_id "
-                "WHERE ps.package_id = ANY($1::uuid[]) ORDER BY s.name",
-                pkg_ids,
-            )
-            links_by_pkg: dict = {}
-            for lr in link_rows:
-                pid = lr["package_id"]
-                if pid not in links_by_pkg:
-                    links_by_pkg[pid] = []
-                links_by_pkg[pid].append({"id": lr["id"], "name": lr["name"]})
-            for p in packages:
-                p["linked_subjects"] = links_by_pkg.get(p["id"], [])
+        links_by_pkg = await load_linked_subjects(conn, [p["id"] for p in packages])
+        for p in packages:
+            p["linked_subjects"] = links_by_pkg.get(p["id"], [])
 
         return {"items": packages, "total": total, "offset": offset, "limit": limit}
 
@@ -89,10 +99,10 @@ async def bulk_delete_packages(data: BulkDeleteRequest):
     if not data.ids:
         raise HTTPException(status_code=400, detail="No IDs provided")
     async with get_conn() as conn:
-        result = await conn.execute(
-            "DELETE FROM packages WHERE id = ANY($1::uuid[])", data.ids)
-        deleted_count = int(result.split()[-1])
-        return {"deleted": deleted_count}
+        rows = await conn.fetch(
+            "DELETE FROM packages WHERE id = ANY($1::uuid[]) RETURNING id", data.ids)
+    subject_cache.clear()  # subject package/asset counts
+    return {"deleted": len(rows), "ids": [r["id"] for r in rows]}
 
 
 @router.get("/{package_id}", response_model=PackageResponse)
@@ -102,85 +112,103 @@ async def get_package(package_id: UUID):
         if not row:
             raise HTTPException(status_code=404, detail="Package not found")
         result = dict(row)
-        subject_rows = await conn.fetch(
-            "SELECT s.id, s.name FROM subjects s "
-            "JOIN packages_subjects ps ON s.id = ps.subject_id "
-            "WHERE ps.package_id = $1 ORDER BY s.name", package_id)
-        result["linked_subjects"] = [dict(r) for r in subject_rows]
+        links_by_pkg = await load_linked_subjects(conn, [package_id])
+        result["linked_subjects"] = links_by_pkg.get(package_id, [])
         return result
 
 
-@router.get("/{package_id}/summary", response_model=PackageSummary)
-async def get_package_summary(package_id: UUID):
-    """Aggregate stats for a package — face metadata, pose ranges, quality, etc."""
+async def _summary_aggregates(package_id: UUID):
     async with get_conn() as conn:
-        row = await conn.fetchrow("""
-            SELECT
-                COUNT(*)                                           AS total_assets,
-                COUNT(*) FILTER (WHERE file_type = 'video')        AS video_count,
-                COUNT(*) FILTER (WHERE file_type = 'image')        AS image_count,
-                COUNT(*) FILTER (WHERE asset_type = 'aligned')     AS aligned_count,
-                COUNT(*) FILTER (WHERE asset_type = 'grid')        AS grid_count,
-                COUNT(*) FILTER (WHERE asset_type = 'plate')       AS plate_count,
-                COUNT(*) FILTER (WHERE asset_type = 'raw')         AS raw_count,
-                COUNT(*) FILTER (WHERE asset_type = 'graded')      AS graded_count,
-                COUNT(*) FILTER (WHERE asset_type = 'proxy')       AS proxy_count,
-                COUNT(*) FILTER (WHERE asset_type = 'metadata')    AS metadata_count,
-                COUNT(*) FILTER (WHERE picked_up)                  AS picked_up_count,
-                COALESCE(SUM(duration_seconds)
-                    FILTER (WHERE file_type = 'video'), 0)         AS total_duration,
-                MODE() WITHIN GROUP (ORDER BY width)
-                    FILTER (WHERE width IS NOT NULL)               AS common_width,
-                MODE() WITHIN GROUP (ORDER BY height)
-                    FILTER (WHERE height IS NOT NULL)              AS common_height,
-                array_agg(DISTINCT metadata->'face'->>'face_type')
-                    FILTER (WHERE metadata->'face'->>'face_type' IS NOT NULL) AS face_types,
-                MAX((metadata->'face'->>'source_width')::int)
-                    FILTER (WHERE metadata->'face'->>'source_width' IS NOT NULL) AS source_width,
-                MAX((metadata->'face'->>'source_height')::int)
-                    FILTER (WHERE metadata->'face'->>'source_height' IS NOT NULL) AS source_height,
-                MIN((metadata->'face'->>'yaw')::float)
-                    FILTER (WHERE metadata->'face'->>'yaw' IS NOT NULL) AS yaw_min,
-                MAX((metadata->'face'->>'yaw')::float)
-                    FILTER (WHERE metadata->'face'->>'yaw' IS NOT NULL) AS yaw_max,
-                MIN((metadata->'face'->>'pitch')::float)
-                    FILTER (WHERE metadata->'face'->>'pitch' IS NOT NULL) AS pitch_min,
-                MAX((metadata->'face'->>'pitch')::float)
-                    FILTER (WHERE metadata->'face'->>'pitch' IS NOT NULL) AS pitch_max,
-                AVG((metadata->'face'->>'sharpness')::float)
-                    FILTER (WHERE metadata->'face'->>'sharpness' IS NOT NULL) AS avg_sharpness,
-                array_agg(DISTINCT camera)
-                    FILTER (WHERE camera IS NOT NULL)              AS cameras,
-                array_agg(DISTINCT codec)
-                    FILTER (WHERE codec IS NOT NULL)               AS codecs
-            FROM assets WHERE package_id = $1
+        return await conn.fetchrow("""
+            SELECT agg.*, cw.width AS common_width, ch.height AS common_height
+            FROM (
+                SELECT
+                    COUNT(*)                                           AS total_assets,
+                    COUNT(*) FILTER (WHERE file_type = 'video')        AS video_count,
+                    COUNT(*) FILTER (WHERE file_type = 'image')        AS image_count,
+                    COUNT(*) FILTER (WHERE asset_type = 'aligned')     AS aligned_count,
+                    COUNT(*) FILTER (WHERE asset_type = 'grid')        AS grid_count,
+                    COUNT(*) FILTER (WHERE asset_type = 'plate')       AS plate_count,
+                    COUNT(*) FILTER (WHERE asset_type = 'raw')         AS raw_count,
+                    COUNT(*) FILTER (WHERE asset_type = 'graded')      AS graded_count,
+                    COUNT(*) FILTER (WHERE asset_type = 'proxy')       AS proxy_count,
+                    COUNT(*) FILTER (WHERE asset_type = 'metadata')    AS metadata_count,
+                    COUNT(*) FILTER (WHERE picked_up)                  AS picked_up_count,
+                    COALESCE(SUM(duration_seconds)
+                        FILTER (WHERE file_type = 'video'), 0)         AS total_duration,
+                    array_agg(DISTINCT face_type)
+                        FILTER (WHERE face_type IS NOT NULL)           AS face_types,
+                    MAX(face_source_width)                             AS source_width,
+                    MAX(face_source_height)                            AS source_height,
+                    MIN(face_yaw)                                      AS yaw_min,
+                    MAX(face_yaw)                                      AS yaw_max,
+                    MIN(face_pitch)                                    AS pitch_min,
+                    MAX(face_pitch)                                    AS pitch_max,
+                    AVG(face_sharpness)                                AS avg_sharpness,
+                    array_agg(DISTINCT camera)
+                        FILTER (WHERE camera IS NOT NULL)              AS cameras,
+                    array_agg(DISTINCT codec)
+                        FILTER (WHERE codec IS NOT NULL)               AS codecs
+                FROM assets WHERE package_id = $1
+            ) agg
+            -- Most frequent resolution via a grouped top-1 instead of MODE(),
+            -- which sorts every row of the package
+            LEFT JOIN LATERAL (
+                SELECT width FROM assets
+                WHERE package_id = $1 AND width IS NOT NULL
+                GROUP BY width ORDER BY COUNT(*) DESC, width LIMIT 1
+            ) cw ON TRUE
+            LEFT JOIN LATERAL (
+                SELECT height FROM assets
+                WHERE package_id = $1 AND height IS NOT NULL
+                GROUP BY height ORDER BY COUNT(*) DESC, height LIMIT 1
+            ) ch ON TRUE
         """, package_id)
-        if not row or row["total_assets"] == 0:
-            raise HTTPException(status_code=404, detail="Package not found or has no assets")
-        result = dict(row)
 
-        pkg = await conn.fetchrow("SELECT metadata FROM packages WHERE id = $1", package_id)
-        if pkg and pkg["metadata"]:
-            meta = _json.loads(pkg["metadata"]) if isinstance(pkg["metadata"], str) else pkg["metadata"]
-            if meta.get("source_video_path"):
-                result["source_video_path"] = meta["source_video_path"]
-            if meta.get("source_video_filename"):
-                result["source_video_filename"] = meta["source_video_filename"]
-            if meta.get("grid_asset_id"):
-                result["grid_asset_id"] = meta["grid_asset_id"]
-
-        pose_rows = await conn.fetch("""
-            SELECT (FLOOR((metadata->'face'->>'yaw')::float / 10) * 10)::int AS y,
-                   (FLOOR((metadata->'face'->>'pitch')::float / 10) * 10)::int AS p,
+
+async def _summary_package_meta(package_id: UUID):
+    async with get_conn() as conn:
+        return await conn.fetchrow("SELECT metadata FROM packages WHERE id = $1", package_id)
+
+
+async def _summary_pose_rows(package_id: UUID):
+    async with get_conn() as conn:
+        return await conn.fetch("""
+            SELECT (FLOOR(face_yaw / 10) * 10)::int AS y,
+                   (FLOOR(face_pitch / 10) * 10)::int AS p,
                    COUNT(*) AS count
             FROM assets WHERE package_id = $1 AND asset_type = 'aligned'
-              AND metadata->'face'->>'yaw' IS NOT NULL
+              AND face_yaw IS NOT NULL
             GROUP BY 1, 2
         """, package_id)
-        if pose_rows:
-            result["pose_data"] = [dict(r) for r in pose_rows]
 
-        return result
+
+@router.get("/{package_id}/summary", response_model=PackageSummary)
+async def get_package_summary(package_id: UUID):
+    """Aggregate stats for a package — face metadata, pose ranges, quality, etc."""
+    # Independent queries on separate pool connections, so they run concurrently
+    row, pkg, pose_rows = await asyncio.gather(
+        _summary_aggregates(package_id),
+        _summary_package_meta(package_id),
+        _summary_pose_rows(package_id),
+    )
+    if not row or row["total_assets"] == 0:
+        raise HTTPException(status_code=404, detail="Package not found or has no assets")
+    result = dict(row)
+
+    if pkg and pkg["metadata"]:
+        meta = json_loads(pkg["metadata"]) if isinstance(pkg["metadata"], str) else pkg["metadata"]
+        if meta.get("source_video_path"):
+            result["source_video_path"] = meta["source_video_path"]
+        if meta.get("source_video_filename"):
+            result["source_video_filename"] = meta["source_video_filename"]
+        if meta.get("grid_asset_id"):
+            result["grid_asset_id"] = meta["grid_asset_id"]
+
+    if pose_rows:
+        result["pose_data"] = [dict(r) for r in pose_rows]
+
+    return result
 
 
 @router.post("", response_model=PackageResponse, status_code=201)
@@ -193,12 +221,13 @@ async def create_package(data: PackageCreate):
             data.subject_id, data.name, data.source_description,
             data.disk_path, data.tags, data.metadata,
         )
-        return dict(row)
+    subject_cache.clear()
+    return dict(row)
 
 
 @router.put("/{package_id}", response_model=PackageResponse)
 async def update_package(package_id: UUID, data: PackageUpdate):
-    updates = {k: v for k, v in data.model_dump().items() if v is not None}
+    updates = data.model_dump(exclude_none=True)
     if not updates:
         raise HTTPException(status_code=400, detail="No fields to update")
 
@@ -207,7 +236,8 @@ async def update_package(package_id: UUID, data: PackageUpdate):
         row = await conn.fetchrow(sql, *vals)
         if not row:
             raise HTTPException(status_code=404, detail="Package not found")
-        return dict(row)
+    subject_cache.clear()
+    return dict(row)
 
 
 @router.delete("/{package_id}", status_code=204)
@@ -216,6 +246,7 @@ async def delete_package(package_id: UUID):
         row = await conn.fetchrow("DELETE FROM packages WHERE id = $1 RETURNING id", package_id)
         if not row:
             raise HTTPException(status_code=404, detail="Package not found")
+    subject_cache.clear()
 
 
 @router.post("/{package_id}/backfill-face-metadata")
@@ -225,13 +256,12 @@ async def backfill_face_metadata(package_id: UUID):
     Useful for packages ingested before face metadata extraction was added.
     Streams SSE progress events.
     """
-    import asyncio
 
     async def _stream():
         async with get_conn() as conn:
             pkg = await conn.fetchrow("SELECT id FROM packages WHERE id = $1", package_id)
             if not pkg:
-                yield f"data: {_json.dumps({'error': 'Package not found'})}\n\n"
+                yield f"data: {json_dumps({'error': 'Package not found'})}\n\n"
                 return
 
             rows = await conn.fetch("""
@@ -244,36 +274,57 @@ async def backfill_face_metadata(package_id: UUID):
             """, package_id)
 
             total = len(rows)
-            yield f"data: {_json.dumps({'status': 'started', 'total': total})}\n\n"
+            yield f"data: {json_dumps({'status': 'started', 'total': total})}\n\n"
 
             loop = asyncio.get_event_loop()
             updated = 0
             errors = 0
             batch_size = 200
 
-            with ThreadPoolExecutor(max_workers=8) as executor:
-                for batch_start in range(0, total, batch_size):
-                    batch = rows[batch_start:batch_start + batch_size]
-
-                    def _read(disk_path):
-                        return read_face_metadata(disk_path)
-
-                    futs = [(executor.submit(_read, r["disk_path"]), r) for r in batch]
-                    updates = []
-                    for fut, row in futs:
-                        try:
-                            meta = await loop.run_in_executor(None, fut.result, 30)
-                            if meta:
+            # Disk reads for the next batch overlap the DB write of the current
+            # one: a producer task fills a small queue, this generator drains it.
+            queue: asyncio.Queue = asyncio.Queue(maxsize=2)
+
+            async def _produce(executor):
+                try:
+                    for batch_start in range(0, total, batch_size):
+                        batch = rows[batch_start:batch_start + batch_size]
+                        results = await asyncio.gather(
+                            *(
+                                asyncio.wait_for(
+                                    loop.run_in_executor(executor, read_face_metadata, r["disk_path"]),
+                                    BACKFILL_READ_TIMEOUT,
+                                )
+                                for r in batch
+                            ),
+                            return_exceptions=True,
+                        )
+                        updates = []
+                        batch_errors = 0
+                        for row, meta in zip(batch, results):
+                            if isinstance(meta, Exception):
+                                batch_errors += 1
+                                log.warning("backfill error for %s: %r", row["disk_path"], meta)
+                            elif meta:
                                 updates.append((row["id"], meta))
-                        except Exception as e:
-                            errors += 1
-                            log.warning("backfill error for %s: %s", row["disk_path"], e)
+                        await queue.put((batch_start + len(batch), updates, batch_errors))
+                    await queue.put(None)
+                except Exception as e:
+                    await queue.put(e)
+
+            executor = ThreadPoolExecutor(max_workers=8)
+            producer = asyncio.create_task(_produce(executor))
+            try:
+                while (item := await queue.get()) is not None:
+                    if isinstance(item, Exception):
+                        raise item
+                    processed, updates, batch_errors = item
+                    errors += batch_errors
 
                     # Batch update using unnest for performance.
-                    # asyncpg jsonb codec auto-serializes dicts, so pass raw dicts.
                     if updates:
                         ids = [u[0] for u in updates]
-                        faces = [_json.dumps(u[1]) for u in updates]
+                        faces = [json_dumps(u[1]) for u in updates]
                         await conn.execute("""
                             UPDATE assets a
                             SET metadata = jsonb_set(a.metadata, '{face}', v.face::jsonb)
@@ -282,19 +333,21 @@ async def backfill_face_metadata(package_id: UUID):
                         """, ids, faces)
                     updated += len(updates)
 
-                    yield f"data: {_json.dumps({'status': 'progress', 'processed': min(batch_start + batch_size, total), 'total': total, 'updated': updated})}\n\n"
+                    yield f"data: {json_dumps({'status': 'progress', 'processed': processed, 'total': total, 'updated': updated})}\n\n"
+            finally:
+                producer.cancel()
+                # Don't wait on reads that timed out and may never return
+                executor.shutdown(wait=False, cancel_futures=True)
 
-            yield f"data: {_json.dumps({'status': 'aggregating'})}\n\n"
+            yield f"data: {json_dumps({'status': 'aggregating'})}\n\n"
 
             face_agg = await conn.fetchrow("""
                 SELECT
                     COUNT(*) FILTER (WHERE asset_type = 'aligned') AS aligned_count,
-                    jsonb_agg(DISTINCT metadata->'face'->>'face_type')
-                        FILTER (WHERE metadata->'face'->>'face_type' IS NOT NULL) AS face_types,
-                    MAX((metadata->'face'->>'source_width')::int)
-                        FILTER (WHERE metadata->'face'->>'source_width' IS NOT NULL) AS source_width,
-                    MAX((metadata->'face'->>'source_height')::int)
-                        FILTER (WHERE metadata->'face'->>'source_height' IS NOT NULL) AS source_height
+                    jsonb_agg(DISTINCT face_type)
+                        FILTER (WHERE face_type IS NOT NULL) AS face_types,
+                    MAX(face_source_width) AS source_width,
+                    MAX(face_source_height) AS source_height
                 FROM assets WHERE package_id = $1
             """, package_id)
 
@@ -303,18 +356,18 @@ async def backfill_face_metadata(package_id: UUID):
                 merge["aligned_count"] = face_agg["aligned_count"]
                 if face_agg["face_types"]:
                     ft = face_agg["face_types"]
-                    merge["face_types"] = _json.loads(ft) if isinstance(ft, str) else ft
+                    merge["face_types"] = json_loads(ft) if isinstance(ft, str) else ft
                 if face_agg["source_width"]:
                     merge["source_width"] = face_agg["source_width"]
                 if face_agg["source_height"]:
                     merge["source_height"] = face_agg["source_height"]
 
             pose_rows = await conn.fetch("""
-                SELECT (FLOOR((metadata->'face'->>'yaw')::float / 10) * 10)::int AS y,
-                       (FLOOR((metadata->'face'->>'pitch')::float / 10) * 10)::int AS p,
+                SELECT (FLOOR(face_yaw / 10) * 10)::int AS y,
+                       (FLOOR(face_pitch / 10) * 10)::int AS p,
                        COUNT(*) AS count
                 FROM assets WHERE package_id = $1 AND asset_type = 'aligned'
-                  AND metadata->'face'->>'yaw' IS NOT NULL
+                  AND face_yaw IS NOT NULL
                 GROUP BY 1, 2
             """, package_id)
             if pose_rows:
@@ -334,11 +387,12 @@ async def backfill_face_metadata(package_id: UUID):
             if merge:
                 await conn.execute(
                     "UPDATE packages SET metadata = COALESCE(metadata, '{}'::jsonb) || $1::text::jsonb WHERE id = $2",
-                    _json.dumps(merge), package_id,
+                    json_dumps(merge), package_id,
                 )
 
+            subject_cache.clear()
             pose_count = len(pose_rows) if pose_rows else 0
-            yield f"data: {_json.dumps({'status': 'done', 'updated': updated, 'errors': errors, 'pose_count': pose_count})}\n\n"
+            yield f"data: {json_dumps({'status': 'done', 'updated': updated, 'errors': errors, 'pose_count': pose_count})}\n\n"
 
     return StreamingResponse(_stream(), media_type="text/event-stream")
 
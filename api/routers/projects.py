@@ -5,11 +5,26 @@ from uuid import UUID
 
 from fastapi import APIRouter, HTTPException, Query
 
+from ..cache import subject_cache
 from ..database import get_conn, build_update
 from ..models import BulkDeleteRequest, ProjectCreate, ProjectResponse, ProjectUpdate
+from .packages import load_linked_subjects
 
 router = APIRouter()
 
+# v_project_summary's aggregates over the row returned by a write CTE aliased
+# `w` (see subjects._SUMMARY_SELECT for why the view itself can't be joined).
+# subject_count/package_count are trigger-maintained columns, so w.* has them.
+_SUMMARY_SELECT = """
+    SELECT w.*, agg.total_assets, agg.total_size_bytes
+    FROM w
+    CROSS JOIN LATERAL (
+        SELECT COUNT(*)::int AS total_assets,
+               COALESCE(SUM(a.file_size_bytes), 0)::bigint AS total_size_bytes
+        FROM assets a JOIN subjects s ON s.id = a.subject_id WHERE s.project_id = w.id
+    ) agg
+"""
+
 
 @router.get("", response_model=list[ProjectResponse])
 async def list_projects():
@@ -31,30 +46,30 @@ async def get_project(project_id: UUID):
 async def create_project(data: ProjectCreate):
     async with get_conn() as conn:
         row = await conn.fetchrow(
-            """INSERT INTO projects (name, description, project_type, client, notes, tags)
-               VALUES ($1, $2, $3, $4, $5, $6)
-               RETURNING id""",
+            f"""WITH w AS (
+                   INSERT INTO projects (name, description, project_type, client, notes, tags)
+                   VALUES ($1, $2, $3, $4, $5, $6)
+                   RETURNING *
+               )
+               {_SUMMARY_SELECT}""",
             data.name, data.description, data.project_type,
             data.client, data.notes, data.tags,
         )
-        project_id = row["id"]
-        result = await conn.fetchrow("SELECT * FROM v_project_summary WHERE id = $1", project_id)
-        return dict(result)
+        return dict(row)
 
 
 @router.put("/{project_id}", response_model=ProjectResponse)
 async def update_project(project_id: UUID, data: ProjectUpdate):
-    updates = {k: v for k, v in data.model_dump().items() if v is not None}
+    updates = data.model_dump(exclude_none=True)
     if not updates:
         raise HTTPException(status_code=400, detail="No fields to update")
 
     sql, vals = build_update("projects", updates, project_id)
     async with get_conn() as conn:
-        row = await conn.fetchrow(sql, *vals)
+        row = await conn.fetchrow(f"WITH w AS ({sql}) {_SUMMARY_SELECT}", *vals)
         if not row:
             raise HTTPException(status_code=404, detail="Project not found")
-        result = await conn.fetchrow("SELECT * FROM v_project_summary WHERE id = $1", project_id)
-        return dict(result)
+        return dict(row)
 
 
 @router.delete("/{project_id}", status_code=204)
@@ -63,6 +78,7 @@ async def delete_project(project_id: UUID):
         row = await conn.fetchrow("DELETE FROM projects WHERE id = $1 RETURNING id", project_id)
         if not row:
             raise HTTPException(status_code=404, detail="Project not found")
+    subject_cache.clear()  # subjects cascade with the project
 
 
 @router.post("/bulk-delete", status_code=200)
@@ -70,10 +86,10 @@ async def bulk_delete_projects(data: BulkDeleteRequest):
     if not data.ids:
         raise HTTPException(status_code=400, detail="No IDs provided")
     async with get_conn() as conn:
-        result = await conn.execute(
-            "DELETE FROM projects WHERE id = ANY($1::uuid[])", data.ids)
-        deleted_count = int(result.split()[-1])
-        return {"deleted": deleted_count}
+        rows = await conn.fetch(
+            "DELETE FROM projects WHERE id = ANY($1::uuid[]) RETURNING id", data.ids)
+    subject_cache.clear()
+    return {"deleted": len(rows), "ids": [r["id"] for r in rows]}
 
 
 @router.get("/{project_id}/subjects")
@@ -92,15 +108,27 @@ async def list_project_packages(
     package_type: Optional[str] = Query(None),
 ):
     async with get_conn() as conn:
-        base_sql = """SELECT DISTINCT ON (p.id) p.*, s.name AS subject_name
+        base_sql = """SELECT p.*, subj.name AS subject_name
                       FROM packages p
-                      JOIN packages_subjects ps ON p.id = ps.package_id
-                      JOIN subjects s ON ps.subject_id = s.id
-                      WHERE s.project_id = $1"""
+                      JOIN LATERAL (
+                          SELECT s.name FROM packages_subjects ps
+                          JOIN subjects s ON ps.subject_id = s.id
+                          WHERE ps.package_id = p.id AND s.project_id = $1
+                          ORDER BY s.name LIMIT 1
+                      ) subj ON true
+                      WHERE EXISTS (
+                          SELECT 1 FROM packages_subjects ps
+                          JOIN subjects s ON s.id = ps.subject_id
+                          WHERE ps.package_id = p.id AND s.project_id = $1
+                      )"""
         params: list = [project_id]
         if package_type:
             base_sql += " AND p.package_type = $2"
             params.append(package_type)
-        base_sql += " ORDER BY p.id, p.ingested_at DESC"
+        base_sql += " ORDER BY p.ingested_at DESC"
         rows = await conn.fetch(base_sql, *params)
-        return [dict(r) for r in rows]
+        packages = [dict(r) for r in rows]
+        links_by_pkg = await load_linked_subjects(conn, [p["id"] for p in packages])
+        for p in packages:
+            p["linked_subjects"] = links_by_pkg.get(p["id"], [])
+        return packages
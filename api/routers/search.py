@@ -7,6 +7,26 @@ from ..models import SearchResults
 
 router = APIRouter()
 
+# One round-trip for all four entity types. Each branch keeps its own LIMIT
+# and projects onto a shared column set; `kind` tells the rows apart.
+_SEARCH_SQL = """
+    (SELECT 'project' AS kind, id, name, project_type AS type,
+            NULL::uuid AS parent_id, NULL::text AS parent_name
+     FROM projects WHERE name ILIKE $1 LIMIT 5)
+    UNION ALL
+    (SELECT 'subject', s.id, s.name, NULL, s.project_id, p.name
+     FROM subjects s JOIN projects p ON p.id = s.project_id
+     WHERE s.name ILIKE $1 LIMIT 5)
+    UNION ALL
+    (SELECT 'package', pkg.id, pkg.name, pkg.package_type, pkg.subject_id, s.name
+     FROM packages pkg JOIN subjects s ON s.id = pkg.subject_id
+     WHERE pkg.name ILIKE $1 LIMIT 5)
+    UNION ALL
+    (SELECT 'asset', a.id, a.filename, a.file_type, a.package_id, NULL
+     FROM assets a
+     WHERE a.filename ILIKE $1 LIMIT 5)
+"""
+
 
 @router.get("", response_model=SearchResults)
 async def search(q: str = ""):
@@ -15,36 +35,26 @@ async def search(q: str = ""):
 
     pattern = f"%{q}%"
     async with get_conn() as conn:
-        projects = await conn.fetch(
-            "SELECT id, name, project_type FROM projects WHERE name ILIKE $1 LIMIT 5",
-            pattern,
-        )
-
-        subjects = await conn.fetch(
-            """SELECT s.id, s.name, s.project_id, p.name AS project_name
-               FROM subjects s JOIN projects p ON p.id = s.project_id
-               WHERE s.name ILIKE $1 LIMIT 5""",
-            pattern,
-        )
-
-        packages = await conn.fetch(
-            """SELECT pkg.id, pkg.name, pkg.package_type, pkg.subject_id,
-                      s.name AS subject_name
-               FROM packages pkg JOIN subjects s ON s.id = pkg.subject_id
-               WHERE pkg.name ILIKE $1 LIMIT 5""",
-            pattern,
-        )
-
-        assets = await conn.fetch(
-            """SELECT a.id, a.filename, a.file_type, a.package_id
-               FROM assets a
-               WHERE a.filename ILIKE $1 LIMIT 5""",
-            pattern,
-        )
-
-        return SearchResults(
-            projects=[dict(r) for r in projects],
-            subjects=[dict(r) for r in subjects],
-            packages=[dict(r) for r in packages],
-            assets=[dict(r) for r in assets],
-        )
+        rows = await conn.fetch(_SEARCH_SQL, pattern)
+
+    results = SearchResults()
+    for r in rows:
+        kind = r["kind"]
+        if kind == "project":
+            results.projects.append({"id": r["id"], "name": r["name"], "project_type": r["type"]})
+        elif kind == "subject":
+            results.subjects.append({
+                "id": r["id"], "name": r["name"],
+                "project_id": r["parent_id"], "project_name": r["parent_name"],
+            })
+        elif kind == "package":
+            results.packages.append({
+                "id": r["id"], "name": r["name"], "package_type": r["type"],
+                "subject_id": r["parent_id"], "subject_name": r["parent_name"],
+            })
+        else:
+            results.assets.append({
+                "id": r["id"], "filename": r["name"],
+                "file_type": r["type"], "package_id": r["parent_id"],
+            })
+    return results
@@ -1,12 +1,59 @@
 """Dashboard statistics endpoint."""
 
+import asyncio
+import logging
+
+import asyncpg
 from fastapi import APIRouter
 
+from ..config import settings
 from ..database import get_conn
 from ..models import DashboardStats
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
+DASHBOARD_VIEWS = ("mv_recent_packages", "mv_storage_by_project")
+
+# Advisory lock key electing the one API worker that refreshes the views
+DASHBOARD_REFRESH_LOCK = 0x1D5B_0A2D
+
+
+async def refresh_dashboard_views(conn: asyncpg.Connection):
+    """Refresh the dashboard materialized views without blocking readers."""
+    for view in DASHBOARD_VIEWS:
+        await conn.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view}")
+
+
+async def refresh_dashboard_views_forever(interval: float):
+    """Background loop started from the app lifespan.
+
+    Every API worker runs this loop, but only the one holding
+    DASHBOARD_REFRESH_LOCK refreshes, so N workers don't run N refreshes per
+    interval. The lock is session-level on a connection of the loop's own
+    (pooled connections drop advisory locks on release): it stays with one
+    worker until that worker exits, and then the next to try takes over.
+    """
+    conn: asyncpg.Connection | None = None
+    leader = False
+    try:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                if conn is None or conn.is_closed():
+                    conn = await asyncpg.connect(dsn=settings.database_url)
+                    leader = False
+                if not leader:
+                    leader = await conn.fetchval("SELECT pg_try_advisory_lock($1)", DASHBOARD_REFRESH_LOCK)
+                if leader:
+                    await refresh_dashboard_views(conn)
+            except Exception as e:
+                logger.error("Failed to refresh dashboard views: %s", e)
+    finally:
+        if conn is not None and not conn.is_closed():
+            await conn.close()
+
 
 @router.get("/dashboard", response_model=DashboardStats)
 async def dashboard_stats():
@@ -27,31 +74,13 @@ async def dashboard_stats():
         by_status_rows = await conn.fetch(
             "SELECT review_status, count(*) AS n FROM assets GROUP BY review_status"
         )
-        recent_rows = await conn.fetch("""
-            SELECT pkg.*,
-                   agg.subject_names, agg.subject_ids,
-                   p.name AS project_name, p.id AS project_id
-            FROM packages pkg
-            JOIN LATERAL (
-                SELECT string_agg(s.name, ', ' ORDER BY s.name) AS subject_names,
-                       string_agg(s.id::text, ',' ORDER BY s.name) AS subject_ids,
-                       (MIN(s.project_id::text))::uuid AS project_id
-                FROM packages_subjects ps JOIN subjects s ON s.id = ps.subject_id
-                WHERE ps.package_id = pkg.id
-            ) agg ON true
-            JOIN projects p ON p.id = agg.project_id
-            ORDER BY pkg.ingested_at DESC LIMIT 20
-        """)
-        storage_rows = await conn.fetch("""
-            SELECT p.name AS project_name,
-                   COALESCE(SUM(pkg.total_size_bytes), 0) AS total_bytes
-            FROM projects p
-            LEFT JOIN subjects s ON s.project_id = p.id
-            LEFT JOIN packages_subjects ps ON ps.subject_id = s.id
-            LEFT JOIN packages pkg ON pkg.id = ps.package_id
-            GROUP BY p.id, p.name
-            ORDER BY total_bytes DESC
-        """)
+        recent_rows = await conn.fetch(
+            "SELECT * FROM mv_recent_packages ORDER BY ingested_at DESC LIMIT 20"
+        )
+        storage_rows = await conn.fetch(
+            "SELECT project_name, total_bytes FROM mv_storage_by_project "
+            "ORDER BY total_bytes DESC"
+        )
 
         assets_by_type = {r["file_type"]: r["n"] for r in by_type_rows}
         assets_by_review_status = {r["review_status"]: r["n"] for r in by_status_rows}
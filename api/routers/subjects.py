@@ -1,17 +1,37 @@
 """Subject endpoints."""
 
+import asyncio
 from typing import Optional
 from uuid import UUID
 
 from fastapi import APIRouter, HTTPException, Query
 
-from ..database import get_conn, build_update
-from ..models import BulkDeleteRequest, PaginatedAssetResponse, SubjectCreate, SubjectResponse, SubjectUpdate
+from ..cache import subject_cache
+from ..config import settings
+from ..database import build_update, get_conn, get_read_conn
+from ..models import AssetBatchRequest, BulkDeleteRequest, PaginatedAssetResponse, SubjectCreate, SubjectResponse, SubjectUpdate
+from ..responses import RowsResponse
 from .media import make_media_url
 from .assets import _build_asset_filters, _paginated_asset_query
 
 router = APIRouter()
 
+# v_subject_summary's aggregates, evaluated against the row returned by a
+# write CTE aliased `w`, for that one subject only. The view itself can't be
+# joined to the CTE: the outer query reads the pre-statement snapshot and
+# wouldn't see the new values.
+_SUMMARY_SELECT = """
+    SELECT w.*,
+           (SELECT COUNT(*) FROM packages_subjects ps WHERE ps.subject_id = w.id)::int AS package_count,
+           agg.total_assets, agg.total_size_bytes
+    FROM w
+    CROSS JOIN LATERAL (
+        SELECT COUNT(*)::int AS total_assets,
+               COALESCE(SUM(a.file_size_bytes), 0)::bigint AS total_size_bytes
+        FROM assets a WHERE a.subject_id = w.id
+    ) agg
+"""
+
 
 def normalize_subject_name(name: str) -> str:
     """Normalize subject name: strip, replace underscores with spaces, title case."""
@@ -26,45 +46,60 @@ def _enrich_subject(row: dict) -> dict:
     return row
 
 
-@router.get("", response_model=list[SubjectResponse])
+# Read paths below return RowsResponse directly: rows come straight from
+# v_subject_summary, so re-validating each one through SubjectResponse only
+# costs time. `responses=` keeps the schema in the OpenAPI docs.
+# Cache fills read the primary, not the replica: a lagging replica would
+# cache the pre-write row for the whole TTL right after a write cleared it.
+@router.get("", response_model=None, responses={200: {"model": list[SubjectResponse]}})
 async def list_subjects(project_id: Optional[UUID] = Query(None)):
+    cached = subject_cache.get(("list", project_id))
+    if cached is not None:
+        return RowsResponse(cached)
     async with get_conn() as conn:
-        if project_id:
-            rows = await conn.fetch(
-                "SELECT * FROM v_subject_summary WHERE project_id = $1 ORDER BY name",
-                project_id,
-            )
-        else:
-            rows = await conn.fetch("SELECT * FROM v_subject_summary ORDER BY name")
-        return [_enrich_subject(dict(r)) for r in rows]
+        rows = await conn.fetch(
+            "SELECT * FROM v_subject_summary "
+            "WHERE ($1::uuid IS NULL OR project_id = $1) ORDER BY name",
+            project_id,
+        )
+    subjects = [_enrich_subject(dict(r)) for r in rows]
+    subject_cache.set(("list", project_id), subjects)
+    return RowsResponse(subjects)
 
 
-@router.get("/{subject_id}", response_model=SubjectResponse)
+@router.get("/{subject_id}", response_model=None, responses={200: {"model": SubjectResponse}})
 async def get_subject(subject_id: UUID):
+    cached = subject_cache.get(("get", subject_id))
+    if cached is not None:
+        return RowsResponse(cached)
     async with get_conn() as conn:
         row = await conn.fetchrow("SELECT * FROM v_subject_summary WHERE id = $1", subject_id)
         if not row:
             raise HTTPException(status_code=404, detail="Subject not found")
-        return _enrich_subject(dict(row))
+    subject = _enrich_subject(dict(row))
+    subject_cache.set(("get", subject_id), subject)
+    return RowsResponse(subject)
 
 
 @router.post("", response_model=SubjectResponse, status_code=201)
 async def create_subject(data: SubjectCreate):
     async with get_conn() as conn:
         row = await conn.fetchrow(
-            """INSERT INTO subjects (project_id, name, description, notes, tags)
-               VALUES ($1, $2, $3, $4, $5)
-               RETURNING id""",
+            f"""WITH w AS (
+                   INSERT INTO subjects (project_id, name, description, notes, tags)
+                   VALUES ($1, $2, $3, $4, $5)
+                   RETURNING *
+               )
+               {_SUMMARY_SELECT}""",
             data.project_id, normalize_subject_name(data.name), data.description, data.notes, data.tags,
         )
-        subject_id = row["id"]
-        result = await conn.fetchrow("SELECT * FROM v_subject_summary WHERE id = $1", subject_id)
-        return _enrich_subject(dict(result))
+    subject_cache.clear()
+    return _enrich_subject(dict(row))
 
 
 @router.put("/{subject_id}", response_model=SubjectResponse)
 async def update_subject(subject_id: UUID, data: SubjectUpdate):
-    updates = {k: v for k, v in data.model_dump().items() if v is not None}
+    updates = data.model_dump(exclude_none=True)
     if 'name' in updates:
         updates['name'] = normalize_subject_name(updates['name'])
     if not updates:
@@ -72,11 +107,11 @@ async def update_subject(subject_id: UUID, data: SubjectUpdate):
 
     sql, vals = build_update("subjects", updates, subject_id)
     async with get_conn() as conn:
-        row = await conn.fetchrow(sql, *vals)
+        row = await conn.fetchrow(f"WITH w AS ({sql}) {_SUMMARY_SELECT}", *vals)
         if not row:
             raise HTTPException(status_code=404, detail="Subject not found")
-        result = await conn.fetchrow("SELECT * FROM v_subject_summary WHERE id = $1", subject_id)
-        return _enrich_subject(dict(result))
+    subject_cache.clear()
+    return _enrich_subject(dict(row))
 
 
 @router.delete("/{subject_id}", status_code=204)
@@ -85,6 +120,7 @@ async def delete_subject(subject_id: UUID):
         row = await conn.fetchrow("DELETE FROM subjects WHERE id = $1 RETURNING id", subject_id)
         if not row:
             raise HTTPException(status_code=404, detail="Subject not found")
+    subject_cache.clear()
 
 
 @router.post("/bulk-delete", status_code=200)
@@ -92,52 +128,44 @@ async def bulk_delete_subjects(data: BulkDeleteRequest):
     if not data.ids:
         raise HTTPException(status_code=400, detail="No IDs provided")
     async with get_conn() as conn:
-        result = await conn.execute(
-            "DELETE FROM subjects WHERE id = ANY($1::uuid[])", data.ids)
-        deleted_count = int(result.split()[-1])
-        return {"deleted": deleted_count}
+        rows = await conn.fetch(
+            "DELETE FROM subjects WHERE id = ANY($1::uuid[]) RETURNING id", data.ids)
+    subject_cache.clear()
+    return {"deleted": len(rows), "ids": [r["id"] for r in rows]}
 
 
-@router.get("/{subject_id}/packages")
+@router.get("/{subject_id}/packages", response_model=None)
 async def list_subject_packages(
     subject_id: UUID,
     package_type: Optional[str] = Query(None),
 ):
-    async with get_conn() as conn:
-        if package_type:
-            rows = await conn.fetch(
-                """SELECT p.* FROM packages p
-                   JOIN packages_subjects ps ON p.id = ps.package_id
-                   WHERE ps.subject_id = $1 AND p.package_type = $2
-                   ORDER BY p.ingested_at DESC""",
-                subject_id, package_type,
-            )
-        else:
-            rows = await conn.fetch(
-                """SELECT p.* FROM packages p
-                   JOIN packages_subjects ps ON p.id = ps.package_id
-                   WHERE ps.subject_id = $1
-                   ORDER BY p.ingested_at DESC""",
-                subject_id,
-            )
-        return [dict(r) for r in rows]
+    async with get_read_conn() as conn:
+        rows = await conn.fetch(
+            """SELECT p.* FROM packages p
+               JOIN packages_subjects ps ON p.id = ps.package_id
+               WHERE ps.subject_id = $1 AND ($2::text IS NULL OR p.package_type = $2)
+               ORDER BY p.ingested_at DESC""",
+            subject_id, package_type,
+        )
+    return RowsResponse([dict(r) for r in rows])
 
 
 
-@router.get("/{subject_id}/assets", response_model=PaginatedAssetResponse)
-async def list_subject_assets(
+async def _subject_assets_page(
+    conn,
     subject_id: UUID,
-    package_id: Optional[UUID] = Query(None),
-    file_type: Optional[str] = Query(None),
-    asset_type: Optional[str] = Query(None),
-    picked_up: Optional[bool] = Query(None),
-    search: Optional[str] = Query(None),
-    offset: int = Query(0, ge=0),
-    limit: int = Query(200, ge=1, le=500),
-):
-    """Get paginated assets for a subject across all its packages."""
+    *,
+    package_id: Optional[UUID] = None,
+    file_type: Optional[str] = None,
+    asset_type: Optional[str] = None,
+    picked_up: Optional[bool] = None,
+    search: Optional[str] = None,
+    offset: int = 0,
+    limit: int = 200,
+    cursor: Optional[str] = None,
+) -> dict:
     # Filter assets directly by their subject_id (supports multi-subject packages)
-    base_where = f"a.subject_id = $1"
+    base_where = "a.subject_id = $1"
     base_params: list = [subject_id]
 
     where, extra_params = _build_asset_filters(
@@ -149,14 +177,54 @@ async def list_subject_assets(
         base_where=base_where,
         param_offset=len(base_params),
     )
-    params = base_params + extra_params
+    return await _paginated_asset_query(
+        conn,
+        from_clause="assets a",
+        where=where,
+        params=base_params + extra_params,
+        offset=offset,
+        limit=limit,
+        cursor=cursor,
+        keyset=True,
+    )
 
-    async with get_conn() as conn:
-        return await _paginated_asset_query(
-            conn,
-            from_clause="assets a JOIN packages p ON a.package_id = p.id",
-            where=where,
-            params=params,
-            offset=offset,
-            limit=limit,
+
+@router.get("/{subject_id}/assets", response_model=PaginatedAssetResponse)
+async def list_subject_assets(
+    subject_id: UUID,
+    package_id: Optional[UUID] = Query(None),
+    file_type: Optional[str] = Query(None),
+    asset_type: Optional[str] = Query(None),
+    picked_up: Optional[bool] = Query(None),
+    search: Optional[str] = Query(None),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(200, ge=1, le=500),
+    cursor: Optional[str] = Query(None),
+):
+    """Get paginated assets for a subject across all its packages.
+
+    Pass the previous page's ``next_cursor`` as ``cursor`` to seek instead of
+    using OFFSET (``offset`` is ignored when a cursor is given).
+    """
+    async with get_read_conn() as conn:
+        return await _subject_assets_page(
+            conn, subject_id,
+            package_id=package_id, file_type=file_type, asset_type=asset_type,
+            picked_up=picked_up, search=search, offset=offset, limit=limit, cursor=cursor,
         )
+
+
+@router.post("/{subject_id}/assets/batch", response_model=list[PaginatedAssetResponse])
+async def batch_subject_assets(subject_id: UUID, data: AssetBatchRequest):
+    """Run several asset filter combinations for a subject in one request.
+
+    Each query gets its own pooled connection so they execute concurrently;
+    a semaphore keeps a batch from taking more than half the pool.
+    """
+    sem = asyncio.Semaphore(max(1, settings.db_pool_max // 2))
+
+    async def _run(spec):
+        async with sem, get_read_conn() as conn:
+            return await _subject_assets_page(conn, subject_id, **spec.model_dump())
+
+    return await asyncio.gather(*(_run(q) for q in data.queries))
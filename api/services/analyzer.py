@@ -5,50 +5,88 @@ sends file metadata to Gemini Flash for LLM-based normalization (ATMAN) or uses
 regex-based parsing (VFX aligned extractions).
 """
 
+import hashlib
 import json
 import logging
 import os
+import random
 import re
+import time
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+
+import httpx
 from google import genai
+from google.genai import errors as genai_errors
 from google.genai import types
 
 from ..config import settings
 
 logger = logging.getLogger(__name__)
 
-VIDEO_EXTENSIONS = {
+VIDEO_EXTENSIONS = frozenset({
     ".mp4", ".mov", ".avi", ".mkv", ".wmv", ".flv", ".webm",
     ".m4v", ".mpg", ".mpeg", ".mxf", ".ts", ".mts", ".m2ts",
     ".3gp", ".ogv", ".r3d",
-}
+})
 
-IMAGE_EXTENSIONS = {
+IMAGE_EXTENSIONS = frozenset({
     ".jpg", ".jpeg", ".png", ".tiff", ".tif", ".bmp", ".webp",
     ".exr", ".dpx", ".hdr", ".gif", ".heic", ".heif", ".raw",
     ".cr2", ".cr3", ".nef", ".arw", ".dng",
+})
+
+AUDIO_EXTENSIONS = frozenset({".wav", ".aiff", ".aif", ".mp3", ".flac", ".ogg", ".m4a"})
+SIDECAR_EXTENSIONS = frozenset({".xml", ".json", ".srt", ".edl", ".cdl"})
+
+# Extension -> category in a single lookup. Later entries override earlier
+# ones, giving video > image > audio > sidecar precedence on any overlap.
+_EXT_CATEGORY: dict[str, str] = {
+    **{e: "sidecar" for e in SIDECAR_EXTENSIONS},
+    **{e: "audio" for e in AUDIO_EXTENSIONS},
+    **{e: "image" for e in IMAGE_EXTENSIONS},
+    **{e: "video" for e in VIDEO_EXTENSIONS},
 }
 
-AUDIO_EXTENSIONS = {".wav", ".aiff", ".aif", ".mp3", ".flac", ".ogg", ".m4a"}
-SIDECAR_EXTENSIONS = {".xml", ".json", ".srt", ".edl", ".cdl"}
+
+def _suffix(name: str) -> str:
+    """Lower-cased extension of a filename, matching ``Path(name).suffix.lower()``."""
+    i = name.rfind(".")
+    return name[i:].lower() if 0 < i < len(name) - 1 else ""
 
 
 def classify_file(path: Path) -> str:
     """Classify a file as 'video', 'image', 'audio', 'sidecar', or 'other'."""
-    ext = path.suffix.lower()
-    if ext in VIDEO_EXTENSIONS:
-        return "video"
-    if ext in IMAGE_EXTENSIONS:
-        return "image"
-    if ext in AUDIO_EXTENSIONS:
-        return "audio"
-    if ext in SIDECAR_EXTENSIONS:
-        return "sidecar"
-    return "other"
+    return _EXT_CATEGORY.get(path.suffix.lower(), "other")
+
+
+def _iter_files(root: Path):
+    """Yield a ``DirEntry`` for every file under *root*, skipping dotfiles and dot-dirs.
+
+    Single ``os.scandir`` pass: hidden directories are pruned before descent and
+    each entry's type/stat info is cached, so callers get ``name``, ``path`` and
+    ``stat()`` without extra syscalls or ``Path`` allocations. Like ``rglob``,
+    symlinked directories are not followed and unreadable directories are skipped.
+    """
+    stack = [os.fspath(root)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except PermissionError:
+            continue
+        with it:
+            for entry in it:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    yield entry
 
 
-_VFX_FRAME_RE = re.compile(r"^\w+_\d{3,}_\d+\.png$", re.IGNORECASE)
+_VFX_FRAME_RE = re.compile(r"^\w+_\d{3,}_\d+\.png$", re.IGNORECASE | re.ASCII)
 
 
 def detect_package_type(source: Path) -> str:
@@ -70,33 +108,39 @@ def detect_package_type(source: Path) -> str:
             indicators += 1
             break
 
-    sample_files = []
-    for f in source.rglob("*"):
-        if f.is_file() and not any(p.startswith(".") for p in f.relative_to(source).parts):
-            sample_files.append(f)
-            if len(sample_files) >= 200:
-                break
+    # Sample up to 200 files; _iter_files already drops dotfiles
+    sampled = png_count = pattern_matches = 0
+    for entry in _iter_files(source):
+        name = entry.name
+        # The frame pattern ends in .png, so only PNGs can match it
+        if name[-4:].lower() == ".png":
+            png_count += 1
+            if _VFX_FRAME_RE.match(name):
+                pattern_matches += 1
+        sampled += 1
+        if sampled >= 200:
+            break
 
-    if sample_files:
-        png_count = sum(1 for f in sample_files if f.suffix.lower() == ".png")
-        png_ratio = png_count / len(sample_files)
-        if png_ratio >= 0.9:
+    if sampled:
+        if png_count / sampled >= 0.9:
             indicators += 1
-
-        pattern_matches = sum(1 for f in sample_files if _VFX_FRAME_RE.match(f.name))
-        if len(sample_files) > 0 and pattern_matches / len(sample_files) >= 0.8:
+        if pattern_matches / sampled >= 0.8:
             indicators += 1
 
     return "vfx" if indicators >= 2 else "atman"
 
 
 
-def _identity_from_path(file_path: Path, base_dir: Path) -> str:
+# Container dirs that never name the subject in a VFX extraction tree
+_IDENT_SKIP = frozenset({"media", "external", "aligned", "from_client", "visuals", "plate"})
+
+
+def _identity_from_path(path_str: str, rel_parts: list[str]) -> str:
     """Extract subject/identity name from directory structure.
 
-    Looks for '/datasets/' marker, or falls back to first relative path component.
+    Looks for '/datasets/' marker in the absolute path, or falls back to the
+    first non-generic component of the path relative to the package root.
     """
-    path_str = str(file_path)
     marker = "/datasets/"
     idx = path_str.find(marker)
     if idx >= 0:
@@ -107,39 +151,37 @@ def _identity_from_path(file_path: Path, base_dir: Path) -> str:
             first_component = first_component.split("__", 1)[1]
         return first_component or "unknown"
 
-    try:
-        rel = file_path.relative_to(base_dir)
-        parts = rel.parts
-        skip = {"media", "external", "aligned", "from_client", "visuals", "plate"}
-        for part in parts:
-            if part.lower() not in skip and not part.startswith("."):
-                return part
-    except (ValueError, IndexError):
-        pass
+    for part in rel_parts:
+        if part.lower() not in _IDENT_SKIP and not part.startswith("."):
+            return part
     return "unknown"
 
 
+def _sorted_files(source: Path) -> list[tuple[str, os.DirEntry]]:
+    """All visible files under *source* as ``(rel_path, entry)``, in ``sorted(rglob())`` order."""
+    prefix = len(os.fspath(source)) + 1
+    files = [(entry.path[prefix:], entry) for entry in _iter_files(source)]
+    files.sort(key=lambda item: item[0].split(os.sep))
+    return files
+
+
 def _analyze_vfx(source: Path) -> dict:
     """Analyze a VFX extraction directory using regex-based parsing."""
     files_by_subject: dict[str, list[dict]] = defaultdict(list)
+    subject_sizes: dict[str, int] = defaultdict(int)
     total_size = 0
 
-    for f in sorted(source.rglob("*")):
-        if not f.is_file():
-            continue
-        if any(p.startswith(".") for p in f.relative_to(source).parts):
-            continue
-
-        ftype = classify_file(f)
+    for rel_path, entry in _sorted_files(source):
+        ftype = _EXT_CATEGORY.get(_suffix(entry.name), "other")
         if ftype not in ("image", "video", "audio"):
             continue
 
-        size = f.stat().st_size
+        size = entry.stat().st_size
         total_size += size
-        rel_path = str(f.relative_to(source))
-        subject = _identity_from_path(f, source)
+        parts = rel_path.split(os.sep)
+        subject = _identity_from_path(entry.path, parts)
 
-        rel_parts = [p.lower() for p in Path(rel_path).parts]
+        rel_parts = [p.lower() for p in parts]
         if any(seg in ("grids", "grid") for seg in rel_parts):
             asset_type = "grid"
         elif "plate" in rel_parts:
@@ -147,6 +189,7 @@ def _analyze_vfx(source: Path) -> dict:
         else:
             asset_type = "aligned"
 
+        subject_sizes[subject] += size
         files_by_subject[subject].append({
             "original_path": rel_path,
             "file_type": ftype,
@@ -159,11 +202,10 @@ def _analyze_vfx(source: Path) -> dict:
 
     subjects = []
     for name, files in sorted(files_by_subject.items()):
-        subj_size = sum(f["size_bytes"] for f in files)
         subjects.append({
             "name": name,
             "file_count": len(files),
-            "total_size_bytes": subj_size,
+            "total_size_bytes": subject_sizes[name],
             "files": files,
         })
 
@@ -263,100 +305,184 @@ Each item in the list MUST have these exact keys:
 - "target_path": The proposed normalized destination path.
 """
 
-BATCH_SIZE = 40
-
-
-def _tokenize(filename: str) -> list[str]:
-    """Split a filename into tokens on common delimiters."""
-    return re.split(r"[_\-.\s]+", filename)
+BATCH_SIZE = 80
 
 
 def _scan_directory(source: Path) -> list[dict]:
-    """Walk directory and build file facts for LLM normalization."""
-    files = []
-    for f in sorted(source.rglob("*")):
-        if not f.is_file():
-            continue
-        if any(p.startswith(".") for p in f.relative_to(source).parts):
-            continue
+    """Walk directory and build file facts for LLM normalization.
 
-        ftype = classify_file(f)
+    Facts are kept to what the LLM needs (path, extension, rough size);
+    anything derivable from those is left out to save prompt tokens.
+    ``size_bytes`` is the exact size for bookkeeping; callers drop it before
+    sending facts to the LLM, which only sees the rounded ``size_mb``.
+    """
+    files = []
+    for rel_path, entry in _sorted_files(source):
+        name = entry.name
+        ext = _suffix(name)
+        ftype = _EXT_CATEGORY.get(ext, "other")
         if ftype not in ("video", "image", "audio"):
             continue
 
-        rel_path = str(f.relative_to(source))
-        ext = f.suffix.lower()
+        size = entry.stat().st_size
         files.append({
             "path": rel_path,
-            "filename": f.name,
             "ext": ext,
-            "is_video": ext in VIDEO_EXTENSIONS,
-            "is_audio": ext in AUDIO_EXTENSIONS,
-            "size_mb": round(f.stat().st_size / (1024 * 1024), 2),
-            "tokens": _tokenize(f.stem),
+            "size_bytes": size,
+            "size_mb": round(size / (1024 * 1024), 2),
         })
     return files
 
 
+# Bump to invalidate cached responses when the request shape changes.
+# SYSTEM_PROMPT and the model name are part of the key, so edits to those
+# invalidate automatically.
+_GEMINI_CACHE_VERSION = "1"
+_GEMINI_MODEL = "gemini-2.0-flash"
+_GEMINI_ATTEMPTS = 3
+# Client errors worth retrying (timeout, rate limit); 5xx always is
+_GEMINI_RETRY_CODES = {408, 429}
+
+
+def _gemini_cache_path(chunk_input: dict) -> Path:
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{_GEMINI_CACHE_VERSION}\0{_GEMINI_MODEL}\0{SYSTEM_PROMPT}\0".encode())
+    h.update(json.dumps(chunk_input, sort_keys=True).encode())
+    return Path(settings.llm_cache_dir) / f"{h.hexdigest()}.json"
+
+
+def _gemini_cache_get(path: Path) -> list[dict] | None:
+    try:
+        return json.loads(path.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+def _gemini_cache_put(path: Path, manifest: list[dict]) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(manifest))
+        os.replace(tmp, path)
+    except OSError as exc:
+        logger.warning("Could not write LLM cache entry %s: %s", path, exc)
+
+
+def _chunk_input(package_root: str, chunk: list[dict]) -> dict:
+    return {
+        "package_root": package_root,
+        "file_count": len(chunk),
+        "files": chunk,
+    }
+
+
+def _call_gemini_batch(client, package_root: str, chunk: list[dict],
+                       batch_num: int, total_batches: int) -> list[dict]:
+    """Normalize one batch of file facts, retrying up to 3 times.
+
+    Rate limits, server errors and transport failures back off exponentially
+    (with jitter) between attempts; malformed JSON is retried immediately.
+    Successful responses are written to the LLM cache. Returns an empty list
+    if every attempt fails or the request is rejected outright.
+    """
+    chunk_input = _chunk_input(package_root, chunk)
+
+    logger.info("LLM batch %d/%d (%d files)", batch_num, total_batches, len(chunk))
+
+    for attempt in range(_GEMINI_ATTEMPTS):
+        last = attempt == _GEMINI_ATTEMPTS - 1
+        try:
+            response = client.models.generate_content(
+                model=_GEMINI_MODEL,
+                contents=json.dumps(chunk_input, separators=(",", ":")),
+                config=types.GenerateContentConfig(
+                    system_instruction=SYSTEM_PROMPT,
+                    response_mime_type="application/json",
+                    temperature=0.0,
+                    max_output_tokens=16384,
+                ),
+            )
+            text = response.text or ""
+            data = json.loads(text)
+            if not isinstance(data, dict):
+                raise json.JSONDecodeError("Expected a JSON object", text, 0)
+            batch_manifest = data.get("manifest", [])
+            logger.info("Batch %d/%d: %d mappings", batch_num, total_batches, len(batch_manifest))
+            _gemini_cache_put(_gemini_cache_path(chunk_input), batch_manifest)
+            return batch_manifest
+
+        except json.JSONDecodeError as exc:
+            # Malformed output — retry straight away, there's nothing to wait out
+            logger.warning("Batch %d attempt %d: bad response: %s", batch_num, attempt + 1, exc)
+
+        except (genai_errors.APIError, httpx.TransportError) as exc:
+            code = getattr(exc, "code", None)
+            if isinstance(exc, genai_errors.ClientError) and code not in _GEMINI_RETRY_CODES:
+                logger.error("Batch %d failed: %s", batch_num, exc)
+                return []
+            logger.warning("Batch %d attempt %d failed: %s", batch_num, attempt + 1, exc)
+            if not last:
+                time.sleep(min(30.0, 2 ** attempt + random.random()))
+
+    logger.error("Batch %d failed after %d attempts", batch_num, _GEMINI_ATTEMPTS)
+    return []
+
+
+@lru_cache(maxsize=1)
+def _gemini_client(api_key: str) -> genai.Client:
+    """Process-wide Gemini client, so analyses reuse its keep-alive connections."""
+    return genai.Client(api_key=api_key)
+
+
 def _call_gemini(file_facts: dict) -> list[dict]:
     """Send file facts to Gemini Flash for path normalization.
 
     Returns a list of {source_path, target_path} manifest entries.
     Uses response_mime_type="application/json" for guaranteed JSON output.
+    Batches run concurrently (up to GEMINI_CONCURRENCY) on one shared client;
+    the manifest keeps batch order. Batches already answered for identical
+    input are served from the on-disk cache in LLM_CACHE_DIR.
     """
     if not settings.gemini_api_key:
         raise ValueError("GOOGLE_API_KEY is not configured")
 
-    client = genai.Client(api_key=settings.gemini_api_key)
     all_files = file_facts["files"]
     package_root = file_facts["package_root"]
-    manifest: list[dict] = []
 
-    for i in range(0, len(all_files), BATCH_SIZE):
-        chunk = all_files[i:i + BATCH_SIZE]
-        batch_num = (i // BATCH_SIZE) + 1
-        total_batches = (len(all_files) + BATCH_SIZE - 1) // BATCH_SIZE
-
-        chunk_input = {
-            "package_root": package_root,
-            "file_count": len(chunk),
-            "files": chunk,
-        }
-
-        logger.info("LLM batch %d/%d (%d files)", batch_num, total_batches, len(chunk))
-
-        for attempt in range(3):
-            try:
-                response = client.models.generate_content(
-                    model="gemini-2.0-flash",
-                    contents=json.dumps(chunk_input, indent=2),
-                    config=types.GenerateContentConfig(
-                        system_instruction=SYSTEM_PROMPT,
-                        response_mime_type="application/json",
-                        temperature=0.0,
-                        max_output_tokens=16384,
-                    ),
-                )
-                data = json.loads(response.text)
-                batch_manifest = data.get("manifest", [])
-                manifest.extend(batch_manifest)
-                logger.info("Batch %d/%d: %d mappings", batch_num, total_batches, len(batch_manifest))
-                break
-
-            except (json.JSONDecodeError, Exception) as exc:
-                logger.warning("Batch %d attempt %d failed: %s", batch_num, attempt + 1, exc)
-                if attempt == 2:
-                    logger.error("Batch %d failed after 3 attempts", batch_num)
+    chunks = [all_files[i:i + BATCH_SIZE] for i in range(0, len(all_files), BATCH_SIZE)]
+    total_batches = len(chunks)
+
+    results: list[list[dict] | None] = [
+        _gemini_cache_get(_gemini_cache_path(_chunk_input(package_root, chunk)))
+        for chunk in chunks
+    ]
+    misses = [i for i, r in enumerate(results) if r is None]
+    if len(misses) < total_batches:
+        logger.info("LLM cache: %d/%d batches cached", total_batches - len(misses), total_batches)
+
+    if misses:
+        client = _gemini_client(settings.gemini_api_key)
+        workers = max(1, min(settings.gemini_concurrency, len(misses)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            fetched = executor.map(
+                lambda i: _call_gemini_batch(client, package_root, chunks[i], i + 1, total_batches),
+                misses,
+            )
+            for i, batch_manifest in zip(misses, fetched):
+                results[i] = batch_manifest
 
+    manifest: list[dict] = []
+    for batch_manifest in results:
+        manifest.extend(batch_manifest)
     return manifest
 
 
-_GENERIC_DIRS = {
+_GENERIC_DIRS = frozenset({
     "media", "footage", "raw", "proxy", "proxies", "graded", "exports",
     "output", "rec709_conversion", "rec709", "conversion", "cards", "card",
     "day_01", "day_02", "day_1", "day_2", "shoot_data", "shared", "common",
     "cam_a", "cam_b", "camera", "angle_1", "angle_2",
-}
+})
 
 _GRADED_SUFFIXES = {
     "_graded", "_color", "_colour", "_grade", "_lut", "_cc",
@@ -364,7 +490,24 @@ _GRADED_SUFFIXES = {
 }
 
 
-def _validate_subject_assignments(manifest_lookup: dict, all_files: list) -> dict:
+def _path_keys(all_files: list[dict]) -> list[tuple[str, list[str], str]]:
+    """Per scanned file: (rel_path, lowered/underscored dir components, lowered stem).
+
+    Computed once and shared by the post-LLM subject fix-ups, so they don't
+    rebuild ``Path`` objects for every file on every pass. Kept out of the
+    file facts themselves since those are sent to (and cache-keyed for) Gemini.
+    """
+    keys = []
+    for f in all_files:
+        rel_path = f["path"]
+        name, ext = rel_path.rpartition(os.sep)[2], f["ext"]
+        stem = name[:len(name) - len(ext)] if ext else name
+        dirs = [p.lower().replace(" ", "_") for p in rel_path.split(os.sep)[:-1]]
+        keys.append((rel_path, dirs, stem.lower()))
+    return keys
+
+
+def _validate_subject_assignments(manifest_lookup: dict, path_keys: list) -> dict:
     """Cross-check LLM subject assignments against directory structure.
 
     If >80% of files are assigned to one subject but paths show distinct
@@ -386,12 +529,10 @@ def _validate_subject_assignments(manifest_lookup: dict, all_files: list) -> dic
         return manifest_lookup  # Distribution looks reasonable
 
     path_subject_candidates: dict[str, set] = defaultdict(set)
-    for file_info in all_files:
-        parts = Path(file_info["path"]).parts
-        for part in parts[:-1]:  # exclude filename
-            lower = part.lower().replace(" ", "_")
+    for rel_path, dirs, _ in path_keys:
+        for lower in dirs:
             if lower not in _GENERIC_DIRS and not lower.startswith("."):
-                path_subject_candidates[lower].add(file_info["path"])
+                path_subject_candidates[lower].add(rel_path)
 
     real_candidates = {k: v for k, v in path_subject_candidates.items() if len(v) >= 2}
 
@@ -404,13 +545,10 @@ def _validate_subject_assignments(manifest_lookup: dict, all_files: list) -> dic
         len(real_candidates), list(real_candidates.keys()),
     )
 
-    for file_info in all_files:
-        rel_path = file_info["path"]
+    for rel_path, dirs, _ in path_keys:
         if rel_path not in manifest_lookup:
             continue
-        parts = Path(rel_path).parts
-        for part in parts[:-1]:
-            lower = part.lower().replace(" ", "_")
+        for lower in dirs:
             if lower in real_candidates:
                 manifest_lookup[rel_path]["subject"] = lower
                 break
@@ -418,7 +556,7 @@ def _validate_subject_assignments(manifest_lookup: dict, all_files: list) -> dic
     return manifest_lookup
 
 
-def _match_shared_by_filename(manifest_lookup: dict, all_files: list) -> dict:
+def _match_shared_by_filename(manifest_lookup: dict, path_keys: list) -> dict:
     """Reassign 'shared' files to a subject by cross-referencing filename stems.
 
     Graded/colour files in generic directories (e.g. graded/) often share the
@@ -426,26 +564,25 @@ def _match_shared_by_filename(manifest_lookup: dict, all_files: list) -> dict:
     from resolved files and reassign shared files whose stem matches exactly
     one subject.
     """
+    if not any(parsed["subject"] == "shared" for parsed in manifest_lookup.values()):
+        return manifest_lookup  # Nothing to reassign; skip building the stem index
+
     stem_to_subjects: dict[str, set[str]] = defaultdict(set)
-    for file_info in all_files:
-        rel_path = file_info["path"]
+    for rel_path, _, stem in path_keys:
         parsed = manifest_lookup.get(rel_path)
         if parsed is None or parsed["subject"] == "shared":
             continue
-        stem = Path(rel_path).stem.lower()
         stem_to_subjects[stem].add(parsed["subject"])
 
     if not stem_to_subjects:
         return manifest_lookup
 
     reassigned = 0
-    for file_info in all_files:
-        rel_path = file_info["path"]
+    for rel_path, _, raw_stem in path_keys:
         parsed = manifest_lookup.get(rel_path)
         if parsed is None or parsed["subject"] != "shared":
             continue
 
-        raw_stem = Path(rel_path).stem.lower()
         matched = stem_to_subjects.get(raw_stem, set())
 
         if not matched:
@@ -469,11 +606,68 @@ def _match_shared_by_filename(manifest_lookup: dict, all_files: list) -> dict:
 
 def _parse_target_path(target_path: str) -> dict:
     """Parse a normalized target_path into subject/camera/asset_type."""
-    parts = target_path.strip("/").split("/")
-    subject = parts[0] if len(parts) >= 1 else "shared"
-    camera = parts[1] if len(parts) >= 2 else "cam_a"
-    asset_type = parts[2] if len(parts) >= 3 else "raw"
-    return {"subject": subject, "camera": camera, "asset_type": asset_type}
+    # Slice the first three components with find() rather than splitting the
+    # whole path (which includes the filename) into a list
+    path = target_path.strip("/")
+    i = path.find("/")
+    if i < 0:
+        return {"subject": path, "camera": "cam_a", "asset_type": "raw"}
+    j = path.find("/", i + 1)
+    if j < 0:
+        return {"subject": path[:i], "camera": path[i + 1:], "asset_type": "raw"}
+    k = path.find("/", j + 1)
+    asset_type = path[j + 1:k] if k >= 0 else path[j + 1:]
+    return {"subject": path[:i], "camera": path[i + 1:j], "asset_type": asset_type}
+
+
+# Deterministic pre-pass for the common {Subject}/{Cam_X}/[{Type}/]file layout.
+# Only files where subject, camera and asset type are all unambiguous skip the
+# LLM; anything else is still sent to Gemini.
+_SUBJECT_DIR_RE = re.compile(r"^[a-z]+(?:[ _-][a-z]+)*$")
+_CAMERA_DIR_RE = re.compile(r"^(?:cam(?:era)?_?([a-z])|([a-z])_?cam)$")
+_NON_SUBJECT_DIRS = _GENERIC_DIRS | frozenset({
+    "test", "tests", "testing", "temp", "tmp", "backup", "archive", "misc",
+    "other", "unknown", "assets", "livefacelink", "liveface", "nuke", "flame",
+    "fusion", "resolve", "davinci", "premiere", "aftereffects", "grading",
+    "finishing", "conform",
+})
+_ASSET_TYPE_DIRS = {
+    "proxy": "proxy", "proxies": "proxy",
+    "graded": "graded", "color": "graded", "colour": "graded", "rec709": "graded", "cc": "graded",
+    "raw": "raw", "braw": "raw", "originals": "raw",
+}
+_RAW_EXTS = frozenset({".mxf", ".r3d", ".braw"})
+
+
+def _deterministic_target(file_info: dict, dirs: list[str]) -> str | None:
+    """Return a normalized target_path when the layout makes it unambiguous.
+
+    *dirs* are the file's lowered/underscored directory components (from
+    ``_path_keys``).
+    """
+    if len(dirs) < 2:
+        return None
+    subject = dirs[0]
+    if subject in _NON_SUBJECT_DIRS or not _SUBJECT_DIR_RE.match(subject):
+        return None
+    cam = _CAMERA_DIR_RE.match(dirs[1])
+    if not cam:
+        return None
+    camera = f"cam_{cam.group(1) or cam.group(2)}"
+
+    ext = file_info["ext"]
+    asset_types = {_ASSET_TYPE_DIRS[d] for d in dirs[2:] if d in _ASSET_TYPE_DIRS}
+    if len(asset_types) > 1:
+        return None
+    if asset_types:
+        asset_type = asset_types.pop()
+    elif ext in AUDIO_EXTENSIONS or ext in _RAW_EXTS:
+        asset_type = "raw"
+    else:
+        return None
+
+    filename = file_info["path"].rpartition(os.sep)[2]
+    return f"{subject.replace('-', '_')}/{camera}/{asset_type}/{filename}"
 
 
 def _analyze_atman(source: Path) -> dict:
@@ -488,13 +682,29 @@ def _analyze_atman(source: Path) -> dict:
             "subjects": [],
         }
 
-    file_facts = {
-        "package_root": source.name,
-        "file_count": len(all_files),
-        "files": all_files,
-    }
+    # Per-file columns aligned with all_files, so the final pass doesn't need
+    # per-path dict lookups
+    sizes = [f.pop("size_bytes") for f in all_files]
+    path_keys = _path_keys(all_files)
 
-    manifest = _call_gemini(file_facts)
+    manifest: list[dict] = []
+    llm_files = []
+    for file_info, (rel_path, dirs, _) in zip(all_files, path_keys):
+        target = _deterministic_target(file_info, dirs)
+        if target is None:
+            llm_files.append(file_info)
+        else:
+            manifest.append({"source_path": rel_path, "target_path": target})
+
+    if manifest:
+        logger.info("Resolved %d/%d files without the LLM", len(manifest), len(all_files))
+    if llm_files:
+        file_facts = {
+            "package_root": source.name,
+            "file_count": len(llm_files),
+            "files": llm_files,
+        }
+        manifest.extend(_call_gemini(file_facts))
 
     manifest_lookup = {}
     for entry in manifest:
@@ -502,25 +712,19 @@ def _analyze_atman(source: Path) -> dict:
         tp = entry.get("target_path", "")
         manifest_lookup[sp] = _parse_target_path(tp)
 
-    manifest_lookup = _validate_subject_assignments(manifest_lookup, all_files)
-    manifest_lookup = _match_shared_by_filename(manifest_lookup, all_files)
+    manifest_lookup = _validate_subject_assignments(manifest_lookup, path_keys)
+    manifest_lookup = _match_shared_by_filename(manifest_lookup, path_keys)
 
     files_by_subject: dict[str, list[dict]] = defaultdict(list)
+    subject_sizes: dict[str, int] = defaultdict(int)
     total_size = 0
 
-    for file_info in all_files:
+    for file_info, size in zip(all_files, sizes):
         rel_path = file_info["path"]
-        full_path = source / rel_path
-        size = int(file_info["size_mb"] * 1024 * 1024)
         total_size += size
 
         parsed = manifest_lookup.get(rel_path, {"subject": "shared", "camera": "cam_a", "asset_type": "raw"})
-        if file_info["is_video"]:
-            ftype = "video"
-        elif file_info.get("is_audio"):
-            ftype = "audio"
-        else:
-            ftype = "image"
+        ftype = _EXT_CATEGORY[file_info["ext"]]
 
         file_entry = {
             "original_path": rel_path,
@@ -532,14 +736,14 @@ def _analyze_atman(source: Path) -> dict:
             "selected": True,
         }
         files_by_subject[parsed["subject"]].append(file_entry)
+        subject_sizes[parsed["subject"]] += size
 
     subjects = []
     for name, files in sorted(files_by_subject.items()):
-        subj_size = sum(f["size_bytes"] for f in files)
         subjects.append({
             "name": name,
             "file_count": len(files),
-            "total_size_bytes": subj_size,
+            "total_size_bytes": subject_sizes[name],
             "files": files,
         })
 
@@ -2,9 +2,13 @@
 
 import logging
 import os
-from difflib import SequenceMatcher
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
+from rapidfuzz import fuzz
+
 logger = logging.getLogger(__name__)
 
 
@@ -13,16 +17,27 @@ def _normalize(name: str) -> str:
     return name.lower().replace("_", " ").replace("-", " ").strip()
 
 
+@lru_cache(maxsize=4096)
+def _dir_keys(dir_name: str) -> tuple[str, str]:
+    """Normalized name and first token of a dataset dir.
+
+    Cached because the same dataset_dirs list is matched against every
+    subject in a resolve request.
+    """
+    norm = _normalize(dir_name)
+    tokens = norm.split()
+    return norm, tokens[0] if tokens else norm
+
+
 def list_dataset_dirs(datasets_root: str) -> list[str]:
     """Return sorted list of directory names under datasets_root."""
-    root = Path(datasets_root)
-    if not root.is_dir():
+    # scandir's DirEntry.is_dir() uses the d_type from the directory read, so
+    # only symlinked entries need a stat (followed, so linked datasets count)
+    try:
+        with os.scandir(datasets_root) as it:
+            return sorted(entry.name for entry in it if entry.is_dir())
+    except (FileNotFoundError, NotADirectoryError):
         return []
-    return sorted(
-        entry.name
-        for entry in root.iterdir()
-        if entry.is_dir()
-    )
 
 
 def fuzzy_match_dataset(
@@ -40,9 +55,11 @@ def fuzzy_match_dataset(
 
     candidates: list[dict] = []
     seen: set[str] = set()
+    subj_tokens = norm_subj.split()
+    first_subj = subj_tokens[0] if subj_tokens else norm_subj
 
     for d in dataset_dirs:
-        norm_d = _normalize(d)
+        norm_d, first_d = _dir_keys(d)
 
         # Exact
         if norm_d == norm_subj:
@@ -62,15 +79,13 @@ def fuzzy_match_dataset(
                 seen.add(d)
             continue
 
-        # Fuzzy — SequenceMatcher on full name + first token
-        ratio_full = SequenceMatcher(None, norm_subj, norm_d).ratio()
+        # Fuzzy — normalized Indel similarity (rapidfuzz) on full name + first token
+        ratio_full = fuzz.ratio(norm_subj, norm_d) / 100.0
 
         # First-token comparison: only when both tokens ≥ 3 chars
-        first_subj = norm_subj.split()[0] if norm_subj.split() else norm_subj
-        first_d = norm_d.split()[0] if norm_d.split() else norm_d
         best = ratio_full
         if len(first_subj) >= 3 and len(first_d) >= 3:
-            ratio_first = SequenceMatcher(None, first_subj, first_d).ratio()
+            ratio_first = fuzz.ratio(first_subj, first_d, score_cutoff=80) / 100.0
             if ratio_first >= 0.8:
                 best = max(best, ratio_first)
 
@@ -82,8 +97,11 @@ def fuzzy_match_dataset(
     return candidates[:5]
 
 
+# Threads used to create dataset symlinks
+SYMLINK_WORKERS = 32
+
 # Audio file extensions for media_type classification
-_AUDIO_EXTS = {".wav", ".mp3", ".aac", ".flac", ".ogg", ".m4a", ".aiff", ".wma"}
+_AUDIO_EXTS = frozenset({".wav", ".mp3", ".aac", ".flac", ".ogg", ".m4a", ".aiff", ".wma"})
 
 
 def create_dataset_symlinks(
@@ -100,12 +118,11 @@ def create_dataset_symlinks(
 
     Returns {"created": int, "skipped": int, "errors": list[str]}.
     """
-    created = 0
-    skipped = 0
-    errors: list[str] = []
-
     base = Path(dataset_dir) / "media" / "external" / "from_client" / package_name
 
+    # Group by link path so assets that collide on a name are still handled
+    # in order (last one wins) by a single worker
+    by_target: dict[Path, list[Path]] = defaultdict(list)
     for asset in assets:
         src = Path(asset["original_path"])
         ext = src.suffix.lower()
@@ -113,25 +130,55 @@ def create_dataset_symlinks(
         media_type = "audio" if (asset.get("file_type") == "audio" or ext in _AUDIO_EXTS) else "visuals"
         asset_type = asset.get("asset_type", "raw")
 
-        target = base / media_type / asset_type / src.name
-
+        by_target[base / media_type / asset_type / src.name].append(src)
+
+    def _link(target: Path, srcs: list[Path]) -> tuple[int, int, list[str]]:
+        created = skipped = 0
+        errors: list[str] = []
+        for src in srcs:
+            try:
+                if target.parent in failed_parents:
+                    raise failed_parents[target.parent]
+
+                if target.is_symlink():
+                    # readlink is one syscall; only fall back to resolving both
+                    # sides (a realpath walk each) when the strings differ
+                    current = os.readlink(target)
+                    if current == str(src) or target.resolve() == src.resolve():
+                        skipped += 1
+                        continue
+                    # Different target — remove stale link
+                    target.unlink()
+
+                os.symlink(str(src), str(target))
+                created += 1
+
+            except Exception as e:
+                msg = f"{src.name}: {e}"
+                errors.append(msg)
+                logger.warning("Symlink error for %s: %s", src.name, e)
+        return created, skipped, errors
+
+    # Only a few distinct parent dirs (media_type/asset_type) for any number
+    # of links, so create each once here instead of once per asset
+    failed_parents: dict[Path, OSError] = {}
+    for parent in {target.parent for target in by_target}:
         try:
-            target.parent.mkdir(parents=True, exist_ok=True)
-
-            if target.is_symlink():
-                if target.resolve() == src.resolve():
-                    skipped += 1
-                    continue
-                # Different target — remove stale link
-                target.unlink()
-
-            os.symlink(str(src), str(target))
-            created += 1
-
-        except Exception as e:
-            msg = f"{src.name}: {e}"
-            errors.append(msg)
-            logger.warning("Symlink error for %s: %s", src.name, e)
+            parent.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            failed_parents[parent] = e
+
+    created = 0
+    skipped = 0
+    errors: list[str] = []
+
+    # Each link is a handful of blocking syscalls (slow on network mounts);
+    # overlap them in threads
+    with ThreadPoolExecutor(max_workers=SYMLINK_WORKERS) as executor:
+        for n_created, n_skipped, link_errors in executor.map(_link, by_target.keys(), by_target.values()):
+            created += n_created
+            skipped += n_skipped
+            errors.extend(link_errors)
 
     logger.info(
         "Dataset symlinks for %s/%s: created=%d skipped=%d errors=%d",
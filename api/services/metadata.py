@@ -7,13 +7,22 @@ Reads embedded metadata from aligned face PNGs. Supports two formats:
 Adapted from backend/app/services/metadata.py.
 """
 
+import codecs
 import json
+import mmap
+import os
 import pickle
 import struct
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Union
 
 
+_METADATA_CHUNKS = frozenset({b"fcWp", b"tEXt"})
+_CHUNK_HEADER = struct.Struct(">I4s")  # big-endian length, 4-byte type
+
+
 def read_face_metadata(png_path: Union[Path, str]) -> dict:
     """Read face metadata from a PNG file.
 
@@ -22,37 +31,56 @@ def read_face_metadata(png_path: Union[Path, str]) -> dict:
     """
     png_path = Path(png_path)
     try:
-        with open(png_path, "rb") as f:
-            sig = f.read(8)
-            if sig != b"\x89PNG\r\n\x1a\n":
+        with open(png_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mm[:8] != b"\x89PNG\r\n\x1a\n":
                 return {}
 
-            while True:
-                length_bytes = f.read(4)
-                if len(length_bytes) < 4:
-                    break
-                length = struct.unpack(">I", length_bytes)[0]
-                chunk_type = f.read(4)
-                chunk_data = f.read(length)
-                _crc = f.read(4)  # skip CRC
+            # Walk chunk headers by offset over the mapping: no read() per
+            # chunk, and pages of skipped chunks (e.g. IDAT) are never touched
+            size = len(mm)
+            off = 8
+            while off + 8 <= size:
+                length, chunk_type = _CHUNK_HEADER.unpack_from(mm, off)
+                start = off + 8
+                off = start + length + 4  # body + CRC
 
                 if chunk_type == b"IEND":
                     break
 
+                # Don't stop at IDAT: DFL writes fcWp after the image data,
+                # right before IEND.
+                if chunk_type not in _METADATA_CHUNKS:
+                    continue
+
+                chunk_data = mm[start:start + length]
+
                 if chunk_type == b"fcWp":
                     return _parse_fcwp(chunk_data)
 
-                if chunk_type == b"tEXt":
-                    result = _parse_dfl_text(chunk_data)
-                    if result:
-                        return result
+                result = _parse_dfl_text(chunk_data)
+                if result:
+                    return result
 
-    except (FileNotFoundError, IOError):
+    except (FileNotFoundError, IOError, ValueError):  # ValueError: mmap of an empty file
         return {}
 
     return {}
 
 
+def read_face_metadata_batch(paths: list, workers: int | None = None) -> list[dict]:
+    """Read face metadata for many PNGs concurrently, in input order.
+
+    Each read is mostly file I/O, so a thread pool overlaps the opens and
+    page faults across files.
+    """
+    if not paths:
+        return []
+    if workers is None:
+        workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=min(workers, len(paths))) as ex:
+        return list(ex.map(read_face_metadata, paths))
+
+
 class _NumpyArrayStub:
     """Stub for numpy.ndarray when numpy is not installed."""
 
@@ -98,16 +126,57 @@ _NUMPY_STUBS = {
 }
 
 
+# Non-numpy globals an fcWp pickle may legitimately reference. Anything else
+# is refused: these chunks come from client-supplied files, and resolving
+# arbitrary globals (os.system, builtins.eval, ...) would let a crafted PNG
+# execute code during ingest.
+_SAFE_GLOBALS = {
+    ("builtins", "set"): set,
+    ("builtins", "frozenset"): frozenset,
+    ("builtins", "complex"): complex,
+    ("builtins", "bytearray"): bytearray,
+    ("collections", "OrderedDict"): OrderedDict,
+    # Protocol <3 pickles encode bytes (e.g. array buffers) as _codecs.encode(str, "latin1")
+    ("_codecs", "encode"): codecs.encode,
+}
+
+
+try:
+    import numpy  # noqa: F401
+    _HAVE_NUMPY = True
+except ImportError:
+    _HAVE_NUMPY = False
+
+# numpy globals used to rebuild arrays/scalars in a pickle. When numpy is
+# installed these load for real, so landmarks and numpy scalar fields decode
+# instead of collapsing to empty stubs.
+_NUMPY_REAL = {
+    ("numpy", "ndarray"), ("numpy", "dtype"),
+    ("numpy.core.multiarray", "_reconstruct"), ("numpy._core.multiarray", "_reconstruct"),
+    ("numpy.core.multiarray", "scalar"), ("numpy._core.multiarray", "scalar"),
+    ("numpy.core.numeric", "_frombuffer"), ("numpy._core.numeric", "_frombuffer"),
+}
+
+
 class _NumpySafeUnpickler(pickle.Unpickler):
-    """Unpickler that handles numpy types without requiring numpy installed."""
+    """Unpickler that handles numpy types with or without numpy installed.
+
+    Only the numpy array/scalar constructors (real or stubbed) and
+    ``_SAFE_GLOBALS`` can be loaded.
+    """
 
     def find_class(self, module: str, name: str):
+        if _HAVE_NUMPY and (module, name) in _NUMPY_REAL:
+            return super().find_class(module, name)
         stub = _NUMPY_STUBS.get((module, name))
         if stub is not None:
             return stub
-        if module.startswith("numpy"):
+        if module == "numpy" or module.startswith("numpy."):
             return _NumpyArrayStub
-        return super().find_class(module, name)
+        safe = _SAFE_GLOBALS.get((module, name))
+        if safe is not None:
+            return safe
+        raise pickle.UnpicklingError(f"global '{module}.{name}' is not allowed in fcWp metadata")
 
 
 def _parse_fcwp(data: bytes) -> dict:
@@ -121,7 +190,7 @@ def _parse_fcwp(data: bytes) -> dict:
     result: dict = {}
 
     pose = raw.get("pose")
-    if pose and len(pose) >= 3:
+    if pose is not None and len(pose) >= 3:
         result["pitch"] = float(pose[0])
         result["yaw"] = float(pose[1])
         result["roll"] = float(pose[2])
@@ -131,7 +200,7 @@ def _parse_fcwp(data: bytes) -> dict:
     result["face_type"] = raw.get("face_type")
 
     source_size = raw.get("source_size")
-    if source_size and len(source_size) >= 2:
+    if source_size is not None and len(source_size) >= 2:
         result["source_width"] = int(source_size[0])
         result["source_height"] = int(source_size[1])
 
@@ -1,5 +1,7 @@
 """Database operations for IngestHub CLI."""
 
+import io
+import json
 import os
 import uuid
 from contextlib import contextmanager
@@ -7,6 +9,7 @@ from typing import Optional
 
 import psycopg2
 import psycopg2.extras
+import psycopg2.pool
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -29,10 +32,27 @@ def get_connection_string() -> str:
     )
 
 
+_pool: Optional[psycopg2.pool.ThreadedConnectionPool] = None
+
+
+def _get_pool() -> psycopg2.pool.ThreadedConnectionPool:
+    """Create the shared connection pool on first use."""
+    global _pool
+    if _pool is None:
+        _pool = psycopg2.pool.ThreadedConnectionPool(1, 16, get_connection_string())
+    return _pool
+
+
 @contextmanager
 def get_db():
-    """Context manager for database connections."""
-    conn = psycopg2.connect(get_connection_string())
+    """Context manager for database connections.
+
+    Connections are borrowed from a process-wide pool, so repeated
+    ``with get_db()`` blocks reuse a warm connection instead of paying
+    for a new handshake each time.
+    """
+    pool = _get_pool()
+    conn = pool.getconn()
     conn.autocommit = False
     try:
         yield conn
@@ -41,32 +61,65 @@ def get_db():
         conn.rollback()
         raise
     finally:
-        conn.close()
+        # Drop connections that died mid-use rather than handing them out again
+        pool.putconn(conn, close=bool(conn.closed))
+
+
+@contextmanager
+def get_db_ro():
+    """Context manager for read-only work.
+
+    Same pool as get_db, but in autocommit mode: plain SELECTs don't need
+    a BEGIN/COMMIT pair around them.
+    """
+    pool = _get_pool()
+    conn = pool.getconn()
+    conn.autocommit = True
+    try:
+        yield conn
+    finally:
+        pool.putconn(conn, close=bool(conn.closed))
+
+
+def _cursor(conn, cur=None):
+    """Reuse the caller's cursor if given, else open one.
+
+    Helpers take an optional ``cur`` so a multi-step flow like ingest can
+    run every statement of its transaction through a single cursor.
+    """
+    return cur if cur is not None else conn.cursor()
 
 
 # ── Projects ────────────────────────────────────────────────
 
 
 def get_or_create_project(
-    conn, name: str, description: str = "", project_type: str = "atman"
+    conn, name: str, description: str = "", project_type: str = "atman", cur=None
 ) -> uuid.UUID:
     """Get existing project by name or create a new one. Returns project ID."""
-    cur = conn.cursor()
-
-    cur.execute("SELECT id FROM projects WHERE name = %s", (name,))
-    row = cur.fetchone()
-    if row:
-        return row[0]
-
-    project_id = uuid.uuid4()
+    cur = _cursor(conn, cur)
+    # Insert-or-fetch in one round-trip; ON CONFLICT makes it race-safe
     cur.execute(
         """
-        INSERT INTO projects (id, name, description, project_type)
-        VALUES (%s, %s, %s, %s)
+        WITH ins AS (
+            INSERT INTO projects (id, name, description, project_type)
+            VALUES (%s, %s, %s, %s)
+            ON CONFLICT (name) DO NOTHING
+            RETURNING id
+        )
+        SELECT id FROM ins
+        UNION ALL
+        SELECT id FROM projects WHERE name = %s
+        LIMIT 1
         """,
-        (project_id, name, description, project_type),
+        (uuid.uuid4(), name, description, project_type, name),
     )
-    return project_id
+    row = cur.fetchone()
+    if row is None:
+        # A concurrent insert committed after this statement's snapshot
+        cur.execute("SELECT id FROM projects WHERE name = %s", (name,))
+        row = cur.fetchone()
+    return row[0]
 
 
 def list_projects(conn) -> list[dict]:
@@ -80,33 +133,40 @@ def list_projects(conn) -> list[dict]:
 
 
 def get_or_create_subject(
-    conn, project_id: uuid.UUID, name: str, description: str = ""
+    conn, project_id: uuid.UUID, name: str, description: str = "", cur=None
 ) -> uuid.UUID:
     """Get existing subject or create a new one. Returns subject ID."""
-    cur = conn.cursor()
-
-    cur.execute(
-        "SELECT id FROM subjects WHERE project_id = %s AND name = %s",
-        (project_id, name),
-    )
-    row = cur.fetchone()
-    if row:
-        return row[0]
-
-    subject_id = uuid.uuid4()
+    cur = _cursor(conn, cur)
+    # Insert-or-fetch in one round-trip; ON CONFLICT makes it race-safe
     cur.execute(
         """
-        INSERT INTO subjects (id, project_id, name, description)
-        VALUES (%s, %s, %s, %s)
+        WITH ins AS (
+            INSERT INTO subjects (id, project_id, name, description)
+            VALUES (%s, %s, %s, %s)
+            ON CONFLICT (project_id, name) DO NOTHING
+            RETURNING id
+        )
+        SELECT id FROM ins
+        UNION ALL
+        SELECT id FROM subjects WHERE project_id = %s AND name = %s
+        LIMIT 1
         """,
-        (subject_id, project_id, name, description),
+        (uuid.uuid4(), project_id, name, description, project_id, name),
     )
-    return subject_id
+    row = cur.fetchone()
+    if row is None:
+        # A concurrent insert committed after this statement's snapshot
+        cur.execute(
+            "SELECT id FROM subjects WHERE project_id = %s AND name = %s",
+            (project_id, name),
+        )
+        row = cur.fetchone()
+    return row[0]
 
 
-def update_subject_thumbnail(conn, subject_id: uuid.UUID, thumbnail_url: str):
+def update_subject_thumbnail(conn, subject_id: uuid.UUID, thumbnail_url: str, cur=None):
     """Set or update a subject's thumbnail."""
-    cur = conn.cursor()
+    cur = _cursor(conn, cur)
     cur.execute(
         "UPDATE subjects SET thumbnail_url = %s WHERE id = %s",
         (thumbnail_url, subject_id),
@@ -124,27 +184,28 @@ def create_package(
     source_description: str = "",
     tags: Optional[list] = None,
     metadata: Optional[dict] = None,
+    cur=None,
 ) -> uuid.UUID:
-    """Create a new ingest package. Returns package ID."""
-    cur = conn.cursor()
+    """Create a new ingest package. Returns package ID.
 
-    # Check for existing package with same name under this subject
-    cur.execute(
-        "SELECT id FROM packages WHERE subject_id = %s AND name = %s",
-        (subject_id, name),
-    )
-    row = cur.fetchone()
-    if row:
-        raise ValueError(
-            f"Package '{name}' already exists for this subject (id={row[0]}). "
-            "Use --force to re-ingest or choose a different package name."
-        )
+    Raises ValueError if the subject already has a package with this name.
+    """
+    cur = _cursor(conn, cur)
 
+    # Insert, or report the existing package, in a single round-trip
     package_id = uuid.uuid4()
     cur.execute(
         """
-        INSERT INTO packages (id, subject_id, name, disk_path, source_description, tags, metadata)
-        VALUES (%s, %s, %s, %s, %s, %s, %s)
+        WITH ins AS (
+            INSERT INTO packages (id, subject_id, name, disk_path, source_description, tags, metadata)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+            ON CONFLICT (subject_id, name) DO NOTHING
+            RETURNING id
+        )
+        SELECT id, true FROM ins
+        UNION ALL
+        SELECT id, false FROM packages WHERE subject_id = %s AND name = %s
+        LIMIT 1
         """,
         (
             package_id,
@@ -154,16 +215,37 @@ def create_package(
             source_description,
             tags or [],
             psycopg2.extras.Json(metadata or {}),
+            subject_id,
+            name,
         ),
     )
+    row = cur.fetchone()
+    if row is None:
+        # A concurrent insert committed after this statement's snapshot
+        cur.execute(
+            "SELECT id, false FROM packages WHERE subject_id = %s AND name = %s",
+            (subject_id, name),
+        )
+        row = cur.fetchone()
+    existing_id, inserted = row
+    if not inserted:
+        raise ValueError(
+            f"Package '{name}' already exists for this subject (id={existing_id}). "
+            "Use --force to re-ingest or choose a different package name."
+        )
     return package_id
 
 
 def update_package_stats(
-    conn, package_id: uuid.UUID, file_count: int, total_size: int, status: str = "ready"
+    conn,
+    package_id: uuid.UUID,
+    file_count: int,
+    total_size: int,
+    status: str = "ready",
+    cur=None,
 ):
     """Update package after all assets are ingested."""
-    cur = conn.cursor()
+    cur = _cursor(conn, cur)
     cur.execute(
         """
         UPDATE packages SET file_count = %s, total_size_bytes = %s, status = %s
@@ -173,59 +255,76 @@ def update_package_stats(
     )
 
 
-def delete_package(conn, package_id: uuid.UUID):
+def delete_package(conn, package_id: uuid.UUID, cur=None):
     """Delete a package and all its assets (cascading)."""
-    cur = conn.cursor()
+    cur = _cursor(conn, cur)
     cur.execute("DELETE FROM packages WHERE id = %s", (package_id,))
 
 
 # ── Assets ──────────────────────────────────────────────────
 
 
-def insert_asset(conn, asset: dict) -> uuid.UUID:
-    """Insert a single asset record. Returns asset ID."""
-    cur = conn.cursor()
-    asset_id = uuid.uuid4()
-    cur.execute(
-        """
-        INSERT INTO assets (
-            id, package_id, filename, file_type, mime_type,
-            file_size_bytes, disk_path, proxy_path, thumbnail_path,
-            width, height, duration_seconds, codec, camera,
-            tags, metadata
-        ) VALUES (
-            %s, %s, %s, %s, %s,
-            %s, %s, %s, %s,
-            %s, %s, %s, %s, %s,
-            %s, %s
-        )
-        """,
-        (
-            asset_id,
-            asset["package_id"],
-            asset["filename"],
-            asset["file_type"],
-            asset.get("mime_type"),
-            asset.get("file_size_bytes"),
-            asset["disk_path"],
-            asset.get("proxy_path"),
-            asset.get("thumbnail_path"),
-            asset.get("width"),
-            asset.get("height"),
-            asset.get("duration_seconds"),
-            asset.get("codec"),
-            asset.get("camera"),
-            asset.get("tags", []),
-            psycopg2.extras.Json(asset.get("metadata", {})),
-        ),
+_ASSET_COLUMNS = (
+    "id, package_id, filename, file_type, mime_type, "
+    "file_size_bytes, disk_path, proxy_path, thumbnail_path, "
+    "width, height, duration_seconds, codec, camera, "
+    "tags, metadata"
+)
+
+
+def _asset_row(asset_id: uuid.UUID, asset: dict) -> tuple:
+    """Column values for one asset, in _ASSET_COLUMNS order."""
+    return (
+        asset_id,
+        asset["package_id"],
+        asset["filename"],
+        asset["file_type"],
+        asset.get("mime_type"),
+        asset.get("file_size_bytes"),
+        asset["disk_path"],
+        asset.get("proxy_path"),
+        asset.get("thumbnail_path"),
+        asset.get("width"),
+        asset.get("height"),
+        asset.get("duration_seconds"),
+        asset.get("codec"),
+        asset.get("camera"),
+        asset.get("tags", []),
+        psycopg2.extras.Json(asset.get("metadata", {})),
     )
-    return asset_id
 
 
-def bulk_insert_assets(conn, assets: list[dict]) -> int:
-    """Insert multiple assets efficiently. Returns count inserted."""
-    count = 0
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _pg_array(items: list) -> str:
+    """Render a list as a Postgres array literal, e.g. {"a","b"}."""
+    quoted = (
+        '"' + str(v).replace("\\", "\\\\").replace('"', '\\"') + '"' for v in items
+    )
+    return "{" + ",".join(quoted) + "}"
+
+
+def _copy_field(value) -> str:
+    """Encode one value for COPY ... FROM STDIN (text format)."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, psycopg2.extras.Json):
+        value = json.dumps(value.adapted)
+    elif isinstance(value, list):
+        value = _pg_array(value)
+    return str(value).translate(_COPY_ESCAPES)
+
+
+def copy_assets(conn, assets: list[dict], cur=None) -> int:
+    """Stream assets into the table with COPY. Returns count inserted."""
+    if not assets:
+        return 0
+    cur = _cursor(conn, cur)
+    buf = io.StringIO()
     for asset in assets:
-        insert_asset(conn, asset)
-        count += 1
-    return count
+        buf.write("\t".join(map(_copy_field, _asset_row(uuid.uuid4(), asset))))
+        buf.write("\n")
+    buf.seek(0)
+    cur.copy_expert(f"COPY assets ({_ASSET_COLUMNS}) FROM STDIN", buf)
+    return len(assets)
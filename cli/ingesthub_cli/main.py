@@ -8,12 +8,17 @@ Usage:
     data_ingest status
 """
 
+import asyncio
 import os
+import queue
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Optional
 
 import click
+from psycopg2.extras import RealDictCursor
 from rich.console import Console
 from rich.panel import Panel
 from rich.progress import (
@@ -27,6 +32,7 @@ from rich.progress import (
 from rich.table import Table
 
 from . import db, media
+from ._scan import scan_and_classify
 
 console = Console()
 
@@ -34,6 +40,9 @@ console = Console()
 
 DEFAULT_PROXY_DIR = os.environ.get("INGESTHUB_PROXY_DIR", "")
 
+# Concurrent hardware encodes; consumer NVIDIA GPUs cap NVENC sessions
+NVENC_SLOTS = int(os.environ.get("INGESTHUB_NVENC_SLOTS", "2"))
+
 
 def _resolve_proxy_dir(source_path: Path, proxy_dir: Optional[str]) -> Path:
     """Determine where to store proxies/thumbnails."""
@@ -72,6 +81,7 @@ def cli():
 @click.option("--recursive/--no-recursive", default=True, help="Recurse into subdirectories (default: yes)")
 @click.option("--force", is_flag=True, help="Re-ingest even if package already exists (deletes existing)")
 @click.option("--dry-run", is_flag=True, help="Scan files and show what would be ingested without writing to DB")
+@click.option("--clear-probe-cache", is_flag=True, help="Forget cached ffprobe/image probe results and re-probe every file")
 def ingest(
     source_path: str,
     project: str,
@@ -86,6 +96,7 @@ def ingest(
     recursive: bool,
     force: bool,
     dry_run: bool,
+    clear_probe_cache: bool,
 ):
     """Ingest a directory of media files into IngestHub.
 
@@ -114,30 +125,17 @@ def ingest(
     # ── Scan files ──────────────────────────────────────────
     console.print("\n[bold]Scanning files...[/]")
 
-    if recursive:
-        all_files = sorted(f for f in source.rglob("*") if f.is_file())
-    else:
-        all_files = sorted(f for f in source.iterdir() if f.is_file())
-
-    # Skip hidden files and proxy directories
-    all_files = [
-        f for f in all_files
-        if not any(part.startswith(".") for part in f.relative_to(source).parts)
-    ]
-
-    # Classify
-    classified = []
-    for f in all_files:
-        ftype = media.classify_file(f)
-        if ftype != "other":
-            classified.append((f, ftype))
+    # The walk skips hidden files and proxy directories and classifies as it
+    # goes; only media files are stat'ed or turned into Path objects
+    found = scan_and_classify(str(source), recursive, media.EXT_FILE_TYPE)
+    classified = [(Path(p), ftype, size) for p, ftype, size in found]
 
     if not classified:
         console.print("[red]No media files (video/image) found in source path.[/]")
         sys.exit(1)
 
-    video_count = sum(1 for _, t in classified if t == "video")
-    image_count = sum(1 for _, t in classified if t == "image")
+    video_count = sum(1 for _, t, _ in classified if t == "video")
+    image_count = sum(1 for _, t, _ in classified if t == "image")
     console.print(
         f"  Found [green]{len(classified)}[/] media files "
         f"([blue]{video_count}[/] video, [blue]{image_count}[/] image)"
@@ -151,9 +149,11 @@ def ingest(
     console.print("\n[bold]Connecting to database...[/]")
 
     with db.get_db() as conn:
+        cur = conn.cursor()
+
         # Create/get project & subject
-        project_id = db.get_or_create_project(conn, project, project_type=project_type)
-        subject_id = db.get_or_create_subject(conn, project_id, subject)
+        project_id = db.get_or_create_project(conn, project, project_type=project_type, cur=cur)
+        subject_id = db.get_or_create_subject(conn, project_id, subject, cur=cur)
 
         console.print(f"  Project: {project} [dim]({project_id})[/]")
         console.print(f"  Subject: {subject} [dim]({subject_id})[/]")
@@ -162,24 +162,23 @@ def ingest(
         if force:
             try:
                 pkg_id = db.create_package(
-                    conn, subject_id, package, str(source), description, list(tags)
+                    conn, subject_id, package, str(source), description, list(tags), cur=cur
                 )
             except ValueError:
                 console.print(f"  [yellow]⚠ Package '{package}' exists, --force: deleting and re-creating[/]")
-                cur = conn.cursor()
                 cur.execute(
                     "SELECT id FROM packages WHERE subject_id = %s AND name = %s",
                     (subject_id, package),
                 )
                 old_id = cur.fetchone()[0]
-                db.delete_package(conn, old_id)
+                db.delete_package(conn, old_id, cur=cur)
                 pkg_id = db.create_package(
-                    conn, subject_id, package, str(source), description, list(tags)
+                    conn, subject_id, package, str(source), description, list(tags), cur=cur
                 )
         else:
             try:
                 pkg_id = db.create_package(
-                    conn, subject_id, package, str(source), description, list(tags)
+                    conn, subject_id, package, str(source), description, list(tags), cur=cur
                 )
             except ValueError as e:
                 console.print(f"[red]✗ {e}[/]")
@@ -191,8 +190,13 @@ def ingest(
         console.print("\n[bold]Processing assets...[/]")
 
         total_size = 0
-        assets = []
-        first_thumb = None
+        thumbs: list = [None] * len(classified)
+
+        # Finished assets stream to a writer thread that COPYs them in
+        # batches, so DB writes overlap ffprobe/ffmpeg and memory stays
+        # bounded by the batch size rather than the package size.
+        writer = _AssetWriter(conn)
+        writer.start()
 
         with Progress(
             SpinnerColumn(),
@@ -201,85 +205,67 @@ def ingest(
             MofNCompleteColumn(),
             TimeRemainingColumn(),
             console=console,
+            refresh_per_second=10,
         ) as progress:
             task = progress.add_task("Processing", total=len(classified))
 
-            for filepath, file_type in classified:
-                progress.update(task, description=f"[cyan]{filepath.name}[/]")
-                rel_path = filepath.relative_to(source)
-                file_size = filepath.stat().st_size
-                total_size += file_size
-
-                # ── Probe metadata ──────────────────────────
-                if file_type == "video":
-                    probe = media.probe_video(filepath)
-                else:
-                    probe = media.probe_image(filepath)
-
-                # ── Generate proxy & thumbnail ──────────────
-                proxy_path = None
-                thumb_path = None
-
-                if not skip_proxies:
-                    asset_proxy_dir = proxy_base / str(rel_path.parent)
-
-                    if file_type == "video":
-                        # Only generate proxy for non-web codecs, or always
-                        # for consistency (web codecs are fast to transcode)
-                        if probe.get("needs_proxy", True):
-                            proxy_path = media.generate_video_proxy(
-                                filepath, asset_proxy_dir, max_height=proxy_height
-                            )
-                        else:
-                            # Web-playable: use original as proxy
-                            proxy_path = filepath
-
-                        thumb_path = media.generate_video_thumbnail(
-                            filepath, asset_proxy_dir
-                        )
-                    else:
-                        proxy_path = media.generate_image_proxy(
-                            filepath, asset_proxy_dir
-                        )
-                        thumb_path = media.generate_image_thumbnail(
-                            filepath, asset_proxy_dir
-                        )
-
-                    # Track first thumbnail for subject thumbnail
-                    if thumb_path and not first_thumb:
-                        first_thumb = thumb_path
-
-                # ── Build asset record ──────────────────────
-                asset = {
-                    "package_id": pkg_id,
-                    "filename": str(rel_path),
-                    "file_type": file_type,
-                    "mime_type": media.get_mime_type(filepath),
-                    "file_size_bytes": file_size,
-                    "disk_path": str(filepath),
-                    "proxy_path": str(proxy_path) if proxy_path else None,
-                    "thumbnail_path": str(thumb_path) if thumb_path else None,
-                    "width": probe.get("width"),
-                    "height": probe.get("height"),
-                    "duration_seconds": probe.get("duration_seconds"),
-                    "codec": probe.get("codec"),
-                    "camera": probe.get("camera"),
-                    "tags": [],
-                    "metadata": probe.get("metadata", {}),
-                }
-                assets.append(asset)
-                progress.advance(task)
-
-        # ── Write to DB ─────────────────────────────────────
-        console.print(f"\n[bold]Writing {len(assets)} assets to database...[/]")
-        count = db.bulk_insert_assets(conn, assets)
+            # Videos and images get separate pools so long encodes don't starve
+            # the image work. ffprobe/ffmpeg run out of process, so threads are
+            # enough. With a hardware encoder the video pool is sized to its
+            # sessions; without one each libx264 already spreads over cores.
+            cpus = os.cpu_count() or 1
+            encoder = "libx264"
+            if not skip_proxies and any(t == "video" for _, t, _ in classified):
+                encoder = media.select_h264_encoder()
+            video_workers = NVENC_SLOTS if encoder != "libx264" else max(1, cpus // 4)
+
+            # Unchanged files (e.g. on a --force re-ingest) reuse earlier probes
+            probe_cache = media.open_probe_cache()
+            if probe_cache is not None and clear_probe_cache:
+                probe_cache.clear()
+
+            try:
+                # Probe all videos up front, many ffprobe processes at once:
+                # each is short and mostly startup cost, and it shouldn't queue
+                # behind long encodes in the (narrow) video pool.
+                videos = [f for f, t, _ in classified if t == "video"]
+                probes = {}
+                if videos:
+                    progress.update(task, description=f"[cyan]Probing {len(videos)} videos[/]")
+                    probes = dict(zip(videos, asyncio.run(media.probe_many(videos, "video", cache=probe_cache))))
+
+                with ThreadPoolExecutor(max_workers=max(1, video_workers)) as video_pool, \
+                        ThreadPoolExecutor(max_workers=cpus) as image_pool:
+                    futures = {
+                        (video_pool if file_type == "video" else image_pool).submit(
+                            _process_asset, filepath, file_type, file_size, source,
+                            proxy_base, proxy_height, skip_proxies, pkg_id, encoder,
+                            probes.get(filepath), probe_cache,
+                        ): i
+                        for i, (filepath, file_type, file_size) in enumerate(classified)
+                    }
+                    for fut in as_completed(futures):
+                        i = futures[fut]
+                        asset, thumbs[i] = fut.result()
+                        total_size += asset["file_size_bytes"]
+                        writer.put(asset)
+                        # One update per file; Rich redraws on its own ~10 Hz timer
+                        progress.update(task, advance=1, description=f"[cyan]{classified[i][0].name}[/]")
+            finally:
+                if probe_cache is not None:
+                    probe_cache.close()
+                # ── Write to DB ─────────────────────────────
+                count = writer.close()
+
+        # First thumbnail in scan order becomes the subject thumbnail
+        first_thumb = next((thumb for thumb in thumbs if thumb), None)
 
         # Update package stats
-        db.update_package_stats(conn, pkg_id, count, total_size, status="ready")
+        db.update_package_stats(conn, pkg_id, count, total_size, status="ready", cur=cur)
 
         # Set subject thumbnail if none exists
         if first_thumb:
-            db.update_subject_thumbnail(conn, subject_id, str(first_thumb))
+            db.update_subject_thumbnail(conn, subject_id, str(first_thumb), cur=cur)
 
         conn.commit()
 
@@ -307,7 +293,7 @@ def list_cmd():
 @list_cmd.command("projects")
 def list_projects():
     """List all projects."""
-    with db.get_db() as conn:
+    with db.get_db_ro() as conn:
         projects = db.list_projects(conn)
 
     if not projects:
@@ -341,21 +327,24 @@ def list_projects():
 @click.option("--project", "-p", required=True, help="Project name")
 def list_subjects(project: str):
     """List subjects in a project."""
-    with db.get_db() as conn:
-        cur = conn.cursor()
-        cur.execute("SELECT id FROM projects WHERE name = %s", (project,))
-        row = cur.fetchone()
-        if not row:
-            console.print(f"[red]Project '{project}' not found.[/]")
-            sys.exit(1)
-        project_id = row[0]
-
-        cur = conn.cursor(cursor_factory=__import__("psycopg2").extras.RealDictCursor)
+    with db.get_db_ro() as conn:
+        cur = conn.cursor(cursor_factory=RealDictCursor)
+        # One round-trip: the LEFT JOIN yields no rows for an unknown project
+        # and a single all-NULL subject row for a project without subjects
         cur.execute(
-            "SELECT * FROM v_subject_summary WHERE project_id = %s ORDER BY name",
-            (project_id,),
+            """
+            SELECT s.* FROM projects p
+            LEFT JOIN v_subject_summary s ON s.project_id = p.id
+            WHERE p.name = %s
+            ORDER BY s.name
+            """,
+            (project,),
         )
-        subjects = cur.fetchall()
+        rows = cur.fetchall()
+        if not rows:
+            console.print(f"[red]Project '{project}' not found.[/]")
+            sys.exit(1)
+        subjects = [r for r in rows if r["id"] is not None]
 
     if not subjects:
         console.print(f"[dim]No subjects in project '{project}'.[/]")
@@ -383,8 +372,8 @@ def list_subjects(project: str):
 @click.option("--subject", "-s", required=True, help="Subject name")
 def list_packages(project: str, subject: str):
     """List packages for a subject."""
-    with db.get_db() as conn:
-        cur = conn.cursor()
+    with db.get_db_ro() as conn:
+        cur = conn.cursor(cursor_factory=RealDictCursor)
         cur.execute(
             """
             SELECT pkg.* FROM packages pkg
@@ -395,8 +384,7 @@ def list_packages(project: str, subject: str):
             """,
             (project, subject),
         )
-        columns = [desc[0] for desc in cur.description]
-        packages = [dict(zip(columns, row)) for row in cur.fetchall()]
+        packages = cur.fetchall()
 
     if not packages:
         console.print(f"[dim]No packages found for {project}/{subject}.[/]")
@@ -439,20 +427,19 @@ def status():
     console.print("[bold]Checking database connection...[/]")
 
     try:
-        with db.get_db() as conn:
+        with db.get_db_ro() as conn:
             cur = conn.cursor()
-
-            cur.execute("SELECT count(*) FROM projects")
-            project_count = cur.fetchone()[0]
-
-            cur.execute("SELECT count(*) FROM subjects")
-            subject_count = cur.fetchone()[0]
-
-            cur.execute("SELECT count(*) FROM packages")
-            package_count = cur.fetchone()[0]
-
-            cur.execute("SELECT count(*), COALESCE(SUM(file_size_bytes), 0) FROM assets")
-            asset_count, total_bytes = cur.fetchone()
+            # All counts in one round-trip
+            cur.execute(
+                """
+                SELECT (SELECT count(*) FROM projects),
+                       (SELECT count(*) FROM subjects),
+                       (SELECT count(*) FROM packages),
+                       count(*), COALESCE(SUM(file_size_bytes), 0)
+                FROM assets
+                """
+            )
+            project_count, subject_count, package_count, asset_count, total_bytes = cur.fetchone()
 
         console.print(Panel.fit(
             f"[bold green]✓ Connected to database[/]\n\n"
@@ -473,15 +460,150 @@ def status():
 # ── Helpers ─────────────────────────────────────────────────
 
 
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+
+
 def _fmt_size(size_bytes: int) -> str:
     """Format bytes into human-readable size."""
     if not size_bytes:
         return "0 B"
-    for unit in ("B", "KB", "MB", "GB", "TB"):
-        if abs(size_bytes) < 1024.0:
-            return f"{size_bytes:.1f} {unit}"
-        size_bytes /= 1024.0
-    return f"{size_bytes:.1f} PB"
+    # int() also accepts the Decimal that SUM() over bigint comes back as
+    n = int(size_bytes)
+    # floor(log1024(|n|)) straight from the bit length, capped at PB
+    unit = min((abs(n).bit_length() - 1) // 10, 5) if n else 0
+    return f"{n / (1 << (10 * unit)):.1f} {_SIZE_UNITS[unit]}"
+
+
+def _process_asset(
+    filepath: Path,
+    file_type: str,
+    file_size: int,
+    source: Path,
+    proxy_base: Path,
+    proxy_height: int,
+    skip_proxies: bool,
+    pkg_id,
+    encoder: str = "libx264",
+    probe: Optional[dict] = None,
+    probe_cache: Optional[media.ProbeCache] = None,
+) -> tuple[dict, Optional[Path]]:
+    """Probe one file and build its proxy/thumbnail. Runs in a worker thread.
+
+    ``probe`` is a result already fetched by the caller; if None the file
+    is probed here. Returns the asset record and the thumbnail path (None
+    if none was made).
+    """
+    rel_path = filepath.relative_to(source)
+
+    # ── Probe metadata ──────────────────────────
+    if probe is None:
+        if file_type == "video":
+            probe = media.probe_video(filepath, probe_cache)
+        else:
+            probe = media.probe_image(filepath, probe_cache)
+
+    # ── Generate proxy & thumbnail ──────────────
+    proxy_path = None
+    thumb_path = None
+
+    if not skip_proxies:
+        asset_proxy_dir = proxy_base / str(rel_path.parent)
+
+        if file_type == "video":
+            # proxy_strategy picks the cheapest playable proxy: "link" uses
+            # a web-ready source as-is, "remux" copies H.264 streams into an
+            # MP4, and "encode" transcodes (with the thumbnail in one pass)
+            strategy = media.proxy_strategy(filepath, probe)
+            if strategy == "encode":
+                proxy_path, thumb_path = media.generate_video_proxy_and_thumbnail(
+                    filepath, asset_proxy_dir, max_height=proxy_height, encoder=encoder
+                )
+            else:
+                proxy_path = media.generate_video_proxy(
+                    filepath, asset_proxy_dir, strategy=strategy,
+                    audio_codec=probe.get("metadata", {}).get("audio_codec"),
+                )
+                thumb_path = media.generate_video_thumbnail(filepath, asset_proxy_dir)
+        else:
+            proxy_path, thumb_path = media.generate_image_artifacts(filepath, asset_proxy_dir)
+
+    # ── Build asset record ──────────────────────
+    asset = {
+        "package_id": pkg_id,
+        "filename": str(rel_path),
+        "file_type": file_type,
+        "mime_type": media.get_mime_type(filepath),
+        "file_size_bytes": file_size,
+        "disk_path": str(filepath),
+        "proxy_path": str(proxy_path) if proxy_path else None,
+        "thumbnail_path": str(thumb_path) if thumb_path else None,
+        "width": probe.get("width"),
+        "height": probe.get("height"),
+        "duration_seconds": probe.get("duration_seconds"),
+        "codec": probe.get("codec"),
+        "camera": probe.get("camera"),
+        "tags": [],
+        "metadata": probe.get("metadata", {}),
+    }
+    return asset, thumb_path
+
+
+class _AssetWriter(threading.Thread):
+    """Background thread that COPYs queued asset records in batches.
+
+    The connection is only used from this thread while it runs; close()
+    flushes the tail, joins, and re-raises any error from the writes. The
+    queue holds at most two batches, so put() blocks (rather than buffering
+    the whole package) when the DB falls behind.
+    """
+
+    BATCH_SIZE = 1000
+
+    def __init__(self, conn):
+        super().__init__(name="asset-writer", daemon=True)
+        self.conn = conn
+        self.count = 0
+        self.error: Optional[BaseException] = None
+        self._queue: queue.Queue = queue.Queue(maxsize=2 * self.BATCH_SIZE)
+
+    def put(self, asset: dict) -> None:
+        self._queue.put(asset)
+
+    def run(self) -> None:
+        # Producers block on a full queue, so this loop must keep draining
+        # until the sentinel whatever goes wrong
+        try:
+            cur = self.conn.cursor()
+        except Exception as e:
+            self.error = e
+        batch = []
+        while True:
+            asset = self._queue.get()
+            if asset is not None:
+                batch.append(asset)
+            if batch and (asset is None or len(batch) >= self.BATCH_SIZE):
+                # After a failure keep draining so producers never block
+                if self.error is None:
+                    try:
+                        self.count += db.copy_assets(self.conn, batch, cur=cur)
+                    except Exception as e:
+                        self.error = e
+                batch = []
+            if asset is None:
+                return
+
+    def close(self) -> int:
+        """Flush remaining assets and wait for the writer. Returns count written."""
+        self._queue.put(None)
+        self.join()
+        if self.error is not None:
+            raise self.error
+        return self.count
+
+
+# Past this many files the dry-run table shows only a head and tail sample
+DRY_RUN_MAX_ROWS = 500
+DRY_RUN_SAMPLE = 20
 
 
 def _print_dry_run(classified: list, source: Path):
@@ -493,13 +615,20 @@ def _print_dry_run(classified: list, source: Path):
     table.add_column("Type", style="magenta")
     table.add_column("Size", justify="right")
 
-    total_size = 0
-    for filepath, file_type in classified:
-        size = filepath.stat().st_size
-        total_size += size
-        rel = filepath.relative_to(source)
-        table.add_row(str(rel), file_type, _fmt_size(size))
+    def add_rows(rows):
+        for filepath, file_type, size in rows:
+            table.add_row(str(filepath.relative_to(source)), file_type, _fmt_size(size))
+
+    # Rendering a huge Rich table takes seconds; sample it instead
+    if len(classified) > DRY_RUN_MAX_ROWS:
+        add_rows(classified[:DRY_RUN_SAMPLE])
+        hidden = len(classified) - 2 * DRY_RUN_SAMPLE
+        table.add_row(f"[dim]… {hidden} more …[/]", "", "")
+        add_rows(classified[-DRY_RUN_SAMPLE:])
+    else:
+        add_rows(classified)
 
+    total_size = sum(size for _, _, size in classified)
     console.print(table)
     console.print(f"\n  Total: [green]{len(classified)}[/] files, [green]{_fmt_size(total_size)}[/]")
 
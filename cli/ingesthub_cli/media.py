@@ -1,9 +1,15 @@
 """Media probing (ffprobe) and proxy/thumbnail generation (ffmpeg)."""
 
+import asyncio
 import json
 import logging
 import mimetypes
+import os
+import sqlite3
 import subprocess
+import sys
+import threading
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -12,40 +18,153 @@ from rich.console import Console
 console = Console()
 logger = logging.getLogger(__name__)
 
-VIDEO_EXTENSIONS = {
+# Optional: libvips thumbnails decode with shrink-on-load and run without
+# the GIL. OSError covers the binding being installed without libvips.
+try:
+    import pyvips
+except (ImportError, OSError):
+    pyvips = None
+
+# Optional: PyAV reads MP4/MOV/MKV headers through libavformat in-process,
+# skipping the ffprobe process start for the common containers.
+try:
+    import av
+except ImportError:
+    av = None
+
+# Optional: orjson parses ffprobe's bytes output directly, several times
+# faster than stdlib json. Its JSONDecodeError subclasses json's.
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+VIDEO_EXTENSIONS = frozenset({
     ".mp4", ".mov", ".avi", ".mkv", ".wmv", ".flv", ".webm",
     ".m4v", ".mpg", ".mpeg", ".mxf", ".ts", ".mts", ".m2ts",
     ".3gp", ".ogv", ".r3d",  # RED raw
-}
+})
 
-IMAGE_EXTENSIONS = {
+IMAGE_EXTENSIONS = frozenset({
     ".jpg", ".jpeg", ".png", ".tiff", ".tif", ".bmp", ".webp",
     ".exr", ".dpx", ".hdr", ".gif", ".heic", ".heif", ".raw",
     ".cr2", ".cr3", ".nef", ".arw", ".dng",  # RAW camera formats
+})
+
+# Lowercased suffix -> file type; video is listed last so it wins any overlap
+EXT_FILE_TYPE = {
+    **{e: "image" for e in IMAGE_EXTENSIONS},
+    **{e: "video" for e in VIDEO_EXTENSIONS},
 }
 
 # Codecs that browsers can't play natively → need proxy
-NON_WEB_VIDEO_CODECS = {
+NON_WEB_VIDEO_CODECS = frozenset({
     "prores", "dnxhd", "dnxhr", "cfhd", "v210", "rawvideo",
     "ffv1", "huffyuv", "mjpeg", "mpeg2video", "r210",
-}
+})
+
+
+# Sources browsers play as-is: these codecs in an MP4/WebM container
+WEB_VIDEO_CODECS = frozenset({"h264", "vp8", "vp9", "av1"})
+WEB_AUDIO_CODECS = frozenset({"aac", "mp3", "opus", "vorbis"})
+WEB_CONTAINER_EXTENSIONS = frozenset({".mp4", ".m4v", ".webm"})
 
 
 def classify_file(path: Path) -> str:
     """Classify a file as 'video', 'image', or 'other'."""
-    ext = path.suffix.lower()
-    if ext in VIDEO_EXTENSIONS:
-        return "video"
-    if ext in IMAGE_EXTENSIONS:
-        return "image"
-    return "other"
+    return EXT_FILE_TYPE.get(path.suffix.lower(), "other")
+
+
+# Load the system MIME tables now rather than lazily from a worker thread
+mimetypes.init()
+
+
+@lru_cache(maxsize=256)
+def _mime_for_ext(ext: str) -> Optional[str]:
+    return mimetypes.guess_type(f"x{ext}")[0]
 
 
 def get_mime_type(path: Path) -> Optional[str]:
-    """Get MIME type for a file."""
-    mime, _ = mimetypes.guess_type(str(path))
-    return mime
+    """Get MIME type for a file (memoized by lowercased extension)."""
+    return _mime_for_ext(path.suffix.lower())
+
+
+
+class ProbeCache:
+    """On-disk cache of probe results, keyed by file identity.
+
+    A row is reused only while the file's inode, mtime and size all still
+    match, so a re-ingest of unchanged files skips ffprobe/PIL entirely.
+    Lookups never raise: any cache problem just means a fresh probe.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        if path is None:
+            cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+            path = Path(cache_home) / "ingesthub" / "probes.sqlite"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Shared by the ingest worker threads; writes are serialized below
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS probes (
+                   kind TEXT NOT NULL, dev INTEGER NOT NULL, ino INTEGER NOT NULL,
+                   mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL, result TEXT NOT NULL,
+                   PRIMARY KEY (kind, dev, ino))"""
+        )
+        self._lock = threading.Lock()
+
+    def get(self, filepath: Path, kind: str) -> Optional[dict]:
+        try:
+            st = os.stat(filepath)
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT mtime_ns, size, result FROM probes WHERE kind = ? AND dev = ? AND ino = ?",
+                    (kind, st.st_dev, st.st_ino),
+                ).fetchone()
+        except (OSError, sqlite3.Error):
+            return None
+        if row is None or row[0] != st.st_mtime_ns or row[1] != st.st_size:
+            return None
+        return _json_loads(row[2])
+
+    def put(self, filepath: Path, kind: str, result: dict) -> None:
+        try:
+            st = os.stat(filepath)
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO probes VALUES (?, ?, ?, ?, ?, ?)",
+                    (kind, st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size, json.dumps(result)),
+                )
+        except (OSError, sqlite3.Error, TypeError, ValueError):
+            pass
 
+    def clear(self) -> None:
+        """Drop every cached probe."""
+        with self._lock:
+            self._conn.execute("DELETE FROM probes")
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def open_probe_cache() -> Optional[ProbeCache]:
+    """Open the default probe cache, or None if it can't be created."""
+    try:
+        return ProbeCache()
+    except (OSError, sqlite3.Error) as e:
+        logger.warning("Probe cache unavailable, probing every file: %s", e)
+        return None
+
+
+# Only the fields parse_video/parse_audio read; ffprobe then skips side
+# data and the JSON stays small. Same shape as -show_format -show_streams.
+FFPROBE_ENTRIES = (
+    "format=duration,bit_rate,format_name:format_tags"
+    ":stream=codec_type,codec_name,width,height,r_frame_rate,pix_fmt,"
+    "color_space,sample_rate,channels:stream_tags"
+)
+_FFPROBE_SELECT = ("-show_entries", FFPROBE_ENTRIES)
 
 
 def _run_ffprobe(filepath: str) -> Optional[dict]:
@@ -54,32 +173,198 @@ def _run_ffprobe(filepath: str) -> Optional[dict]:
         result = subprocess.run(
             [
                 "ffprobe",
+                "-threads", "0",
                 "-v", "quiet",
                 "-print_format", "json",
-                "-show_format",
-                "-show_streams",
+                *_FFPROBE_SELECT,
                 str(filepath),
             ],
             capture_output=True,
-            text=True,
             timeout=30,
         )
         if result.returncode != 0:
             return None
-        return json.loads(result.stdout)
+        return _json_loads(result.stdout)
     except (subprocess.TimeoutExpired, json.JSONDecodeError, FileNotFoundError):
         return None
 
 
-def probe_video(filepath: Path) -> dict:
+# Containers whose headers PyAV reads reliably; MXF/R3D/TS stay on ffprobe
+FAST_PROBE_CONTAINERS = frozenset({".mp4", ".mov", ".m4v", ".mkv", ".webm"})
+
+# libavutil AVColorSpace -> the name ffprobe prints (unspecified is omitted)
+_AV_COLOR_SPACES = {
+    0: "gbr", 1: "bt709", 4: "fcc", 5: "bt470bg", 6: "smpte170m",
+    7: "smpte240m", 8: "ycgco", 9: "bt2020nc", 10: "bt2020c", 11: "smpte2085",
+}
+
+
+def _probe_container(filepath: str) -> Optional[dict]:
+    """Read container/stream headers with PyAV, shaped like ffprobe JSON.
+
+    Only the fields parse_video/parse_audio read are filled in. Returns
+    None when PyAV is missing, the container isn't one it handles here, or
+    it fails to open the file, so the caller can fall back to ffprobe.
+    """
+    if av is None or os.path.splitext(filepath)[1].lower() not in FAST_PROBE_CONTAINERS:
+        return None
+    try:
+        with av.open(filepath, metadata_errors="ignore") as container:
+            streams = []
+            for stream in container.streams:
+                cc = stream.codec_context
+                entry = {"codec_type": stream.type, "codec_name": cc.name, "tags": dict(stream.metadata)}
+                if stream.type == "video":
+                    rate = stream.base_rate
+                    entry.update(
+                        width=cc.width,
+                        height=cc.height,
+                        r_frame_rate=f"{rate.numerator}/{rate.denominator}" if rate else "0/0",
+                        pix_fmt=cc.pix_fmt,
+                    )
+                    if (space := _AV_COLOR_SPACES.get(int(cc.colorspace))) is not None:
+                        entry["color_space"] = space
+                elif stream.type == "audio":
+                    entry.update(sample_rate=str(cc.sample_rate), channels=len(cc.layout.channels))
+                streams.append(entry)
+
+            fmt = {"format_name": container.format.name, "tags": dict(container.metadata)}
+            if container.duration is not None:
+                fmt["duration"] = str(container.duration / av.time_base)
+            if container.bit_rate:
+                fmt["bit_rate"] = str(container.bit_rate)
+            return {"streams": streams, "format": fmt}
+    except Exception as e:  # PyAV raises its own FFmpegError tree plus ValueError etc.
+        logger.debug("PyAV probe failed for %s, using ffprobe: %s", filepath, e)
+        return None
+
+
+@lru_cache(maxsize=512)
+def _raw_probe(path: str, size: int, mtime_ns: int) -> Optional[dict]:
+    # size/mtime_ns are only part of the cache key, so edits miss the cache.
+    return _probe_container(path) or _run_ffprobe(path)
+
+
+def get_raw_probe(filepath: Path) -> Optional[dict]:
+    """Raw ffprobe JSON for a file, memoized per (path, size, mtime).
+
+    One ffprobe call can then feed both parse_video and parse_audio. The
+    returned dict is shared; treat it as read-only.
+    """
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        return None
+    return _raw_probe(str(filepath), st.st_size, st.st_mtime_ns)
+
+
+_EMPTY_VIDEO_PROBE = {
+    "width": None, "height": None, "duration_seconds": None,
+    "codec": None, "metadata": {},
+}
+
+_EMPTY_AUDIO_PROBE = {
+    "width": None, "height": None, "duration_seconds": None,
+    "codec": None, "camera": None, "metadata": {},
+}
+
+
+async def _run_ffprobe_async(filepath: str) -> Optional[dict]:
+    """Async twin of _run_ffprobe, so many probes can be in flight at once."""
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            "ffprobe",
+            "-threads", "0",
+            "-v", "quiet",
+            "-print_format", "json",
+            *_FFPROBE_SELECT,
+            filepath,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+    except FileNotFoundError:
+        return None
+    try:
+        stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=30)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        return None
+    if proc.returncode != 0:
+        return None
+    try:
+        return _json_loads(stdout)
+    except json.JSONDecodeError:
+        return None
+
+
+async def probe_many(
+    paths: list,
+    kind: str = "video",
+    cache: Optional[ProbeCache] = None,
+    concurrency: Optional[int] = None,
+) -> list[dict]:
+    """Probe many video or audio files concurrently, in input order.
+
+    Runs up to ``concurrency`` (default: CPU count) ffprobe processes at
+    once; results match probe_video/probe_audio for each path.
+    """
+    return list(await asyncio.gather(*start_probes(paths, kind, cache, concurrency)))
+
+
+def start_probes(
+    paths: list,
+    kind: str = "video",
+    cache: Optional[ProbeCache] = None,
+    concurrency: Optional[int] = None,
+) -> list[asyncio.Task]:
+    """Schedule probe_many's probes and return one task per path, in input order.
+
+    For callers that consume results file by file while the rest are still
+    running. Must be called with an event loop running.
+    """
+    parse, empty = (parse_audio, _EMPTY_AUDIO_PROBE) if kind == "audio" else (parse_video, _EMPTY_VIDEO_PROBE)
+    sem = asyncio.Semaphore(concurrency or os.cpu_count() or 1)
+
+    async def one(path) -> dict:
+        if cache is not None and (hit := cache.get(path, kind)) is not None:
+            return hit
+        async with sem:
+            info = await asyncio.to_thread(_probe_container, str(path)) if av is not None else None
+            if info is None:
+                info = await _run_ffprobe_async(str(path))
+        if not info:
+            return dict(empty, metadata={})
+        result = parse(info)
+        if cache is not None:
+            cache.put(path, kind, result)
+        return result
+
+    return [asyncio.create_task(one(p)) for p in paths]
+
+
+def probe_video(filepath: Path, cache: Optional[ProbeCache] = None) -> dict:
     """Extract metadata from a video file via ffprobe."""
-    info = _run_ffprobe(str(filepath))
+    if cache is not None and (hit := cache.get(filepath, "video")) is not None:
+        return hit
+
+    info = get_raw_probe(filepath)
     if not info:
-        return {
-            "width": None, "height": None, "duration_seconds": None,
-            "codec": None, "metadata": {},
-        }
+        return dict(_EMPTY_VIDEO_PROBE, metadata={})
 
+    result = parse_video(info)
+    if cache is not None:
+        cache.put(filepath, "video", result)
+    return result
+
+
+def _tag(key: str, *tag_sets: Optional[dict]) -> str:
+    """First non-empty KEY across TAG_SETS, without merging them."""
+    return next((tags[key] for tags in tag_sets if tags and tags.get(key)), "")
+
+
+def parse_video(info: dict) -> dict:
+    """Build the video probe result from raw ffprobe JSON."""
     video_stream = None
     audio_stream = None
     for stream in info.get("streams", []):
@@ -115,9 +400,10 @@ def probe_video(filepath: Path) -> dict:
         },
     }
 
-    tags = {**fmt.get("tags", {}), **(video_stream.get("tags", {}) if video_stream else {})}
-    camera = tags.get("make", "") or tags.get("com.apple.quicktime.make", "")
-    model = tags.get("model", "") or tags.get("com.apple.quicktime.model", "")
+    # Stream tags take precedence over container tags
+    tag_sets = (video_stream.get("tags") if video_stream else None, fmt.get("tags"))
+    camera = _tag("make", *tag_sets) or _tag("com.apple.quicktime.make", *tag_sets)
+    model = _tag("model", *tag_sets) or _tag("com.apple.quicktime.model", *tag_sets)
     if camera or model:
         result["camera"] = f"{camera} {model}".strip()
     else:
@@ -126,15 +412,23 @@ def probe_video(filepath: Path) -> dict:
     return result
 
 
-def probe_audio(filepath: Path) -> dict:
+def probe_audio(filepath: Path, cache: Optional[ProbeCache] = None) -> dict:
     """Extract metadata from an audio file via ffprobe."""
-    info = _run_ffprobe(str(filepath))
+    if cache is not None and (hit := cache.get(filepath, "audio")) is not None:
+        return hit
+
+    info = get_raw_probe(filepath)
     if not info:
-        return {
-            "width": None, "height": None, "duration_seconds": None,
-            "codec": None, "camera": None, "metadata": {},
-        }
+        return dict(_EMPTY_AUDIO_PROBE, metadata={})
+
+    result = parse_audio(info)
+    if cache is not None:
+        cache.put(filepath, "audio", result)
+    return result
 
+
+def parse_audio(info: dict) -> dict:
+    """Build the audio probe result from raw ffprobe JSON."""
     audio_stream = None
     for stream in info.get("streams", []):
         if stream.get("codec_type") == "audio" and not audio_stream:
@@ -163,23 +457,42 @@ def probe_audio(filepath: Path) -> dict:
     }
 
 
-def probe_image(filepath: Path) -> dict:
+# EXIF tags kept in image metadata, as (name, tag id). Base-IFD tags sit
+# directly in getexif(); the capture settings live in the Exif sub-IFD.
+_EXIF_BASE_TAGS = (
+    ("Make", 0x010F), ("Model", 0x0110), ("Orientation", 0x0112),
+    ("Software", 0x0131), ("DateTime", 0x0132),
+)
+_EXIF_SUB_TAGS = (
+    ("ExposureTime", 0x829A), ("FNumber", 0x829D), ("ISOSpeedRatings", 0x8827),
+    ("DateTimeOriginal", 0x9003), ("FocalLength", 0x920A), ("LensModel", 0xA434),
+)
+_EXIF_IFD_POINTER = 0x8769
+
+
+def probe_image(filepath: Path, cache: Optional[ProbeCache] = None) -> dict:
     """Extract metadata from an image file."""
+    if cache is not None and (hit := cache.get(filepath, "image")) is not None:
+        return hit
+
     try:
         from PIL import Image
-        from PIL.ExifTags import TAGS
 
         with Image.open(filepath) as img:
             width, height = img.size
             exif_data = {}
             raw_exif = img.getexif()
             if raw_exif:
-                for tag_id, value in raw_exif.items():
-                    tag_name = TAGS.get(tag_id, str(tag_id))
-                    try:
-                        exif_data[tag_name] = str(value)
-                    except Exception:
-                        pass
+                # Only stringify the handful of tags we keep; phone/drone/RAW
+                # EXIF blocks carry hundreds.
+                for name, tag_id in _EXIF_BASE_TAGS:
+                    if (value := raw_exif.get(tag_id)) is not None:
+                        exif_data[name] = str(value)
+                if _EXIF_IFD_POINTER in raw_exif:
+                    sub_ifd = raw_exif.get_ifd(_EXIF_IFD_POINTER)
+                    for name, tag_id in _EXIF_SUB_TAGS:
+                        if (value := sub_ifd.get(tag_id)) is not None:
+                            exif_data[name] = str(value)
 
             camera = None
             make = exif_data.get("Make", "")
@@ -187,7 +500,7 @@ def probe_image(filepath: Path) -> dict:
             if make or model:
                 camera = f"{make} {model}".strip()
 
-            return {
+            result = {
                 "width": width,
                 "height": height,
                 "duration_seconds": None,
@@ -196,9 +509,12 @@ def probe_image(filepath: Path) -> dict:
                 "metadata": {
                     "color_mode": img.mode,
                     "has_alpha": img.mode in ("RGBA", "LA", "PA"),
-                    "exif": {k: v for k, v in list(exif_data.items())[:20]},  # limit
+                    "exif": exif_data,
                 },
             }
+        if cache is not None:
+            cache.put(filepath, "image", result)
+        return result
     except Exception as e:
         console.print(f"  [yellow]⚠ Could not probe image {filepath.name}: {e}[/]")
         return {
@@ -221,52 +537,220 @@ def _parse_fps(fps_str: str) -> Optional[float]:
 
 
 
+# Niceness added to ffmpeg encodes so they don't starve the ingest process
+# (or an API on the same host) of CPU; 0 disables.
+FFMPEG_NICE = int(os.environ.get("INGESTHUB_FFMPEG_NICE", "10"))
+
+
+@lru_cache(maxsize=1)
+def _ffmpeg_cpus() -> Optional[frozenset]:
+    # Keep the lowest CPU free for Python on hosts with a few to spare
+    if not hasattr(os, "sched_getaffinity"):
+        return None
+    cpus = os.sched_getaffinity(0)
+    return frozenset(cpus - {min(cpus)}) if len(cpus) > 2 else None
+
+
+def _deprioritize(pid: int) -> None:
+    """Lower an ffmpeg child's priority and pin it off the reserved CPU.
+
+    Done from the parent after spawning rather than in preexec_fn, which
+    isn't safe with the ingest worker threads running.
+    """
+    try:
+        if FFMPEG_NICE and hasattr(os, "setpriority"):
+            nice = min(19, os.getpriority(os.PRIO_PROCESS, 0) + FFMPEG_NICE)
+            os.setpriority(os.PRIO_PROCESS, pid, nice)
+        if (cpus := _ffmpeg_cpus()) is not None:
+            os.sched_setaffinity(pid, cpus)
+    except OSError:
+        pass  # already exited, or not permitted
+
+
+def _run_ffmpeg(cmd: list[str], timeout: float) -> subprocess.CompletedProcess:
+    """subprocess.run(cmd, capture_output=True, timeout=...) at lowered priority."""
+    kwargs = {}
+    if sys.platform == "win32" and FFMPEG_NICE:
+        kwargs["creationflags"] = subprocess.BELOW_NORMAL_PRIORITY_CLASS
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, **kwargs) as proc:
+        _deprioritize(proc.pid)
+        try:
+            stdout, stderr = proc.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.communicate()
+            raise
+    return subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+
+
+def _is_fresh(output: Path, source: Path) -> bool:
+    """True if OUTPUT exists and is at least as new as SOURCE.
+
+    Lets re-ingests reuse proxies/thumbnails while still regenerating them
+    when the source file has been replaced since.
+    """
+    try:
+        return output.stat().st_mtime >= source.stat().st_mtime
+    except OSError:
+        return False
+
+
+# Hardware H.264 encoders in order of preference; libx264 is the fallback
+HW_H264_ENCODERS = ("h264_nvenc", "h264_qsv", "h264_vaapi", "h264_videotoolbox")
+VAAPI_DEVICE = os.environ.get("INGESTHUB_VAAPI_DEVICE", "/dev/dri/renderD128")
+
+
+def _h264_args(encoder: str, crf: int) -> tuple[list[str], list[str], str]:
+    """(input args, codec args, video filter suffix) for an H.264 encoder."""
+    if encoder == "h264_nvenc":
+        return [], ["-c:v", "h264_nvenc", "-preset", "p4", "-cq", str(crf), "-pix_fmt", "yuv420p"], ""
+    if encoder == "h264_qsv":
+        return [], ["-c:v", "h264_qsv", "-global_quality", str(crf), "-pix_fmt", "nv12"], ""
+    if encoder == "h264_vaapi":
+        # Frames are scaled on the CPU, then uploaded to the VAAPI surface
+        return ["-vaapi_device", VAAPI_DEVICE], ["-c:v", "h264_vaapi", "-qp", str(crf)], ",format=nv12,hwupload"
+    if encoder == "h264_videotoolbox":
+        return [], ["-c:v", "h264_videotoolbox", "-b:v", "6M", "-pix_fmt", "yuv420p"], ""
+    return [], ["-c:v", "libx264", "-preset", "fast", "-crf", str(crf), "-pix_fmt", "yuv420p"], ""
+
+
+def _encoder_works(encoder: str) -> bool:
+    # Builds often list encoders the machine has no device for; encode a
+    # few frames to be sure.
+    input_args, codec_args, vf_suffix = _h264_args(encoder, 23)
+    cmd = [
+        "ffmpeg", "-hide_banner", "-v", "error", *input_args,
+        "-f", "lavfi", "-i", "color=c=black:s=256x256:d=0.2",
+        "-vf", f"null{vf_suffix}", *codec_args, "-f", "null", "-",
+    ]
+    try:
+        return subprocess.run(cmd, capture_output=True, timeout=15).returncode == 0
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        return False
+
+
+@lru_cache(maxsize=1)
+def select_h264_encoder() -> str:
+    """Fastest working H.264 encoder for proxies; checked once per process."""
+    try:
+        result = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-encoders"],
+            capture_output=True, text=True, timeout=10,
+        )
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        return "libx264"
+    for encoder in HW_H264_ENCODERS:
+        if encoder in result.stdout and _encoder_works(encoder):
+            return encoder
+    return "libx264"
+
+
+def proxy_strategy(source: Path, probe: dict) -> str:
+    """How to get a browser-playable proxy for a probed video.
+
+    "link": the source already plays in browsers; use it as the proxy.
+    "remux": H.264/yuv420p in a non-web container (MOV, MKV, TS...); copy the
+    streams into an MP4 without re-encoding. "encode": everything else.
+    """
+    codec = (probe.get("codec") or "").lower()
+    meta = probe.get("metadata") or {}
+    pix_fmt = meta.get("pixel_format")
+    audio = meta.get("audio_codec")
+    if codec not in WEB_VIDEO_CODECS or pix_fmt not in (None, "yuv420p"):
+        # Also covers 10-bit / 4:2:2 streams, which most browsers can't decode
+        return "encode"
+    if source.suffix.lower() in WEB_CONTAINER_EXTENSIONS and (audio is None or audio in WEB_AUDIO_CODECS):
+        return "link"
+    if codec == "h264":
+        return "remux"
+    return "encode"
+
+
+def _remux_video_proxy(source: Path, proxy_path: Path, audio_codec: Optional[str]) -> bool:
+    # Stream copy into MP4 (moov up front); only audio that MP4/browsers
+    # can't take as-is gets transcoded.
+    audio_args = ["-c:a", "copy"] if audio_codec in ("aac", "mp3") else ["-c:a", "aac", "-b:a", "128k"]
+    cmd = [
+        "ffmpeg", "-y", "-nostats",
+        "-i", str(source),
+        "-map", "0:v:0", "-map", "0:a:0?",
+        "-c:v", "copy", *audio_args,
+        "-movflags", "+faststart",
+        str(proxy_path),
+    ]
+    try:
+        result = _run_ffmpeg(cmd, timeout=600)
+    except subprocess.TimeoutExpired:
+        result = None
+    if result is None or result.returncode != 0:
+        if proxy_path.exists():
+            proxy_path.unlink()
+        return False
+    return True
+
+
 def generate_video_proxy(
     source: Path,
     output_dir: Path,
     max_height: int = 720,
     crf: int = 23,
+    encoder: str = "libx264",
+    strategy: str = "encode",
+    audio_codec: Optional[str] = None,
 ) -> Optional[Path]:
     """Generate a web-playable MP4 proxy from a video file.
 
+    ``strategy`` comes from proxy_strategy: "link" returns the source itself,
+    "remux" stream-copies into MP4 (falling back to encoding on failure) and
+    "encode" transcodes. ``audio_codec`` (the probed one) lets a remux copy
+    AAC/MP3 audio. ``encoder`` may be a hardware encoder (see
+    select_h264_encoder); if that fails the proxy is retried with libx264.
     Returns the path to the proxy file, or None on failure.
     """
-    output_dir.mkdir(parents=True, exist_ok=True)
-    proxy_name = f"{source.stem}_proxy.mp4"
-    proxy_path = output_dir / proxy_name
+    if strategy == "link":
+        return source
 
-    if proxy_path.exists():
+    proxy_path = output_dir / f"{source.stem}_proxy.mp4"
+    if _is_fresh(proxy_path, source):
         return proxy_path
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    if strategy == "remux":
+        if _remux_video_proxy(source, proxy_path, audio_codec):
+            return proxy_path
+        logger.debug("Remux failed for %s, re-encoding", source.name)
 
     try:
         # Scale to max_height, keep aspect ratio, ensure even dimensions
+        input_args, codec_args, vf_suffix = _h264_args(encoder, crf)
         scale_filter = (
             f"scale=-2:'min({max_height},ih)':flags=lanczos,"
             "pad=ceil(iw/2)*2:ceil(ih/2)*2"
-        )
+        ) + vf_suffix
 
         cmd = [
-            "ffmpeg", "-y",
+            "ffmpeg", "-y", "-nostats",
+            "-threads", "0",
+            *input_args,
             "-i", str(source),
-            "-c:v", "libx264",
-            "-preset", "fast",
-            "-crf", str(crf),
+            *codec_args,
             "-vf", scale_filter,
             "-c:a", "aac",
             "-b:a", "128k",
             "-movflags", "+faststart",
-            "-pix_fmt", "yuv420p",
             str(proxy_path),
         ]
 
-        result = subprocess.run(
-            cmd, capture_output=True, text=True, timeout=600
-        )
+        result = _run_ffmpeg(cmd, timeout=600)
 
         if result.returncode != 0:
-            console.print(f"  [red]✗ Proxy generation failed for {source.name}[/]")
             if proxy_path.exists():
                 proxy_path.unlink()
+            if encoder != "libx264":
+                # No free encoder session, or the device went away
+                logger.warning("%s failed for %s, retrying with libx264", encoder, source.name)
+                return generate_video_proxy(source, output_dir, max_height, crf)
+            console.print(f"  [red]✗ Proxy generation failed for {source.name}[/]")
             return None
 
         return proxy_path
@@ -278,6 +762,81 @@ def generate_video_proxy(
         return None
 
 
+def generate_video_proxy_and_thumbnail(
+    source: Path,
+    output_dir: Path,
+    max_height: int = 720,
+    crf: int = 23,
+    encoder: str = "libx264",
+    thumb_at: float = 1.0,
+    thumb_size: str = "480:-2",
+) -> tuple[Optional[Path], Optional[Path]]:
+    """Write the proxy and thumbnail from one ffmpeg demux/decode pass.
+
+    The decoded video is split into the proxy encoder and a single-frame
+    JPEG taken at ``thumb_at`` seconds. If the fused run fails, falls back
+    to generate_video_proxy / generate_video_thumbnail.
+    Returns (proxy_path, thumb_path); either may be None on failure.
+    """
+    proxy_path = output_dir / f"{source.stem}_proxy.mp4"
+    thumb_path = output_dir / f"{source.stem}_thumb.jpg"
+    proxy_fresh = _is_fresh(proxy_path, source)
+    thumb_fresh = _is_fresh(thumb_path, source)
+    if proxy_fresh or thumb_fresh:
+        # Only one artefact to (re)build; the single-output helpers do that
+        return (
+            proxy_path if proxy_fresh else generate_video_proxy(source, output_dir, max_height, crf, encoder),
+            thumb_path if thumb_fresh else generate_video_thumbnail(source, output_dir),
+        )
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    input_args, codec_args, vf_suffix = _h264_args(encoder, crf)
+    filter_graph = (
+        "[0:v]split=2[p][t];"
+        f"[p]scale=-2:'min({max_height},ih)':flags=lanczos,"
+        f"pad=ceil(iw/2)*2:ceil(ih/2)*2{vf_suffix}[pout];"
+        f"[t]select='gte(t\\,{thumb_at})',scale={thumb_size}[tout]"
+    )
+    cmd = [
+        "ffmpeg", "-y", "-nostats",
+        "-threads", "0",
+        *input_args,
+        "-i", str(source),
+        "-filter_complex", filter_graph,
+        "-map", "[pout]", "-map", "0:a:0?",
+        *codec_args,
+        "-c:a", "aac",
+        "-b:a", "128k",
+        "-movflags", "+faststart",
+        str(proxy_path),
+        "-map", "[tout]",
+        "-frames:v", "1",
+        "-q:v", "2",
+        str(thumb_path),
+    ]
+
+    try:
+        result = _run_ffmpeg(cmd, timeout=600)
+        ok = result.returncode == 0 and proxy_path.exists()
+    except subprocess.TimeoutExpired:
+        ok = False
+
+    if not ok:
+        logger.debug("Single-pass proxy+thumbnail failed for %s, running separately", source.name)
+        for path in (proxy_path, thumb_path):
+            if path.exists():
+                path.unlink()
+        return (
+            generate_video_proxy(source, output_dir, max_height, crf, encoder),
+            generate_video_thumbnail(source, output_dir),
+        )
+
+    if not thumb_path.exists():
+        # e.g. clip shorter than thumb_at
+        return proxy_path, generate_video_thumbnail(source, output_dir)
+    return proxy_path, thumb_path
+
+
 def generate_video_thumbnail(
     source: Path,
     output_dir: Path,
@@ -285,27 +844,37 @@ def generate_video_thumbnail(
     size: str = "480:-2",
 ) -> Optional[Path]:
     """Extract a single frame as a JPEG thumbnail from a video."""
-    output_dir.mkdir(parents=True, exist_ok=True)
-    thumb_name = f"{source.stem}_thumb.jpg"
-    thumb_path = output_dir / thumb_name
-
-    if thumb_path.exists():
+    thumb_path = output_dir / f"{source.stem}_thumb.jpg"
+    if _is_fresh(thumb_path, source):
         return thumb_path
+    output_dir.mkdir(parents=True, exist_ok=True)
 
     try:
+        # Decode keyframes only and skip the audio/subtitle/data demux; the
+        # first keyframe at or after `timestamp` becomes the thumbnail.
         cmd = [
-            "ffmpeg", "-y",
+            "ffmpeg", "-y", "-hide_banner",
+            "-threads", "0",
+            "-skip_frame", "nokey",
             "-ss", timestamp,
             "-i", str(source),
+            "-map", "0:v:0", "-an", "-sn", "-dn",
             "-vframes", "1",
             "-vf", f"scale={size}",
             "-q:v", "2",
             str(thumb_path),
         ]
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+        result = _run_ffmpeg(cmd, timeout=30)
+
+        if result.returncode != 0 or not thumb_path.exists():
+            # No keyframe after `timestamp` (e.g. a short single-GOP clip):
+            # decode every frame instead.
+            cmd.remove("-skip_frame")
+            cmd.remove("nokey")
+            result = _run_ffmpeg(cmd, timeout=30)
 
         if result.returncode != 0 or not thumb_path.exists():
-            logger.warning("Video thumbnail failed for %s: %s", source.name, result.stderr[-500:] if result.stderr else "unknown error")
+            logger.warning("Video thumbnail failed for %s: %s", source.name, result.stderr[-500:].decode("utf-8", "replace") if result.stderr else "unknown error")
             return None
         return thumb_path
 
@@ -316,6 +885,24 @@ def generate_video_thumbnail(
         return None
 
 
+def _to_rgb(img):
+    return img if img.mode in ("RGB", "L") else img.convert("RGB")
+
+
+def _save_jpeg_at(img, path: Path, max_side: int, quality: int, **save_kwargs):
+    """Save IMG as a JPEG no larger than MAX_SIDE; returns the saved image.
+
+    IMG itself is left untouched, so one decoded image can feed several sizes.
+    """
+    from PIL import Image
+
+    if max(img.size) > max_side:
+        img = img.copy()
+        img.thumbnail((max_side, max_side), Image.LANCZOS)
+    img.save(path, "JPEG", quality=quality, **save_kwargs)
+    return img
+
+
 def generate_image_proxy(
     source: Path,
     output_dir: Path,
@@ -323,24 +910,24 @@ def generate_image_proxy(
     quality: int = 85,
 ) -> Optional[Path]:
     """Generate a web-sized JPEG proxy from an image."""
+    proxy_path = output_dir / f"{source.stem}_proxy.jpg"
+    if _is_fresh(proxy_path, source):
+        return proxy_path
     output_dir.mkdir(parents=True, exist_ok=True)
-    proxy_name = f"{source.stem}_proxy.jpg"
-    proxy_path = output_dir / proxy_name
 
-    if proxy_path.exists():
-        return proxy_path
+    if pyvips is not None:
+        try:
+            proxy = pyvips.Image.thumbnail(str(source), max_size, height=max_size, size="down")
+            proxy.jpegsave(str(proxy_path), Q=quality, strip=True, optimize_coding=True)
+            return proxy_path
+        except pyvips.Error as e:
+            logger.debug("libvips proxy failed for %s, using Pillow: %s", source.name, e)
 
     try:
         from PIL import Image
 
         with Image.open(source) as img:
-            if img.mode not in ("RGB", "L"):
-                img = img.convert("RGB")
-
-            if max(img.size) > max_size:
-                img.thumbnail((max_size, max_size), Image.LANCZOS)
-
-            img.save(proxy_path, "JPEG", quality=quality, optimize=True)
+            _save_jpeg_at(_to_rgb(img), proxy_path, max_size, quality, optimize=True)
             return proxy_path
 
     except Exception as e:
@@ -355,23 +942,66 @@ def generate_image_thumbnail(
     quality: int = 80,
 ) -> Optional[Path]:
     """Generate a small JPEG thumbnail from an image."""
+    thumb_path = output_dir / f"{source.stem}_thumb.jpg"
+    if _is_fresh(thumb_path, source):
+        return thumb_path
     output_dir.mkdir(parents=True, exist_ok=True)
-    thumb_name = f"{source.stem}_thumb.jpg"
-    thumb_path = output_dir / thumb_name
 
-    if thumb_path.exists():
-        return thumb_path
+    if pyvips is not None:
+        try:
+            thumb = pyvips.Image.thumbnail(str(source), size, height=size, size="down")
+            thumb.jpegsave(str(thumb_path), Q=quality, strip=True)
+            return thumb_path
+        except pyvips.Error as e:
+            # Formats libvips can't read still get a chance with Pillow
+            logger.debug("libvips thumbnail failed for %s, using Pillow: %s", source.name, e)
 
     try:
         from PIL import Image
 
         with Image.open(source) as img:
-            if img.mode not in ("RGB", "L"):
-                img = img.convert("RGB")
-            img.thumbnail((size, size), Image.LANCZOS)
-            img.save(thumb_path, "JPEG", quality=quality)
+            _save_jpeg_at(_to_rgb(img), thumb_path, size, quality)
             return thumb_path
 
     except Exception as e:
         logger.warning("Image thumbnail failed for %s: %s", source.name, e)
         return None
+
+
+def generate_image_artifacts(
+    source: Path,
+    output_dir: Path,
+    max_size: int = 1920,
+    thumb_size: int = 480,
+    proxy_quality: int = 85,
+    thumb_quality: int = 80,
+) -> tuple[Optional[Path], Optional[Path]]:
+    """Proxy and thumbnail for an image from a single decode.
+
+    Same outputs as generate_image_proxy + generate_image_thumbnail, but
+    Pillow decodes the source once and the thumbnail is scaled down from the
+    proxy. With pyvips (shrink-on-load, no full decode) or when one output
+    is already fresh, the single-output generators are used instead.
+    """
+    proxy_path = output_dir / f"{source.stem}_proxy.jpg"
+    thumb_path = output_dir / f"{source.stem}_thumb.jpg"
+    proxy_fresh = _is_fresh(proxy_path, source)
+    thumb_fresh = _is_fresh(thumb_path, source)
+    if pyvips is not None or proxy_fresh or thumb_fresh:
+        return (
+            generate_image_proxy(source, output_dir, max_size, proxy_quality),
+            generate_image_thumbnail(source, output_dir, thumb_size, thumb_quality),
+        )
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    try:
+        from PIL import Image
+
+        with Image.open(source) as img:
+            proxy = _save_jpeg_at(_to_rgb(img), proxy_path, max_size, proxy_quality, optimize=True)
+            _save_jpeg_at(proxy, thumb_path, thumb_size, thumb_quality)
+            return proxy_path, thumb_path
+
+    except Exception as e:
+        console.print(f"  [yellow]⚠ Image proxy failed for {source.name}: {e}[/]")
+        return (proxy_path if proxy_path.exists() else None), None
@@ -0,0 +1,41 @@
+-- Dashboard aggregates as materialized views.
+-- Refreshed periodically by the API (see DASHBOARD_REFRESH_SECONDS) so the
+-- dashboard no longer re-aggregates packages/subjects on every request.
+
+-- ============================================================
+-- RECENT PACKAGES (package + subject names + owning project)
+-- ============================================================
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_recent_packages AS
+SELECT pkg.*,
+       agg.subject_names, agg.subject_ids,
+       p.name AS project_name, p.id AS project_id
+FROM packages pkg
+JOIN LATERAL (
+    SELECT string_agg(s.name, ', ' ORDER BY s.name) AS subject_names,
+           string_agg(s.id::text, ',' ORDER BY s.name) AS subject_ids,
+           (MIN(s.project_id::text))::uuid AS project_id
+    FROM packages_subjects ps JOIN subjects s ON s.id = ps.subject_id
+    WHERE ps.package_id = pkg.id
+) agg ON true
+JOIN projects p ON p.id = agg.project_id
+ORDER BY pkg.ingested_at DESC
+LIMIT 500;
+
+-- Unique index is required for REFRESH ... CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_recent_packages_id ON mv_recent_packages(id);
+CREATE INDEX IF NOT EXISTS idx_mv_recent_packages_ingested ON mv_recent_packages(ingested_at DESC);
+
+-- ============================================================
+-- STORAGE BY PROJECT
+-- ============================================================
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_storage_by_project AS
+SELECT p.id AS project_id,
+       p.name AS project_name,
+       COALESCE(SUM(pkg.total_size_bytes), 0) AS total_bytes
+FROM projects p
+LEFT JOIN subjects s ON s.project_id = p.id
+LEFT JOIN packages_subjects ps ON ps.subject_id = s.id
+LEFT JOIN packages pkg ON pkg.id = ps.package_id
+GROUP BY p.id, p.name;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_storage_by_project_id ON mv_storage_by_project(project_id);
@@ -0,0 +1,5 @@
+-- Intentionally empty. This used to build jsonb expression indexes for the
+-- package summary face aggregates, but 004 replaces them with generated
+-- columns and drops them, so a fresh deploy would build both indexes only to
+-- throw them away. Kept so databases that already recorded 003 stay in step;
+-- 004 still drops the indexes there.
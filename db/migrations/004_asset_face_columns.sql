@@ -0,0 +1,37 @@
+-- Promote the face fields the package summary aggregates over out of
+-- assets.metadata->'face' into stored generated columns, so aggregates read
+-- fixed-width values instead of walking jsonb and casting on every row.
+-- Always write metadata; these columns follow it automatically.
+--
+-- The casts run on every write of metadata, and DFL headers are stored as
+-- they came (numbers, numeric strings, or junk like "n/a"), so each cast is
+-- guarded: anything that isn't a plain number becomes NULL instead of
+-- failing the write. Digit/exponent limits keep the casts from overflowing.
+
+ALTER TABLE assets
+    ADD COLUMN IF NOT EXISTS face_yaw DOUBLE PRECISION
+        GENERATED ALWAYS AS (CASE WHEN metadata->'face'->>'yaw'
+            ~ '^\s*[-+]?(\d+(\.\d*)?|\.\d+)([eE][-+]?\d{1,2})?\s*$'
+            THEN (metadata->'face'->>'yaw')::double precision END) STORED,
+    ADD COLUMN IF NOT EXISTS face_pitch DOUBLE PRECISION
+        GENERATED ALWAYS AS (CASE WHEN metadata->'face'->>'pitch'
+            ~ '^\s*[-+]?(\d+(\.\d*)?|\.\d+)([eE][-+]?\d{1,2})?\s*$'
+            THEN (metadata->'face'->>'pitch')::double precision END) STORED,
+    ADD COLUMN IF NOT EXISTS face_sharpness DOUBLE PRECISION
+        GENERATED ALWAYS AS (CASE WHEN metadata->'face'->>'sharpness'
+            ~ '^\s*[-+]?(\d+(\.\d*)?|\.\d+)([eE][-+]?\d{1,2})?\s*$'
+            THEN (metadata->'face'->>'sharpness')::double precision END) STORED,
+    ADD COLUMN IF NOT EXISTS face_type TEXT
+        GENERATED ALWAYS AS (metadata->'face'->>'face_type') STORED,
+    ADD COLUMN IF NOT EXISTS face_source_width INTEGER
+        GENERATED ALWAYS AS (CASE WHEN metadata->'face'->>'source_width' ~ '^\s*\d{1,9}(\.\d*)?\s*$'
+            THEN (metadata->'face'->>'source_width')::numeric::int END) STORED,
+    ADD COLUMN IF NOT EXISTS face_source_height INTEGER
+        GENERATED ALWAYS AS (CASE WHEN metadata->'face'->>'source_height' ~ '^\s*\d{1,9}(\.\d*)?\s*$'
+            THEN (metadata->'face'->>'source_height')::numeric::int END) STORED;
+
+-- The covering index over these columns is built CONCURRENTLY in 008.
+
+-- Superseded by the generated columns (003 used to index the jsonb expressions)
+DROP INDEX IF EXISTS idx_assets_pkg_aligned_face;
+DROP INDEX IF EXISTS idx_assets_face_yaw;
@@ -0,0 +1,4 @@
+-- Keyset pagination for GET /api/subjects/{id}/assets: seek on
+-- (filename, id) within a subject instead of OFFSET-scanning.
+CREATE INDEX IF NOT EXISTS idx_assets_subject_filename_id
+    ON assets(subject_id, filename, id);
@@ -0,0 +1,30 @@
+-- Summary views: count and size of assets in one pass over the subject's /
+-- project's assets instead of two correlated subqueries each.
+-- Column list and order are unchanged, so CREATE OR REPLACE is enough.
+
+CREATE OR REPLACE VIEW v_subject_summary AS
+SELECT
+    s.*,
+    (SELECT COUNT(*) FROM packages_subjects ps WHERE ps.subject_id = s.id)::int AS package_count,
+    agg.total_assets,
+    agg.total_size_bytes
+FROM subjects s
+CROSS JOIN LATERAL (
+    SELECT COUNT(*)::int AS total_assets,
+           COALESCE(SUM(a.file_size_bytes), 0)::bigint AS total_size_bytes
+    FROM assets a WHERE a.subject_id = s.id
+) agg;
+
+CREATE OR REPLACE VIEW v_project_summary AS
+SELECT
+    p.*,
+    (SELECT COUNT(*) FROM subjects s WHERE s.project_id = p.id)::int AS subject_count,
+    (SELECT COUNT(DISTINCT ps.package_id) FROM packages_subjects ps JOIN subjects s ON s.id = ps.subject_id WHERE s.project_id = p.id)::int AS package_count,
+    agg.total_assets,
+    agg.total_size_bytes
+FROM projects p
+CROSS JOIN LATERAL (
+    SELECT COUNT(*)::int AS total_assets,
+           COALESCE(SUM(a.file_size_bytes), 0)::bigint AS total_size_bytes
+    FROM assets a JOIN subjects s ON s.id = a.subject_id WHERE s.project_id = p.id
+) agg;
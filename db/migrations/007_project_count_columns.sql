@@ -0,0 +1,102 @@
+-- Denormalized subject/package counts on projects, kept current by triggers,
+-- so v_project_summary reads two columns instead of running two correlated
+-- COUNT subqueries per project.
+
+ALTER TABLE projects
+    ADD COLUMN IF NOT EXISTS subject_count INT NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS package_count INT NOT NULL DEFAULT 0;
+
+-- package_count is COUNT(DISTINCT package) across the project's subjects (a
+-- package can link several of them), which a +/-1 can't track, so both
+-- counts are recomputed for the affected project. Both are index lookups.
+-- Rows whose counts didn't change are left alone.
+--
+-- The project row is locked before counting: concurrent writers to one
+-- project queue on it, and each count runs in its own statement so under
+-- READ COMMITTED it sees the rows committed by whoever held the lock before.
+-- Counting in the UPDATE itself would use the pre-wait snapshot and write
+-- (or skip writing) a stale count. NO KEY UPDATE is the lock the UPDATE takes
+-- anyway; unlike FOR UPDATE it doesn't conflict with the KEY SHARE locks the
+-- subjects FK checks hold on the same row, which would deadlock two inserts.
+CREATE OR REPLACE FUNCTION refresh_project_counts(pid UUID)
+RETURNS void AS $$
+BEGIN
+    PERFORM 1 FROM projects WHERE id = pid FOR NO KEY UPDATE;
+
+    UPDATE projects p SET subject_count = c.subject_count, package_count = c.package_count
+    FROM (
+        SELECT (SELECT COUNT(*) FROM subjects s WHERE s.project_id = pid)::int AS subject_count,
+               (SELECT COUNT(DISTINCT ps.package_id) FROM packages_subjects ps
+                JOIN subjects s ON s.id = ps.subject_id WHERE s.project_id = pid)::int AS package_count
+    ) c
+    WHERE p.id = pid
+      AND (p.subject_count, p.package_count) IS DISTINCT FROM (c.subject_count, c.package_count);
+END;
+$$ LANGUAGE plpgsql;
+
+-- Count refreshes aren't edits to the project: don't bump updated_at for them
+DROP TRIGGER IF EXISTS trg_projects_updated ON projects;
+CREATE TRIGGER trg_projects_updated
+    BEFORE UPDATE ON projects
+    FOR EACH ROW
+    WHEN (OLD.subject_count = NEW.subject_count AND OLD.package_count = NEW.package_count)
+    EXECUTE FUNCTION update_updated_at();
+
+CREATE OR REPLACE FUNCTION trg_subjects_project_counts()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM refresh_project_counts(OLD.project_id);
+    END IF;
+    IF TG_OP = 'INSERT' OR (TG_OP = 'UPDATE' AND NEW.project_id IS DISTINCT FROM OLD.project_id) THEN
+        PERFORM refresh_project_counts(NEW.project_id);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION trg_packages_subjects_project_counts()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM refresh_project_counts(s.project_id) FROM subjects s WHERE s.id = OLD.subject_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM refresh_project_counts(s.project_id) FROM subjects s WHERE s.id = NEW.subject_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$ BEGIN
+    CREATE TRIGGER trg_subjects_project_counts
+        AFTER INSERT OR DELETE OR UPDATE OF project_id ON subjects
+        FOR EACH ROW EXECUTE FUNCTION trg_subjects_project_counts();
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $$;
+
+DO $$ BEGIN
+    CREATE TRIGGER trg_packages_subjects_project_counts
+        AFTER INSERT OR DELETE OR UPDATE ON packages_subjects
+        FOR EACH ROW EXECUTE FUNCTION trg_packages_subjects_project_counts();
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $$;
+
+-- Backfill
+UPDATE projects p SET
+    subject_count = (SELECT COUNT(*) FROM subjects s WHERE s.project_id = p.id),
+    package_count = (SELECT COUNT(DISTINCT ps.package_id) FROM packages_subjects ps
+                     JOIN subjects s ON s.id = ps.subject_id WHERE s.project_id = p.id);
+
+-- p.* now carries the counts; the column list and order are unchanged.
+CREATE OR REPLACE VIEW v_project_summary AS
+SELECT
+    p.*,
+    agg.total_assets,
+    agg.total_size_bytes
+FROM projects p
+CROSS JOIN LATERAL (
+    SELECT COUNT(*)::int AS total_assets,
+           COALESCE(SUM(a.file_size_bytes), 0)::bigint AS total_size_bytes
+    FROM assets a JOIN subjects s ON s.id = a.subject_id WHERE s.project_id = p.id
+) agg;
@@ -0,0 +1,6 @@
+-- Summary aggregates + pose matrix: per package/asset_type, pose carried in
+-- the index. Built CONCURRENTLY so it doesn't block writes to assets; psql
+-- runs each statement outside a transaction block, which CONCURRENTLY
+-- requires, so this lives in its own file.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_assets_pkg_type_face
+    ON assets(package_id, asset_type) INCLUDE (face_yaw, face_pitch);
@@ -44,12 +44,13 @@ const PAGE_SIZE = 200;
 export function usePaginatedAssets(filters: AssetFilters) {
   return useInfiniteQuery({
     queryKey: ['assets', 'paginated', filters],
-    queryFn: ({ pageParam = 0 }) => getAssetsPaginated(filters, pageParam, PAGE_SIZE),
-    getNextPageParam: (lastPage) => {
+    queryFn: ({ pageParam }) => getAssetsPaginated(filters, pageParam, PAGE_SIZE),
+    getNextPageParam: (lastPage): number | string | undefined => {
+      if (lastPage.next_cursor) return lastPage.next_cursor;
       const next = lastPage.offset + lastPage.limit;
       return next < lastPage.total ? next : undefined;
     },
-    initialPageParam: 0,
+    initialPageParam: 0 as number | string,
     enabled: !!(filters.package_id || filters.subject_id),
   });
 }
@@ -20,7 +20,7 @@ export const lookupAssetByPath = (diskPath: string) =>
 
 export const getAssetsPaginated = (
   filters: AssetFilters,
-  offset: number,
+  page: number | string,
   limit: number = 200,
 ): Promise<PaginatedAssets> => {
   const params = new URLSearchParams();
@@ -29,7 +29,9 @@ export const getAssetsPaginated = (
   if (filters.picked_up !== undefined) params.set('picked_up', String(filters.picked_up));
   if (filters.search) params.set('search', filters.search);
   if (filters.pose_bins) params.set('pose_bins', filters.pose_bins);
-  params.set('offset', String(offset));
+  // A string page param is a keyset cursor (subject assets); a number is an offset
+  if (typeof page === 'string') params.set('cursor', page);
+  else params.set('offset', String(page));
   params.set('limit', String(limit));
 
   if (filters.package_id) {
@@ -34,7 +34,7 @@ export const updatePackage = (id: string, data: Record<string, unknown>) =>
 export const deletePackage = (id: string) => api.delete(`/packages/${id}`);
 
 export const bulkDeletePackages = (ids: string[]) =>
-  api.post<{ deleted: number }>('/packages/bulk-delete', { ids });
+  api.post<{ deleted: number; ids: string[] }>('/packages/bulk-delete', { ids });
 
 export interface ProjectPackage extends Package {
   subject_name: string;
@@ -15,4 +15,4 @@ export const updateSubject = (id: string, data: UpdateSubjectInput) =>
 export const deleteSubject = (id: string) => api.delete(`/subjects/${id}`);
 
 export const bulkDeleteSubjects = (ids: string[]) =>
-  api.post<{ deleted: number }>('/subjects/bulk-delete', { ids });
+  api.post<{ deleted: number; ids: string[] }>('/subjects/bulk-delete', { ids });
@@ -250,6 +250,7 @@ export interface PaginatedAssets {
   total_size_bytes: number;
   total_duration_seconds: number;
   picked_up_count: number;
+  next_cursor?: string | null;
 }
 
 export interface AssetFilters {
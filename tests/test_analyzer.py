@@ -0,0 +1,206 @@
+"""Package analyzer directory-scan tests."""
+
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+from api.services.analyzer import _analyze_vfx, _scan_directory, detect_package_type
+
+
+def _touch(path: Path, size: int = 10) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+
+
+def test_scan_directory_skips_hidden_and_non_media(tmp_path: Path):
+    _touch(tmp_path / "Jo" / "cam_a" / "clip.MOV", 2 * 1024 * 1024)
+    _touch(tmp_path / "Jo" / "notes.txt")
+    _touch(tmp_path / ".cache" / "thumb.png")
+    _touch(tmp_path / "Jo" / ".hidden.wav")
+
+    files = _scan_directory(tmp_path)
+    assert [f["path"] for f in files] == ["Jo/cam_a/clip.MOV"]
+    clip = files[0]
+    assert clip["ext"] == ".mov"
+    assert clip["size_mb"] == 2.0
+    assert clip["size_bytes"] == 2 * 1024 * 1024
+    assert set(clip) == {"path", "ext", "size_mb", "size_bytes"}
+
+
+def test_scan_directory_sorted_by_path_parts(tmp_path: Path):
+    _touch(tmp_path / "a-b" / "x.png")
+    _touch(tmp_path / "a" / "x.png")
+    _touch(tmp_path / "a.png")
+    assert [f["path"] for f in _scan_directory(tmp_path)] == ["a/x.png", "a-b/x.png", "a.png"]
+
+
+def test_analyze_vfx(tmp_path: Path):
+    _touch(tmp_path / "jo" / "aligned" / "jo_0001_0.png", 100)
+    _touch(tmp_path / "jo" / "plate" / "jo_0001.png", 50)
+    _touch(tmp_path / "jo" / "grids" / "grid.png", 25)
+
+    result = _analyze_vfx(tmp_path)
+    assert result["total_files"] == 3
+    assert result["total_size_bytes"] == 175
+    [subject] = result["subjects"]
+    assert subject["name"] == "jo"
+    types = {f["original_path"]: f["asset_type"] for f in subject["files"]}
+    assert types == {
+        "jo/aligned/jo_0001_0.png": "aligned",
+        "jo/grids/grid.png": "grid",
+        "jo/plate/jo_0001.png": "plate",
+    }
+
+
+def test_detect_package_type(tmp_path: Path):
+    vfx = tmp_path / "vfx"
+    for i in range(5):
+        _touch(vfx / "aligned" / f"jo_{i:04d}_0.png")
+    assert detect_package_type(vfx) == "vfx"
+
+    atman = tmp_path / "atman"
+    _touch(atman / "Jo" / "clip.mov")
+    _touch(atman / "Jo" / "audio.wav")
+    assert detect_package_type(atman) == "atman"
+
+
+def test_call_gemini_uses_disk_cache(tmp_path: Path, monkeypatch):
+    from dataclasses import replace
+
+    from api.services import analyzer
+
+    monkeypatch.setattr(analyzer, "settings", replace(
+        analyzer.settings, gemini_api_key="test-key", llm_cache_dir=str(tmp_path),
+    ))
+    calls = []
+
+    class _Models:
+        def generate_content(self, model, contents, config):
+            calls.append(contents)
+            files = json.loads(contents)["files"]
+            manifest = [{"source_path": f["path"], "target_path": f"jo/cam_a/raw/{f['path']}"} for f in files]
+            return SimpleNamespace(text=json.dumps({"manifest": manifest}))
+
+    clients = []
+
+    def _client(api_key):
+        clients.append(api_key)
+        return SimpleNamespace(models=_Models())
+
+    monkeypatch.setattr(analyzer.genai, "Client", _client)
+    analyzer._gemini_client.cache_clear()
+
+    n = analyzer.BATCH_SIZE + 5
+    facts = {"package_root": "shoot", "files": [{"path": f"clip{i}.mov"} for i in range(n)]}
+    first = analyzer._call_gemini(facts)
+    assert len(calls) == 2
+    assert [m["source_path"] for m in first] == [f"clip{i}.mov" for i in range(n)]
+
+    assert analyzer._call_gemini(facts) == first
+    assert len(calls) == 2
+
+    # A later analysis with new files reuses the same client
+    analyzer._call_gemini({"package_root": "shoot", "files": [{"path": "other.mov"}]})
+    assert len(calls) == 3
+    assert clients == ["test-key"]
+    analyzer._gemini_client.cache_clear()
+
+
+def test_subject_fixups_from_paths(tmp_path: Path):
+    from api.services.analyzer import _match_shared_by_filename, _path_keys, _validate_subject_assignments
+
+    for rel in ("Jo/cam_a/A001.mov", "Jo/cam_a/A002.mov", "Jo/cam_a/A003.mov",
+                "Sam Lee/cam_a/B001.mov", "Sam Lee/cam_a/B002.mov", "graded/A001_graded.mov"):
+        _touch(tmp_path / rel)
+    keys = _path_keys(_scan_directory(tmp_path))
+
+    lookup = {rel: {"subject": "jo", "camera": "cam_a", "asset_type": "raw"} for rel, _, _ in keys}
+    lookup["graded/A001_graded.mov"]["subject"] = "shared"
+    lookup = _validate_subject_assignments(lookup, keys)
+    assert lookup["Sam Lee/cam_a/B001.mov"]["subject"] == "sam_lee"
+    assert lookup["graded/A001_graded.mov"]["subject"] == "shared"
+
+    lookup = _match_shared_by_filename(lookup, keys)
+    assert lookup["graded/A001_graded.mov"]["subject"] == "jo"
+
+
+def test_analyze_atman_exact_sizes(tmp_path: Path, monkeypatch):
+    from api.services import analyzer
+
+    _touch(tmp_path / "Jo" / "clip.mov", 1234567)
+    _touch(tmp_path / "Jo" / "take.wav", 89)
+    sent = []
+
+    def _fake_gemini(file_facts):
+        sent.extend(file_facts["files"])
+        return [{"source_path": f["path"], "target_path": f"jo/cam_a/raw/{f['path']}"}
+                for f in file_facts["files"]]
+
+    monkeypatch.setattr(analyzer, "_call_gemini", _fake_gemini)
+    result = analyzer._analyze_atman(tmp_path)
+
+    assert all("size_bytes" not in f for f in sent)
+    assert result["total_size_bytes"] == 1234567 + 89
+    [subject] = result["subjects"]
+    assert subject["name"] == "jo"
+    assert {f["original_path"]: f["size_bytes"] for f in subject["files"]} == {
+        "Jo/clip.mov": 1234567, "Jo/take.wav": 89,
+    }
+
+
+def test_analyze_atman_skips_llm_for_unambiguous_layout(tmp_path: Path, monkeypatch):
+    from api.services import analyzer
+
+    _touch(tmp_path / "Jo" / "Cam_B" / "Proxies" / "A001.mp4")
+    _touch(tmp_path / "Jo" / "Cam_B" / "A001.wav")
+    _touch(tmp_path / "Day_01" / "Card_A" / "C001.mov")
+    sent = []
+
+    def _fake_gemini(file_facts):
+        sent.extend(f["path"] for f in file_facts["files"])
+        return [{"source_path": f["path"], "target_path": "sam/cam_a/raw/x"} for f in file_facts["files"]]
+
+    monkeypatch.setattr(analyzer, "_call_gemini", _fake_gemini)
+    result = analyzer._analyze_atman(tmp_path)
+
+    assert sent == ["Day_01/Card_A/C001.mov"]
+    files = {f["original_path"]: f for s in result["subjects"] for f in s["files"]}
+    proxy = files["Jo/Cam_B/Proxies/A001.mp4"]
+    assert (proxy["subject"], proxy["camera"], proxy["asset_type"]) == ("jo", "cam_b", "proxy")
+    assert files["Jo/Cam_B/A001.wav"]["asset_type"] == "raw"
+    assert files["Day_01/Card_A/C001.mov"]["subject"] == "sam"
+
+
+def test_call_gemini_batch_retries(monkeypatch):
+    from google.genai import errors as genai_errors
+
+    from api.services import analyzer
+
+    monkeypatch.setattr(analyzer, "_gemini_cache_put", lambda path, manifest: None)
+    sleeps = []
+    monkeypatch.setattr(analyzer.time, "sleep", sleeps.append)
+
+    def _client(*outcomes):
+        outcomes = list(outcomes)
+
+        def generate_content(**_):
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return SimpleNamespace(text=outcome)
+
+        return SimpleNamespace(models=SimpleNamespace(generate_content=generate_content))
+
+    chunk = [{"path": "a.mov"}]
+    ok = json.dumps({"manifest": [{"source_path": "a.mov", "target_path": "jo/cam_a/raw/a.mov"}]})
+
+    rate_limited = genai_errors.ClientError(429, {"error": {"message": "slow down"}})
+    assert analyzer._call_gemini_batch(_client(rate_limited, "not json", ok), "root", chunk, 1, 1) == [
+        {"source_path": "a.mov", "target_path": "jo/cam_a/raw/a.mov"},
+    ]
+    assert len(sleeps) == 1 and 1 <= sleeps[0] < 2
+
+    sleeps.clear()
+    rejected = genai_errors.ClientError(400, {"error": {"message": "bad request"}})
+    assert analyzer._call_gemini_batch(_client(rejected), "root", chunk, 1, 1) == []
+    assert sleeps == []
@@ -83,3 +83,24 @@ async def test_lookup_by_path_not_found(client: AsyncClient):
     })
     assert resp.status_code == 200
     assert resp.json() is None
+
+
+async def test_list_assets_offset_past_end(client: AsyncClient, seed_asset: dict):
+    pid = str(seed_asset["package_id"])
+    resp = await client.get("/api/assets", params={"package_id": pid, "offset": 10})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["items"] == []
+    assert body["total"] == 1
+
+
+async def test_list_assets_pages_large_package(client: AsyncClient, bulk_seed_assets, seed_package: dict):
+    await bulk_seed_assets(1200)
+    pid = str(seed_package["id"])
+
+    seen = []
+    for offset in range(0, 1200, 500):
+        body = (await client.get("/api/assets", params={"package_id": pid, "offset": offset, "limit": 500})).json()
+        assert body["total"] == 1200
+        seen += [a["id"] for a in body["items"]]
+    assert len(set(seen)) == 1200
@@ -0,0 +1,60 @@
+"""Dataset directory matching tests."""
+
+from api.services.datasets import fuzzy_match_dataset
+
+
+def test_fuzzy_match_exact_wins():
+    assert fuzzy_match_dataset("Paul Stanley", ["paul-stanley", "paul_stanley_2"]) == [
+        {"dir_name": "paul-stanley", "score": 1.0, "match_type": "exact"},
+    ]
+
+
+def test_fuzzy_match_tiers_ranked():
+    dirs = ["jonathan_smith", "jo_extra", "unrelated", "xjonathon smithx"]
+    matches = fuzzy_match_dataset("Jonathon Smith", dirs)
+    assert [(m["dir_name"], m["match_type"]) for m in matches] == [
+        ("jonathan_smith", "fuzzy"),
+        ("xjonathon smithx", "substring"),
+    ]
+    assert 0.9 < matches[0]["score"] < 1.0
+
+
+def test_fuzzy_match_empty_subject():
+    assert fuzzy_match_dataset("  ", ["anything"]) == []
+
+
+def test_create_dataset_symlinks(tmp_path):
+    from api.services.datasets import create_dataset_symlinks
+
+    src_dir = tmp_path / "src"
+    src_dir.mkdir()
+    for name in ("a.mov", "b.wav", "c.png"):
+        (src_dir / name).write_bytes(b"x")
+    assets = [
+        {"original_path": str(src_dir / "a.mov"), "file_type": "video", "asset_type": "raw"},
+        {"original_path": str(src_dir / "b.wav"), "file_type": "audio", "asset_type": "raw"},
+        {"original_path": str(src_dir / "c.png"), "file_type": "image", "asset_type": "aligned"},
+    ]
+
+    result = create_dataset_symlinks(str(tmp_path / "ds"), "pkg", assets)
+    assert result == {"created": 3, "skipped": 0, "errors": []}
+    base = tmp_path / "ds" / "media" / "external" / "from_client" / "pkg"
+    assert (base / "visuals" / "raw" / "a.mov").resolve() == src_dir / "a.mov"
+    assert (base / "audio" / "raw" / "b.wav").is_symlink()
+    assert (base / "visuals" / "aligned" / "c.png").is_symlink()
+
+    again = create_dataset_symlinks(str(tmp_path / "ds"), "pkg", assets)
+    assert again == {"created": 0, "skipped": 3, "errors": []}
+
+
+def test_list_dataset_dirs(tmp_path):
+    from api.services.datasets import list_dataset_dirs
+
+    (tmp_path / "b_subject").mkdir()
+    (tmp_path / "a_subject").mkdir()
+    (tmp_path / "notes.txt").write_text("x")
+    (tmp_path / "linked").symlink_to(tmp_path / "a_subject")
+
+    assert list_dataset_dirs(str(tmp_path)) == ["a_subject", "b_subject", "linked"]
+    assert list_dataset_dirs(str(tmp_path / "missing")) == []
+    assert list_dataset_dirs(str(tmp_path / "notes.txt")) == []
@@ -0,0 +1,101 @@
+"""PNG face metadata extraction tests."""
+
+import json
+import pickle
+import struct
+import zlib
+from pathlib import Path
+
+import pytest
+
+from api.services.metadata import read_face_metadata, read_face_metadata_batch
+
+
+def _chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def _png(path: Path, *extra: bytes, idat_size: int = 4096) -> Path:
+    ihdr = struct.pack(">IIBBBBB", 1, 1, 8, 2, 0, 0, 0)
+    path.write_bytes(
+        b"\x89PNG\r\n\x1a\n"
+        + _chunk(b"IHDR", ihdr)
+        + _chunk(b"IDAT", b"\x00" * idat_size)
+        + b"".join(extra)
+        + _chunk(b"IEND", b"")
+    )
+    return path
+
+
+def test_fcwp_after_idat(tmp_path: Path):
+    # DFL-style writers append fcWp just before IEND
+    meta = {"pose": (1.5, -20.0, 3.0), "source_filename": "src.png",
+            "source_size": (1920, 1080), "face_type": "whole_face", "sharpness": 0.5}
+    png = _png(tmp_path / "a.png", _chunk(b"fcWp", pickle.dumps(meta)))
+
+    result = read_face_metadata(png)
+    assert result["yaw"] == -20.0
+    assert (result["source_width"], result["source_height"]) == (1920, 1080)
+    assert result["face_type"] == "whole_face"
+    assert result["confidence"] == 0.5
+
+
+def test_dfl_text_header(tmp_path: Path):
+    header = {"yaw": 12.0, "source_filename": "x.jpg"}
+    png = _png(tmp_path / "b.png", _chunk(b"tEXt", b"dfl_header\x00" + json.dumps(header).encode()))
+    assert read_face_metadata(png) == header
+
+
+def test_no_metadata(tmp_path: Path):
+    assert read_face_metadata(_png(tmp_path / "c.png", _chunk(b"tEXt", b"Comment\x00hi"))) == {}
+    (tmp_path / "d.png").write_bytes(b"not a png")
+    assert read_face_metadata(tmp_path / "d.png") == {}
+    assert read_face_metadata(tmp_path / "missing.png") == {}
+
+
+def test_batch_preserves_order(tmp_path: Path):
+    paths = [
+        _png(tmp_path / f"{i}.png", _chunk(b"tEXt", b"dfl_header\x00" + json.dumps({"yaw": float(i)}).encode()))
+        for i in range(20)
+    ]
+    paths.insert(5, tmp_path / "missing.png")
+    results = read_face_metadata_batch(paths, workers=4)
+    assert results[5] == {}
+    assert [r["yaw"] for r in results[:5] + results[6:]] == [float(i) for i in range(20)]
+    assert read_face_metadata_batch([]) == []
+
+
+def test_empty_and_truncated(tmp_path: Path):
+    (tmp_path / "empty.png").write_bytes(b"")
+    assert read_face_metadata(tmp_path / "empty.png") == {}
+    png = _png(tmp_path / "t.png", _chunk(b"fcWp", pickle.dumps({"pose": (1, 2, 3)})))
+    png.write_bytes(png.read_bytes()[:40])
+    assert read_face_metadata(png) == {}
+
+
+class _Exploit:
+    def __reduce__(self):
+        import os
+        return (os.system, ("touch pwned",))
+
+
+def test_fcwp_rejects_unsafe_globals(tmp_path: Path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    payload = pickle.dumps({"pose": (1.0, 2.0, 3.0), "x": _Exploit()})
+    png = _png(tmp_path / "evil.png", _chunk(b"fcWp", payload))
+
+    assert read_face_metadata(png) == {}
+    assert not (tmp_path / "pwned").exists()
+
+
+def test_fcwp_numpy_landmarks(tmp_path: Path):
+    np = pytest.importorskip("numpy")
+    meta = {"pose": np.array([1.0, -2.0, 3.0], dtype=np.float32),
+            "source_landmarks": np.arange(6, dtype=np.float32).reshape(3, 2),
+            "sharpness": np.float32(0.25)}
+    for protocol in (2, 5):
+        png = _png(tmp_path / f"np{protocol}.png", _chunk(b"fcWp", pickle.dumps(meta, protocol=protocol)))
+        result = read_face_metadata(png)
+        assert result["yaw"] == -2.0
+        assert result["landmarks"] == [[0.0, 1.0], [2.0, 3.0], [4.0, 5.0]]
+        assert result["sharpness"] == 0.25
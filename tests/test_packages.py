@@ -1,5 +1,7 @@
 """Package endpoint tests."""
 
+import threading
+
 from httpx import AsyncClient
 
 
@@ -37,6 +39,15 @@ async def test_list_packages_search_no_results(client: AsyncClient):
     assert body["items"] == []
 
 
+async def test_list_packages_filter_by_subject(client: AsyncClient, seed_package: dict):
+    resp = await client.get("/api/packages", params={"subject_id": str(seed_package["subject_id"])})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["total"] == 1
+    assert body["items"][0]["name"] == "test-pkg-001"
+    assert body["items"][0]["linked_subjects"][0]["name"] == "Test Subject"
+
+
 async def test_list_packages_filter_by_type(client: AsyncClient, seed_package: dict):
     resp = await client.get("/api/packages", params={"package_type": "atman"})
     assert resp.status_code == 200
@@ -95,3 +106,100 @@ async def test_list_package_assets(client: AsyncClient, seed_asset: dict):
     body = resp.json()
     assert body["total"] >= 1
     assert any(a["filename"] == "frame_0001.png" for a in body["items"])
+
+
+async def test_package_summary(client: AsyncClient, seed_asset: dict):
+    pid = str(seed_asset["package_id"])
+    resp = await client.get(f"/api/packages/{pid}/summary")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["total_assets"] == 1
+    assert body["image_count"] == 1
+    assert body["aligned_count"] == 1
+
+
+async def test_package_summary_common_resolution(client: AsyncClient, db_conn, seed_package: dict):
+    for i, (w, h) in enumerate([(1920, 1080), (1920, 1080), (1280, 720)]):
+        await db_conn.execute(
+            "INSERT INTO assets (package_id, filename, file_type, disk_path, width, height) "
+            "VALUES ($1, $2, 'video', $3, $4, $5)",
+            seed_package["id"], f"clip_{i}.mov", f"/tmp/test/clip_{i}.mov", w, h,
+        )
+    resp = await client.get(f"/api/packages/{seed_package['id']}/summary")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["common_width"] == 1920
+    assert body["common_height"] == 1080
+
+
+async def test_package_summary_face_stats(client: AsyncClient, db_conn, seed_package: dict):
+    for i, (yaw, pitch) in enumerate([(-12.0, 3.0), (5.0, -4.0), (7.5, 1.0)]):
+        face = {"yaw": yaw, "pitch": pitch, "sharpness": 10.0, "face_type": "whole_face",
+                "source_width": 3840, "source_height": 2160}
+        await db_conn.execute(
+            "INSERT INTO assets (package_id, filename, file_type, asset_type, disk_path, metadata) "
+            "VALUES ($1, $2, 'image', 'aligned', $3, $4)",
+            seed_package["id"], f"face_{i}.png", f"/tmp/test/face_{i}.png", {"face": face},
+        )
+    resp = await client.get(f"/api/packages/{seed_package['id']}/summary")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["yaw_min"] == -12.0
+    assert body["yaw_max"] == 7.5
+    assert body["face_types"] == ["whole_face"]
+    assert body["source_width"] == 3840
+    assert sorted((c["y"], c["p"], c["count"]) for c in body["pose_data"]) == [(-20, 0, 1), (0, -10, 1), (0, 0, 1)]
+
+
+async def test_package_summary_no_assets(client: AsyncClient, seed_package: dict):
+    resp = await client.get(f"/api/packages/{seed_package['id']}/summary")
+    assert resp.status_code == 404
+
+
+async def test_backfill_face_metadata_missing_files(client: AsyncClient, seed_asset: dict):
+    pid = str(seed_asset["package_id"])
+    resp = await client.post(f"/api/packages/{pid}/backfill-face-metadata")
+    assert resp.status_code == 200
+    events = [line for line in resp.text.splitlines() if line.startswith("data: ")]
+    assert '"status":"started"' in events[0]
+    assert '"status":"progress"' in events[1]
+    assert '"status":"done"' in events[-1]
+    assert '"updated":0' in events[-1]
+
+
+async def test_backfill_face_metadata_read_timeout(client: AsyncClient, seed_asset: dict, monkeypatch):
+    import api.routers.packages as packages_mod
+
+    release = threading.Event()
+    monkeypatch.setattr(packages_mod, "read_face_metadata", lambda path: release.wait(5))
+    monkeypatch.setattr(packages_mod, "BACKFILL_READ_TIMEOUT", 0.1)
+    try:
+        resp = await client.post(f"/api/packages/{seed_asset['package_id']}/backfill-face-metadata")
+    finally:
+        release.set()
+    events = [line for line in resp.text.splitlines() if line.startswith("data: ")]
+    assert '"status":"done"' in events[-1]
+    assert '"errors":1' in events[-1]
+
+
+async def test_face_columns_tolerate_malformed_header_values(db_conn, seed_package: dict, seed_subject: dict):
+    # DFL headers are stored verbatim: odd values must not fail the insert
+    face = {"yaw": "12.5", "pitch": "n/a", "sharpness": 0.25, "source_width": "1920.0", "source_height": "1e99"}
+    row = await db_conn.fetchrow(
+        "INSERT INTO assets (package_id, subject_id, filename, file_type, asset_type, disk_path, metadata) "
+        "VALUES ($1, $2, 'odd.png', 'image', 'aligned', '/tmp/test/odd.png', $3) "
+        "RETURNING face_yaw, face_pitch, face_sharpness, face_source_width, face_source_height",
+        seed_package["id"], seed_subject["id"], {"face": face},
+    )
+    assert dict(row) == {
+        "face_yaw": 12.5, "face_pitch": None, "face_sharpness": 0.25,
+        "face_source_width": 1920, "face_source_height": None,
+    }
+
+
+async def test_bulk_delete_packages(client: AsyncClient, seed_package: dict):
+    pid = str(seed_package["id"])
+    missing = "00000000-0000-0000-0000-000000000000"
+    resp = await client.post("/api/packages/bulk-delete", json={"ids": [pid, missing]})
+    assert resp.status_code == 200
+    assert resp.json() == {"deleted": 1, "ids": [pid]}
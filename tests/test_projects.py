@@ -1,5 +1,7 @@
 """Project CRUD tests."""
 
+import asyncio
+
 from httpx import AsyncClient
 
 
@@ -10,7 +12,7 @@ async def test_list_projects_empty(client: AsyncClient):
     assert isinstance(resp.json(), list)
 
 
-async def test_create_project(client: AsyncClient):
+async def test_create_project(client: AsyncClient, db_conn):
     resp = await client.post("/api/projects", json={
         "name": "pytest-project-create",
         "description": "Created by test",
@@ -22,6 +24,56 @@ async def test_create_project(client: AsyncClient):
     assert body["project_type"] == "atman"
     assert body["subject_count"] == 0
     assert body["package_count"] == 0
+    row = await db_conn.fetchrow("SELECT subject_count, package_count FROM projects WHERE id = $1", body["id"])
+    assert dict(row) == {"subject_count": 0, "package_count": 0}
+
+
+async def test_project_counts_follow_links(db_conn, seed_package: dict, seed_subject: dict):
+    pid = seed_subject["project_id"]
+    counts = "SELECT subject_count, package_count FROM projects WHERE id = $1"
+    before = await db_conn.fetchrow(counts, pid)
+    assert (before["subject_count"], before["package_count"]) == (1, 1)
+
+    # A package shared by two subjects of the project still counts once
+    other = await db_conn.fetchval(
+        "INSERT INTO subjects (project_id, name) VALUES ($1, 'Second Subject') RETURNING id", pid,
+    )
+    await db_conn.execute(
+        "INSERT INTO packages_subjects (package_id, subject_id) VALUES ($1, $2)", seed_package["id"], other,
+    )
+    after = await db_conn.fetchrow(counts, pid)
+    assert (after["subject_count"], after["package_count"]) == (2, 1)
+
+    await db_conn.execute("DELETE FROM packages WHERE id = $1", seed_package["id"])
+    after = await db_conn.fetchrow(counts, pid)
+    assert (after["subject_count"], after["package_count"]) == (2, 0)
+
+
+async def test_project_counts_concurrent_writers(extra_conns):
+    """Two transactions adding subjects to one project at once both get counted."""
+    a, b = await extra_conns(), await extra_conns()
+    pid = await a.fetchval("INSERT INTO projects (name) VALUES ('pytest-concurrent-counts') RETURNING id")
+    try:
+        insert = "INSERT INTO subjects (project_id, name) VALUES ($1, $2)"
+        tx_a = a.transaction()
+        await tx_a.start()
+        await a.execute(insert, pid, "Subject A")
+
+        async def _insert_b():
+            async with b.transaction():
+                await b.execute(insert, pid, "Subject B")
+
+        # b's count refresh has to wait for a's lock on the project row
+        task = asyncio.create_task(_insert_b())
+        await asyncio.sleep(0.2)
+        assert not task.done()
+        await tx_a.commit()
+        await asyncio.wait_for(task, 5)
+
+        row = await a.fetchrow("SELECT subject_count, package_count FROM projects WHERE id = $1", pid)
+        assert (row["subject_count"], row["package_count"]) == (2, 0)
+    finally:
+        await a.execute("DELETE FROM projects WHERE id = $1", pid)
 
 
 async def test_get_project(client: AsyncClient, seed_project: dict):
@@ -45,6 +97,17 @@ async def test_update_project(client: AsyncClient, seed_project: dict):
     assert resp.json()["name"] == "Updated Name"
 
 
+async def test_update_project_returns_summary(client: AsyncClient, seed_asset: dict, seed_subject: dict):
+    pid = str(seed_subject["project_id"])
+    resp = await client.put(f"/api/projects/{pid}", json={"notes": "n"})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["subject_count"] == 1
+    assert body["package_count"] == 1
+    assert body["total_assets"] == 1
+    assert body["total_size_bytes"] == 1024
+
+
 async def test_update_project_no_fields(client: AsyncClient, seed_project: dict):
     pid = str(seed_project["id"])
     resp = await client.put(f"/api/projects/{pid}", json={})
@@ -73,3 +136,14 @@ async def test_list_project_subjects(client: AsyncClient, seed_subject: dict):
     subjects = resp.json()
     assert len(subjects) >= 1
     assert any(s["name"] == "Test Subject" for s in subjects)
+
+
+async def test_list_project_packages(client: AsyncClient, seed_package: dict, seed_subject: dict):
+    pid = str(seed_subject["project_id"])
+    resp = await client.get(f"/api/projects/{pid}/packages")
+    assert resp.status_code == 200
+    packages = resp.json()
+    assert len(packages) == 1
+    assert packages[0]["name"] == "test-pkg-001"
+    assert packages[0]["subject_name"] == "Test Subject"
+    assert [s["name"] for s in packages[0]["linked_subjects"]] == ["Test Subject"]
@@ -0,0 +1,34 @@
+"""Global search tests."""
+
+from httpx import AsyncClient
+
+
+async def test_search_short_query(client: AsyncClient):
+    resp = await client.get("/api/search", params={"q": "a"})
+    assert resp.status_code == 200
+    assert resp.json() == {"projects": [], "subjects": [], "packages": [], "assets": []}
+
+
+async def test_search_all_kinds(client: AsyncClient, seed_asset: dict):
+    resp = await client.get("/api/search", params={"q": "test"})
+    assert resp.status_code == 200
+    body = resp.json()
+
+    project = next(p for p in body["projects"] if p["name"] == "Test Project")
+    assert project["project_type"] == "atman"
+
+    subject = next(s for s in body["subjects"] if s["name"] == "Test Subject")
+    assert subject["project_name"] == "Test Project"
+
+    package = next(p for p in body["packages"] if p["name"] == "test-pkg-001")
+    assert package["subject_name"] == "Test Subject"
+    assert package["package_type"] == "atman"
+
+
+async def test_search_assets(client: AsyncClient, seed_asset: dict):
+    resp = await client.get("/api/search", params={"q": "frame_0001"})
+    assert resp.status_code == 200
+    asset = next(a for a in resp.json()["assets"] if a["id"] == str(seed_asset["id"]))
+    assert asset["filename"] == "frame_0001.png"
+    assert asset["file_type"] == "image"
+    assert asset["package_id"] == str(seed_asset["package_id"])
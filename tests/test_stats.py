@@ -0,0 +1,13 @@
+"""Dashboard stats tests."""
+
+from httpx import AsyncClient
+
+
+async def test_dashboard_stats(client: AsyncClient, seed_asset: dict):
+    resp = await client.get("/api/stats/dashboard")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["total_assets"] >= 1
+    assert body["assets_by_type"].get("image", 0) >= 1
+    assert isinstance(body["recent_packages"], list)
+    assert isinstance(body["storage_by_project"], list)
@@ -0,0 +1,149 @@
+"""Subject endpoint tests."""
+
+import base64
+import json
+
+from httpx import AsyncClient
+
+
+async def test_list_subject_assets(client: AsyncClient, seed_asset: dict):
+    sid = str(seed_asset["subject_id"])
+    resp = await client.get(f"/api/subjects/{sid}/assets")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["total"] == 1
+    assert body["items"][0]["filename"] == "frame_0001.png"
+    assert body["next_cursor"] is None
+
+
+async def test_list_subject_assets_keyset(client: AsyncClient, bulk_seed_assets, seed_subject: dict):
+    await bulk_seed_assets(5, "f_{:03d}.png")
+    url = f"/api/subjects/{seed_subject['id']}/assets"
+
+    first = (await client.get(url, params={"limit": 2})).json()
+    assert first["total"] == 5
+    assert [a["filename"] for a in first["items"]] == ["f_000.png", "f_001.png"]
+
+    second = (await client.get(url, params={"limit": 2, "cursor": first["next_cursor"]})).json()
+    assert [a["filename"] for a in second["items"]] == ["f_002.png", "f_003.png"]
+    assert second["offset"] == 2
+    assert second["total"] == 5
+
+    last = (await client.get(url, params={"limit": 2, "cursor": second["next_cursor"]})).json()
+    assert [a["filename"] for a in last["items"]] == ["f_004.png"]
+    assert last["next_cursor"] is None
+
+
+async def test_list_subject_assets_bad_cursor(client: AsyncClient, seed_subject: dict):
+    resp = await client.get(f"/api/subjects/{seed_subject['id']}/assets", params={"cursor": "nope"})
+    assert resp.status_code == 400
+
+
+async def test_list_subject_assets_cursor_wrong_types(client: AsyncClient, seed_subject: dict):
+    cursor = base64.urlsafe_b64encode(json.dumps({"f": "a", "i": 5, "n": 1, "t": 1}).encode()).decode()
+    resp = await client.get(f"/api/subjects/{seed_subject['id']}/assets", params={"cursor": cursor})
+    assert resp.status_code == 400
+
+
+async def test_batch_subject_assets(client: AsyncClient, seed_asset: dict):
+    subject_id = seed_asset["subject_id"]
+    resp = await client.post(
+        f"/api/subjects/{subject_id}/assets/batch",
+        json={"queries": [{"file_type": "image"}, {"file_type": "video"}]},
+    )
+    assert resp.status_code == 200
+    images, videos = resp.json()
+    assert images["total"] == 1
+    assert images["items"][0]["id"] == str(seed_asset["id"])
+    assert videos["total"] == 0
+
+
+async def test_create_subject(client: AsyncClient, seed_project: dict):
+    resp = await client.post("/api/subjects", json={
+        "project_id": str(seed_project["id"]),
+        "name": "jane_doe",
+    })
+    assert resp.status_code == 201
+    body = resp.json()
+    assert body["name"] == "Jane Doe"
+    assert body["package_count"] == 0
+    assert body["total_assets"] == 0
+
+
+async def test_subject_read_and_write_payloads_match(client: AsyncClient, seed_project: dict):
+    pid = str(seed_project["id"])
+    created = (await client.post("/api/subjects", json={"project_id": pid, "name": "same_shape"})).json()
+    assert created["created_at"].endswith("Z")
+
+    listed = (await client.get("/api/subjects", params={"project_id": pid})).json()
+    assert listed == [created]
+    assert (await client.get(f"/api/subjects/{created['id']}")).json() == created
+
+
+async def test_update_subject(client: AsyncClient, seed_asset: dict):
+    sid = str(seed_asset["subject_id"])
+    resp = await client.put(f"/api/subjects/{sid}", json={"description": "Updated"})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["description"] == "Updated"
+    assert body["package_count"] == 1
+    assert body["total_assets"] == 1
+    assert body["total_size_bytes"] == 1024
+
+
+async def test_update_subject_not_found(client: AsyncClient):
+    resp = await client.put("/api/subjects/00000000-0000-0000-0000-000000000000", json={"notes": "x"})
+    assert resp.status_code == 404
+
+
+async def test_list_subjects_by_project(client: AsyncClient, seed_subject: dict):
+    resp = await client.get("/api/subjects", params={"project_id": str(seed_subject["project_id"])})
+    assert resp.status_code == 200
+    subjects = resp.json()
+    assert [s["name"] for s in subjects] == ["Test Subject"]
+    assert subjects[0]["thumbnail_url"] is None
+
+
+async def test_bulk_delete_subjects(client: AsyncClient, seed_subject: dict):
+    sid = str(seed_subject["id"])
+    missing = "00000000-0000-0000-0000-000000000000"
+    resp = await client.post("/api/subjects/bulk-delete", json={"ids": [sid, missing]})
+    assert resp.status_code == 200
+    assert resp.json() == {"deleted": 1, "ids": [sid]}
+
+    resp = await client.get(f"/api/subjects/{sid}")
+    assert resp.status_code == 404
+
+
+async def test_list_subject_packages(client: AsyncClient, seed_package: dict):
+    sid = str(seed_package["subject_id"])
+    resp = await client.get(f"/api/subjects/{sid}/packages")
+    assert resp.status_code == 200
+    assert [p["name"] for p in resp.json()] == ["test-pkg-001"]
+
+    resp = await client.get(f"/api/subjects/{sid}/packages", params={"package_type": "vfx"})
+    assert resp.status_code == 200
+    assert resp.json() == []
+
+
+async def test_get_subject_cache_invalidated_on_update(client: AsyncClient, seed_subject: dict):
+    sid = str(seed_subject["id"])
+    assert (await client.get(f"/api/subjects/{sid}")).json()["description"] == "A test subject"
+
+    resp = await client.put(f"/api/subjects/{sid}", json={"description": "Changed"})
+    assert resp.status_code == 200
+    assert (await client.get(f"/api/subjects/{sid}")).json()["description"] == "Changed"
+
+
+async def test_subject_cache_invalidated_by_package_and_asset_writes(
+    client: AsyncClient, seed_asset: dict, seed_package: dict, seed_subject: dict,
+):
+    sid = str(seed_subject["id"])
+    body = (await client.get(f"/api/subjects/{sid}")).json()
+    assert (body["package_count"], body["total_assets"]) == (1, 1)
+
+    assert (await client.delete(f"/api/assets/{seed_asset['id']}")).status_code == 204
+    assert (await client.get(f"/api/subjects/{sid}")).json()["total_assets"] == 0
+
+    assert (await client.delete(f"/api/packages/{seed_package['id']}")).status_code == 204
+    assert (await client.get(f"/api/subjects/{sid}")).json()["package_count"] == 0